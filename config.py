@@ -22,3 +22,39 @@ AUDIO_QUALITY_OPTIONS = {
     "128kbps": {"label": "128kbps Medium", "bitrate": "128"},
     "64kbps":  {"label": "64kbps Low",     "bitrate": "64"},
 }
+
+# Mirror every cached upload into LOG_CHANNEL_ID so the media cache can be rebuilt after the database is lost
+MEDIA_CACHE_MIRROR = False
+
+# Download job scheduler: global and per-user concurrency caps, and how many jobs one user may have waiting
+MAX_CONCURRENT_JOBS = 4
+MAX_JOBS_PER_USER = 1
+MAX_QUEUED_PER_USER = 5
+
+# yt-dlp execution backend: "thread" runs in the bot process, "process" uses warm worker processes
+YDL_BACKEND = "thread"
+YDL_PROCESS_WORKERS = 4
+YDL_WORKER_MAX_JOBS = 50
+
+# Split uploads: how many cut parts may exist on disk at once (the one uploading plus the ones cut ahead)
+SPLIT_PARTS_IN_FLIGHT = 2
+
+# Upload progress edits: minimum seconds between edits in one chat, and the ceiling FloodWait can stretch it to
+PROGRESS_EDIT_INTERVAL = 3
+PROGRESS_MAX_EDIT_INTERVAL = 60
+
+# Playlist downloads: items taken per /playlist, parallel downloads inside one playlist job (0 = match CPU cores; never more than the job's share of the yt-dlp pool), parallel uploads
+PLAYLIST_MAX_ITEMS = 100
+PLAYLIST_DOWNLOAD_WORKERS = 0
+PLAYLIST_UPLOAD_WORKERS = 2
+
+# Hedged search: yt-dlp starts once py_yt runs past this percentile of its recent latencies, clamped to these bounds in seconds
+SEARCH_HEDGE_PERCENTILE = 95
+SEARCH_HEDGE_MIN_DELAY = 0.5
+SEARCH_HEDGE_MAX_DELAY = 4
+
+# Thumbnail disk cache: raw and processed JPEGs under cache/thumbs, least recently used ones evicted past this size in MB
+THUMB_CACHE_MAX_MB = 200
+
+# Thumbnail encoding: worker threads of the dedicated pool that decodes, resizes and encodes thumbnails
+THUMB_ENCODE_WORKERS = 2
@@ -11,11 +11,12 @@ async def register_all_handlers(client):
     from core import start
     start.register_handlers(client)
     
-    from modules import callback, ckies, help, info, search, thumb, yt
+    from modules import callback, ckies, help, info, playlist, search, thumb, yt
     callback.register_handlers(client)
     ckies.register_handlers(client)
     help.register_handlers(client)
     info.register_handlers(client)
+    playlist.register_handlers(client)
     search.register_handlers(client)
     thumb.register_handlers(client)
     yt.register_handlers(client)
@@ -1,5 +1,5 @@
 from helpers.logger import LOGGER
-from helpers.pgbar import progress_bar
+from helpers.pgbar import progress_bar, ProgressReporter
 from helpers.buttons import SmartButtons
 from helpers.utils import clean_download, clean_temp_files
 from helpers.botutils import (
@@ -17,6 +17,7 @@ from helpers.botutils import (
 __all__ = [
     "LOGGER",
     "progress_bar",
+    "ProgressReporter",
     "SmartButtons",
     "clean_download",
     "clean_temp_files",
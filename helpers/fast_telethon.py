@@ -4,11 +4,14 @@ import inspect
 import logging
 import math
 import os
+import time
 from collections import defaultdict
-from typing import AsyncGenerator, Awaitable, BinaryIO, DefaultDict, List, Optional, Tuple, Union
+from typing import AsyncGenerator, BinaryIO, DefaultDict, Dict, List, Optional, Tuple, Union
 
 from telethon import utils, helpers, TelegramClient
 from telethon.crypto import AuthKey
+from telethon.errors import (FloodPremiumWaitError, FloodWaitError, RpcCallFailError, ServerError,
+                             TimedOutError)
 from telethon.network import MTProtoSender
 from telethon.tl.alltlobjects import LAYER
 from telethon.tl.functions import InvokeWithLayerRequest
@@ -24,16 +27,329 @@ log: logging.Logger = logging.getLogger("telethon")
 TypeLocation = Union[Document, InputDocumentFileLocation, InputPeerPhotoFileLocation,
                      InputFileLocation, InputPhotoFileLocation]
 
-_parallel_transfer_locks: dict = {}
+UPLOAD_WINDOW_PER_SENDER = 2
+UPLOAD_PART_RETRIES = 4
+UPLOAD_MAX_FLOOD_WAIT = 60
+_TRANSIENT_UPLOAD_ERRORS = (ServerError, RpcCallFailError, TimedOutError, asyncio.TimeoutError,
+                            ConnectionError)
+_FLOOD_ERRORS = (FloodWaitError, FloodPremiumWaitError)
+
+ADAPT_DEFAULT_CONNECTIONS = 8
+ADAPT_MIN_CONNECTIONS = 2
+ADAPT_INTERVAL = 2.0
+ADAPT_MIN_GAIN = 1.05
+ADAPT_HOLD_INTERVALS = 5
+ADAPT_FLOOD_MEMORY = 300
+ADAPT_FAST_CONNECTION_BPS = 512 * 1024
+
+SENDER_POOL_MAX_CONNECTIONS = 40
+SENDER_IDLE_TIMEOUT = 120
+SENDER_EVICT_INTERVAL = 30
+
+
+class _DcSenders:
+    dc_id: int
+    auth_key: Optional[AuthKey]
+    idle: List[Tuple[MTProtoSender, float]]
+    auth_lock: asyncio.Lock
+
+    def __init__(self, dc_id: int, auth_key: Optional[AuthKey]) -> None:
+        self.dc_id = dc_id
+        self.auth_key = auth_key
+        self.idle = []
+        self.auth_lock = asyncio.Lock()
+
+
+class SenderPool:
+    client: TelegramClient
+    max_connections: int
+    dcs: Dict[int, _DcSenders]
+    leased: int
+    active_transfers: int
+
+    def __init__(self, client: TelegramClient, max_connections: int = SENDER_POOL_MAX_CONNECTIONS) -> None:
+        self.client = client
+        self.max_connections = max_connections
+        self.dcs = {}
+        self.leased = 0
+        self.active_transfers = 0
+        self.changed = asyncio.Condition()
+        self._evictor: Optional[asyncio.Task] = None
+
+    def _dc(self, dc_id: int) -> _DcSenders:
+        dc = self.dcs.get(dc_id)
+        if dc is None:
+            auth_key = self.client.session.auth_key if dc_id == self.client.session.dc_id else None
+            dc = self.dcs[dc_id] = _DcSenders(dc_id, auth_key)
+        return dc
+
+    def idle_count(self) -> int:
+        return sum(len(dc.idle) for dc in self.dcs.values())
+
+    def fair_share(self) -> int:
+        return max(1, self.max_connections // max(1, self.active_transfers))
+
+    async def acquire(self, dc_id: int, wanted: int) -> List[MTProtoSender]:
+        if self._evictor is None or self._evictor.done():
+            self._evictor = asyncio.get_running_loop().create_task(self._evict_idle())
+        async with self.changed:
+            self.active_transfers += 1
+            try:
+                await self.changed.wait_for(lambda: self.leased < self.max_connections)
+            except BaseException:
+                self.active_transfers -= 1
+                self.changed.notify_all()
+                raise
+            grant = max(1, min(wanted, self.fair_share(), self.max_connections - self.leased))
+            self.leased += grant
+        dc = self._dc(dc_id)
+        senders = []
+        while dc.idle and len(senders) < grant:
+            sender, _ = dc.idle.pop()
+            if sender.is_connected():
+                senders.append(sender)
+            else:
+                await self._close(sender)
+        missing = grant - len(senders)
+        if missing:
+            await self._trim_idle(self.max_connections - self.leased)
+            try:
+                senders.append(await self._connect(dc))
+                connected, error = await self._connect_many(dc, missing - 1)
+                senders.extend(connected)
+                if error:
+                    raise error
+            except BaseException:
+                await self.release(dc_id, senders, discard=True, granted=grant)
+                raise
+        log.debug(f"Leased {grant} senders for DC {dc_id} ({self.leased}/{self.max_connections} in use)")
+        return senders
+
+    async def extend(self, dc_id: int, wanted: int, holding: int) -> List[MTProtoSender]:
+        async with self.changed:
+            grant = min(wanted, self.fair_share() - holding, self.max_connections - self.leased)
+            if grant <= 0:
+                return []
+            self.leased += grant
+        dc = self._dc(dc_id)
+        senders = []
+        try:
+            while dc.idle and len(senders) < grant:
+                sender, _ = dc.idle.pop()
+                if sender.is_connected():
+                    senders.append(sender)
+                else:
+                    await self._close(sender)
+            connected, error = await self._connect_many(dc, grant - len(senders))
+        except BaseException:
+            for sender in senders:
+                await self._close(sender)
+            async with self.changed:
+                self.leased -= grant
+                self.changed.notify_all()
+            raise
+        senders.extend(connected)
+        if error:
+            log.debug(f"Could not add senders for DC {dc_id}: {error}")
+            async with self.changed:
+                self.leased -= grant - len(senders)
+                self.changed.notify_all()
+        return senders
+
+    async def release(self, dc_id: int, senders: List[MTProtoSender], discard: bool = False,
+                      granted: Optional[int] = None, finished: bool = True) -> None:
+        dc = self._dc(dc_id)
+        now = asyncio.get_running_loop().time()
+        for sender in senders:
+            if discard or not sender.is_connected():
+                await self._close(sender)
+            else:
+                dc.idle.append((sender, now))
+        async with self.changed:
+            self.leased -= len(senders) if granted is None else granted
+            if finished:
+                self.active_transfers -= 1
+            self.changed.notify_all()
+        await self._trim_idle(self.max_connections - self.leased)
+
+    async def _trim_idle(self, limit: int) -> None:
+        excess = self.idle_count() - max(0, limit)
+        if excess <= 0:
+            return
+        entries = sorted(((last, dc, sender) for dc in self.dcs.values() for sender, last in dc.idle),
+                         key=lambda e: e[0])
+        for _, dc, sender in entries[:excess]:
+            dc.idle = [e for e in dc.idle if e[0] is not sender]
+            await self._close(sender)
+
+    async def _evict_idle(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(SENDER_EVICT_INTERVAL)
+            cutoff = loop.time() - SENDER_IDLE_TIMEOUT
+            for dc in self.dcs.values():
+                stale = [sender for sender, last in dc.idle if last < cutoff or not sender.is_connected()]
+                if not stale:
+                    continue
+                dc.idle = [e for e in dc.idle if e[0] not in stale]
+                for sender in stale:
+                    await self._close(sender)
+                log.debug(f"Evicted {len(stale)} idle senders for DC {dc.dc_id}")
+
+    async def _connect_many(self, dc: _DcSenders, count: int) -> Tuple[List[MTProtoSender], Optional[BaseException]]:
+        tasks = [asyncio.ensure_future(self._connect(dc)) for _ in range(count)]
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for task in tasks:
+                if not task.cancelled() and task.exception() is None:
+                    await self._close(task.result())
+            raise
+        senders = []
+        error = None
+        for task in tasks:
+            if task.cancelled():
+                error = error or asyncio.CancelledError()
+            elif task.exception() is not None:
+                error = error or task.exception()
+            else:
+                senders.append(task.result())
+        return senders, error
+
+    @staticmethod
+    async def _close(sender: MTProtoSender) -> None:
+        try:
+            await sender.disconnect()
+        except Exception as e:
+            log.debug(f"Sender disconnect failed: {e}")
+
+    async def _connect(self, dc: _DcSenders) -> MTProtoSender:
+        if dc.auth_key is None:
+            async with dc.auth_lock:
+                return await self._open(dc)
+        return await self._open(dc)
+
+    async def _open(self, dc: _DcSenders) -> MTProtoSender:
+        dc_info = await self.client._get_dc(dc.dc_id)
+        sender = MTProtoSender(dc.auth_key, loggers=self.client._log)
+        await sender.connect(self.client._connection(dc_info.ip_address, dc_info.port, dc_info.id,
+                                                     loggers=self.client._log,
+                                                     proxy=self.client._proxy))
+        if not dc.auth_key:
+            log.debug(f"Exporting auth to DC {dc.dc_id}")
+            auth = await self.client(ExportAuthorizationRequest(dc.dc_id))
+            self.client._init_request.query = ImportAuthorizationRequest(id=auth.id,
+                                                                         bytes=auth.bytes)
+            req = InvokeWithLayerRequest(LAYER, self.client._init_request)
+            await sender.send(req)
+            dc.auth_key = sender.auth_key
+        return sender
+
+
+_sender_pools: Dict[int, SenderPool] = {}
+
+
+def get_sender_pool(client: TelegramClient) -> SenderPool:
+    pool = _sender_pools.get(id(client))
+    if pool is None:
+        pool = _sender_pools[id(client)] = SenderPool(client)
+    return pool
+
+
+class DcTuning:
+    connections: int
+    per_connection_bps: float
+    flood_until: float
+
+    def __init__(self) -> None:
+        self.connections = ADAPT_DEFAULT_CONNECTIONS
+        self.per_connection_bps = 0.0
+        self.flood_until = 0.0
+
+
+_dc_tuning: Dict[int, DcTuning] = {}
+
+
+def get_dc_tuning(dc_id: int) -> DcTuning:
+    tuning = _dc_tuning.get(dc_id)
+    if tuning is None:
+        tuning = _dc_tuning[dc_id] = DcTuning()
+    return tuning
+
+
+class AdaptiveController:
+    tuning: DcTuning
+    connections: int
+    max_connections: int
+
+    def __init__(self, dc_id: int, max_connections: int) -> None:
+        self.tuning = get_dc_tuning(dc_id)
+        self.max_connections = max(1, max_connections)
+        self.connections = self.initial_connections()
+        self.window_bytes = 0
+        self.window_start = time.monotonic()
+        self.last_bps = 0.0
+        self.best_bps = 0.0
+        self.best_connections = self.connections
+        self.congested = False
+        self.probing = False
+        self.hold = 0
+
+    def initial_connections(self) -> int:
+        count = self.tuning.connections
+        if time.monotonic() < self.tuning.flood_until:
+            count = max(ADAPT_MIN_CONNECTIONS, count // 2)
+        return max(1, min(self.max_connections, count))
+
+    def record(self, nbytes: int) -> None:
+        self.window_bytes += nbytes
+
+    def on_flood(self, seconds: int) -> None:
+        self.congested = True
+        self.tuning.flood_until = max(self.tuning.flood_until, time.monotonic() + seconds + ADAPT_FLOOD_MEMORY)
+
+    def on_error(self) -> None:
+        self.congested = True
+
+    def evaluate(self, active: int) -> int:
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        bps = self.window_bytes / elapsed if elapsed > 0 else 0.0
+        self.window_bytes = 0
+        self.window_start = now
+        if bps > self.best_bps:
+            self.best_bps = bps
+            self.best_connections = active
+        if self.congested:
+            target = min(self.max_connections, max(ADAPT_MIN_CONNECTIONS, active // 2))
+            self.congested = False
+            self.probing = False
+            self.hold = ADAPT_HOLD_INTERVALS
+        elif self.probing and bps < self.last_bps * ADAPT_MIN_GAIN:
+            target = min(self.max_connections, max(ADAPT_MIN_CONNECTIONS, active - 1))
+            self.probing = False
+            self.hold = ADAPT_HOLD_INTERVALS
+        elif self.hold:
+            target = active
+            self.hold -= 1
+        elif now >= self.tuning.flood_until:
+            target = min(self.max_connections, active + 1)
+            self.probing = target > active
+        else:
+            target = active
+        self.last_bps = bps
+        self.connections = target
+        return target
+
+    def remember(self) -> None:
+        if self.best_bps <= 0:
+            return
+        self.tuning.connections = max(ADAPT_MIN_CONNECTIONS, self.best_connections)
+        self.tuning.per_connection_bps = self.best_bps / max(1, self.best_connections)
 
-def _get_or_create_lock(dc_id: int) -> asyncio.Lock:
-    loop = asyncio.get_running_loop()
-    key = (id(loop), dc_id)
-    lock = _parallel_transfer_locks.get(key)
-    if lock is None:
-        lock = asyncio.Lock()
-        _parallel_transfer_locks[key] = lock
-    return lock
 
 class DownloadSender:
     client: TelegramClient
@@ -58,70 +374,71 @@ class DownloadSender:
         self.request.offset += self.stride
         return result.bytes
 
-    def disconnect(self) -> Awaitable[None]:
-        return self.sender.disconnect()
-
 
 class UploadSender:
     client: TelegramClient
     sender: MTProtoSender
-    request: Union[SaveFilePartRequest, SaveBigFilePartRequest]
-    part_count: int
-    stride: int
-    previous: Optional[asyncio.Task]
-    loop: asyncio.AbstractEventLoop
+    in_flight: int
 
-    def __init__(self, client: TelegramClient, sender: MTProtoSender, file_id: int, part_count: int, big: bool,
-                 index: int, stride: int, loop: asyncio.AbstractEventLoop) -> None:
+    def __init__(self, client: TelegramClient, sender: MTProtoSender) -> None:
         self.client = client
         self.sender = sender
-        self.part_count = part_count
-        if big:
-            self.request = SaveBigFilePartRequest(file_id, index, part_count, b"")
-        else:
-            self.request = SaveFilePartRequest(file_id, index, b"")
-        self.stride = stride
-        self.previous = None
-        self.loop = loop
-
-    async def next(self, data: bytes) -> None:
-        if self.previous:
-            await self.previous
-        self.previous = self.loop.create_task(self._next(data))
+        self.in_flight = 0
 
-    async def _next(self, data: bytes) -> None:
-        self.request.bytes = data
-        log.debug(f"Sending file part {self.request.file_part}/{self.part_count}"
-                  f" with {len(data)} bytes")
-        await self.client._call(self.sender, self.request)
-        self.request.file_part += self.stride
-
-    async def disconnect(self) -> None:
-        if self.previous:
-            await self.previous
-        return await self.sender.disconnect()
+    async def send(self, request: Union[SaveFilePartRequest, SaveBigFilePartRequest]) -> None:
+        self.in_flight += 1
+        try:
+            await self.client._call(self.sender, request)
+        finally:
+            self.in_flight -= 1
 
 
 class ParallelTransferrer:
     client: TelegramClient
     loop: asyncio.AbstractEventLoop
     dc_id: int
+    pool: SenderPool
     senders: Optional[List[Union[DownloadSender, UploadSender]]]
-    auth_key: AuthKey
-    upload_ticker: int
+    file_id: int
+    part_count: int
+    is_large: bool
+    next_part: int
+    window: Optional[asyncio.Semaphore]
+    in_flight: set
+    upload_error: Optional[BaseException]
+    controller: Optional[AdaptiveController]
+    draining: List[UploadSender]
 
     def __init__(self, client: TelegramClient, dc_id: Optional[int] = None) -> None:
         self.client = client
         self.loop = asyncio.get_running_loop()
         self.dc_id = dc_id or self.client.session.dc_id
-        self.auth_key = (None if dc_id and self.client.session.dc_id != dc_id
-                         else self.client.session.auth_key)
+        self.pool = get_sender_pool(client)
         self.senders = None
-        self.upload_ticker = 0
-
-    async def _cleanup(self) -> None:
-        await asyncio.gather(*[sender.disconnect() for sender in self.senders])
+        self.next_part = 0
+        self.window = None
+        self.in_flight = set()
+        self.upload_error = None
+        self.controller = None
+        self.draining = []
+        self._adapt_task = None
+        self._drain_tasks = set()
+
+    async def _cleanup(self, discard: bool = False) -> None:
+        if self.senders is None:
+            return
+        tasks = [task for task in [self._adapt_task, *self._drain_tasks] if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._adapt_task = None
+        self._drain_tasks = set()
+        if self.controller:
+            self.controller.remember()
+        senders = self.senders + self.draining
         self.senders = None
+        self.draining = []
+        await self.pool.release(self.dc_id, [s.sender for s in senders], discard=discard)
 
     @staticmethod
     def _get_connection_count(file_size: int, max_count: int = 20,
@@ -132,6 +449,8 @@ class ParallelTransferrer:
 
     async def _init_download(self, connections: int, file: TypeLocation, part_count: int,
                              part_size: int) -> None:
+        raw_senders = await self.pool.acquire(self.dc_id, min(connections, part_count) or 1)
+        connections = len(raw_senders)
         minimum, remainder = divmod(part_count, connections)
 
         def get_part_count() -> int:
@@ -142,53 +461,69 @@ class ParallelTransferrer:
             return minimum
 
         self.senders = [
-            await self._create_download_sender(file, 0, part_size, connections * part_size,
-                                               get_part_count()),
-            *await asyncio.gather(
-                *[self._create_download_sender(file, i, part_size, connections * part_size,
-                                               get_part_count())
-                  for i in range(1, connections)])
+            DownloadSender(self.client, sender, file, i * part_size, part_size,
+                           connections * part_size, get_part_count())
+            for i, sender in enumerate(raw_senders)
         ]
 
-    async def _create_download_sender(self, file: TypeLocation, index: int, part_size: int,
-                                      stride: int, part_count: int) -> DownloadSender:
-        return DownloadSender(self.client, await self._create_sender(), file, index * part_size, part_size,
-                              stride, part_count)
-
     async def _init_upload(self, connections: int, file_id: int, part_count: int, big: bool) -> None:
-        self.senders = [
-            await self._create_upload_sender(file_id, part_count, big, 0, connections),
-            *await asyncio.gather(
-                *[self._create_upload_sender(file_id, part_count, big, i, connections)
-                  for i in range(1, connections)])
-        ]
-
-    async def _create_upload_sender(self, file_id: int, part_count: int, big: bool, index: int,
-                                    stride: int) -> UploadSender:
-        return UploadSender(self.client, await self._create_sender(), file_id, part_count, big, index, stride,
-                            loop=self.loop)
-
-    async def _create_sender(self) -> MTProtoSender:
-        dc = await self.client._get_dc(self.dc_id)
-        sender = MTProtoSender(self.auth_key, loggers=self.client._log)
-        await sender.connect(self.client._connection(dc.ip_address, dc.port, dc.id,
-                                                     loggers=self.client._log,
-                                                     proxy=self.client._proxy))
-        if not self.auth_key:
-            log.debug(f"Exporting auth to DC {self.dc_id}")
-            auth = await self.client(ExportAuthorizationRequest(self.dc_id))
-            self.client._init_request.query = ImportAuthorizationRequest(id=auth.id,
-                                                                         bytes=auth.bytes)
-            req = InvokeWithLayerRequest(LAYER, self.client._init_request)
-            await sender.send(req)
-            self.auth_key = sender.auth_key
-        return sender
+        self.file_id = file_id
+        self.part_count = part_count
+        self.is_large = big
+        self.next_part = 0
+        self.in_flight = set()
+        self.upload_error = None
+        self.draining = []
+        raw_senders = await self.pool.acquire(self.dc_id, min(connections, part_count) or 1)
+        self.senders = [UploadSender(self.client, sender) for sender in raw_senders]
+        self.window = asyncio.Semaphore(len(self.senders) * UPLOAD_WINDOW_PER_SENDER)
+        if self.controller:
+            self._adapt_task = self.loop.create_task(self._adapt())
+
+    async def _adapt(self) -> None:
+        while self.senders is not None:
+            await asyncio.sleep(ADAPT_INTERVAL)
+            if self.senders is None:
+                return
+            active = len(self.senders)
+            target = self.controller.evaluate(active)
+            if target > active:
+                fresh = await self.pool.extend(self.dc_id, target - active, active + len(self.draining))
+                if self.senders is None:
+                    await self.pool.release(self.dc_id, fresh, finished=False)
+                    return
+                self.senders.extend(UploadSender(self.client, sender) for sender in fresh)
+                for _ in range(len(fresh) * UPLOAD_WINDOW_PER_SENDER):
+                    self.window.release()
+            elif target < active:
+                victims = sorted(self.senders, key=lambda s: s.in_flight)[:active - target]
+                for victim in victims:
+                    self.senders.remove(victim)
+                    self.draining.append(victim)
+                task = self.loop.create_task(self._drain(victims))
+                self._drain_tasks.add(task)
+                task.add_done_callback(self._drain_tasks.discard)
+            if target != active:
+                log.debug(f"Upload to DC {self.dc_id}: {active} -> {len(self.senders)} connections")
+
+    async def _drain(self, victims: List[UploadSender]) -> None:
+        for _ in range(len(victims) * UPLOAD_WINDOW_PER_SENDER):
+            await self.window.acquire()
+        while any(v.in_flight for v in victims):
+            await asyncio.sleep(0.1)
+        for victim in victims:
+            self.draining.remove(victim)
+        await asyncio.shield(self.pool.release(self.dc_id, [v.sender for v in victims], finished=False))
 
     async def init_upload(self, file_id: int, file_size: int, part_size_kb: Optional[float] = None,
                           connection_count: Optional[int] = None) -> Tuple[int, int, bool]:
         MAX_PART_SIZE = 512 * 1024
         MAX_PARTS = 4000
-        connection_count = connection_count or self._get_connection_count(file_size)
+        if not connection_count:
+            self.controller = AdaptiveController(self.dc_id, self._get_connection_count(file_size))
+            connection_count = self.controller.connections
+            if not part_size_kb and self.controller.tuning.per_connection_bps >= ADAPT_FAST_CONNECTION_BPS:
+                part_size_kb = MAX_PART_SIZE // 1024
         part_size = (part_size_kb or utils.get_appropriated_part_size(file_size)) * 1024
         part_count = (file_size + part_size - 1) // part_size
         if part_count > MAX_PARTS:
@@ -201,12 +536,74 @@ class ParallelTransferrer:
         await self._init_upload(connection_count, file_id, part_count, is_large)
         return part_size, part_count, is_large
 
+    def _part_request(self, index: int, data: bytes) -> Union[SaveFilePartRequest, SaveBigFilePartRequest]:
+        if self.is_large:
+            return SaveBigFilePartRequest(self.file_id, index, self.part_count, data)
+        return SaveFilePartRequest(self.file_id, index, data)
+
+    def _pick_sender(self, exclude: Optional[UploadSender] = None) -> UploadSender:
+        candidates = [s for s in self.senders if s is not exclude] or self.senders
+        return min(candidates, key=lambda s: s.in_flight)
+
+    async def _upload_part(self, index: int, data: bytes) -> None:
+        request = self._part_request(index, data)
+        sender = self._pick_sender()
+        try:
+            for attempt in range(UPLOAD_PART_RETRIES + 1):
+                try:
+                    await sender.send(request)
+                    if self.controller:
+                        self.controller.record(len(data))
+                    return
+                except _FLOOD_ERRORS as e:
+                    if self.controller:
+                        self.controller.on_flood(e.seconds)
+                    if attempt == UPLOAD_PART_RETRIES or e.seconds > UPLOAD_MAX_FLOOD_WAIT:
+                        raise
+                    log.warning(f"FloodWait {e.seconds}s on file part {index}, retrying")
+                    await asyncio.sleep(e.seconds)
+                except _TRANSIENT_UPLOAD_ERRORS as e:
+                    if self.controller:
+                        self.controller.on_error()
+                    if attempt == UPLOAD_PART_RETRIES:
+                        raise
+                    log.warning(f"Retrying file part {index} after {type(e).__name__}: {e}")
+                    await asyncio.sleep(min(8.0, 0.5 * 2 ** attempt))
+                    sender = self._pick_sender(exclude=sender)
+        except BaseException as e:
+            if self.upload_error is None and not isinstance(e, asyncio.CancelledError):
+                self.upload_error = e
+            raise
+        finally:
+            self.window.release()
+
     async def upload(self, part: bytes) -> None:
-        await self.senders[self.upload_ticker].next(part)
-        self.upload_ticker = (self.upload_ticker + 1) % len(self.senders)
+        if self.upload_error:
+            raise self.upload_error
+        await self.window.acquire()
+        if self.upload_error:
+            self.window.release()
+            raise self.upload_error
+        task = self.loop.create_task(self._upload_part(self.next_part, part))
+        self.next_part += 1
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
 
     async def finish_upload(self) -> None:
-        await self._cleanup()
+        try:
+            if self.in_flight:
+                await asyncio.gather(*self.in_flight, return_exceptions=True)
+            if self.upload_error:
+                raise self.upload_error
+        finally:
+            await self._cleanup()
+
+    async def abort_upload(self) -> None:
+        for task in self.in_flight:
+            task.cancel()
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        await self._cleanup(discard=True)
 
     async def download(self, file: TypeLocation, file_size: int,
                        part_size_kb: Optional[float] = None,
@@ -219,28 +616,30 @@ class ParallelTransferrer:
         await self._init_download(connection_count, file, part_count, part_size)
 
         part = 0
-        while part < part_count:
-            tasks = []
-            for sender in self.senders:
-                tasks.append(self.loop.create_task(sender.next()))
-            for task in tasks:
-                data = await task
-                if not data:
-                    break
-                yield data
-                part += 1
-                log.debug(f"Part {part} downloaded")
-
-        log.debug("Parallel download finished, cleaning up connections")
-        await self._cleanup()
-
-
-def stream_file(file_to_stream: BinaryIO, chunk_size=1024):
-    while True:
-        data_read = file_to_stream.read(chunk_size)
-        if not data_read:
-            break
-        yield data_read
+        completed = False
+        try:
+            while part < part_count:
+                tasks = []
+                for sender in self.senders:
+                    tasks.append(self.loop.create_task(sender.next()))
+                for task in tasks:
+                    data = await task
+                    if not data:
+                        break
+                    yield data
+                    part += 1
+                    log.debug(f"Part {part} downloaded")
+            completed = True
+        finally:
+            log.debug("Parallel download finished, releasing connections")
+            await self._cleanup(discard=not completed)
+
+
+def _read_part(file_to_read: BinaryIO, part_size: int, hash_md5=None) -> bytes:
+    data = file_to_read.read(part_size)
+    if hash_md5 is not None:
+        hash_md5.update(data)
+    return data
 
 
 async def _internal_transfer_to_telegram(client: TelegramClient,
@@ -249,31 +648,26 @@ async def _internal_transfer_to_telegram(client: TelegramClient,
     file_id = helpers.generate_random_long()
     file_size = os.path.getsize(response.name)
 
-    hash_md5 = hashlib.md5()
+    loop = asyncio.get_running_loop()
     uploader = ParallelTransferrer(client)
     part_size, part_count, is_large = await uploader.init_upload(file_id, file_size)
-    buffer = bytearray()
-    for data in stream_file(response):
-        if progress_callback:
-            r = progress_callback(response.tell(), file_size)
-            if inspect.isawaitable(r):
-                await r
-        if not is_large:
-            hash_md5.update(data)
-        if len(buffer) == 0 and len(data) == part_size:
+    hash_md5 = None if is_large else hashlib.md5()
+    try:
+        pending = loop.run_in_executor(None, _read_part, response, part_size, hash_md5)
+        for part in range(part_count):
+            data = await pending
+            if not data:
+                break
+            if part + 1 < part_count:
+                pending = loop.run_in_executor(None, _read_part, response, part_size, hash_md5)
             await uploader.upload(data)
-            continue
-        new_len = len(buffer) + len(data)
-        if new_len >= part_size:
-            cutoff = part_size - len(buffer)
-            buffer.extend(data[:cutoff])
-            await uploader.upload(bytes(buffer))
-            buffer.clear()
-            buffer.extend(data[cutoff:])
-        else:
-            buffer.extend(data)
-    if len(buffer) > 0:
-        await uploader.upload(bytes(buffer))
+            if progress_callback:
+                r = progress_callback(min((part + 1) * part_size, file_size), file_size)
+                if inspect.isawaitable(r):
+                    await r
+    except BaseException:
+        await uploader.abort_upload()
+        raise
     await uploader.finish_upload()
     if is_large:
         return InputFileBig(file_id, part_count, "upload"), file_size
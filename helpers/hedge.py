@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import config
+from helpers.logger import LOGGER
+
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 10
+
+_latencies: dict = {}
+_winners: dict = {}
+
+
+def record_latency(name: str, backend: str, seconds: float):
+    key = (name, backend)
+    samples = _latencies.get(key)
+    if samples is None:
+        samples = _latencies[key] = deque(maxlen=LATENCY_WINDOW)
+    samples.append(seconds)
+
+
+def latency_percentile(name: str, backend: str, percentile: float) -> Optional[float]:
+    samples = _latencies.get((name, backend))
+    if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+def hedge_delay(name: str, backend: str) -> float:
+    observed = latency_percentile(name, backend, config.SEARCH_HEDGE_PERCENTILE)
+    if observed is None:
+        return config.SEARCH_HEDGE_MAX_DELAY
+    return min(config.SEARCH_HEDGE_MAX_DELAY, max(config.SEARCH_HEDGE_MIN_DELAY, observed))
+
+
+def record_winner(name: str, backend: str):
+    counts = _winners.setdefault(name, {})
+    counts[backend] = counts.get(backend, 0) + 1
+
+
+def hedge_stats() -> dict:
+    stats = {}
+    for name, counts in _winners.items():
+        stats[name] = {'wins': dict(counts)}
+    for (name, backend), samples in _latencies.items():
+        entry = stats.setdefault(name, {'wins': {}})
+        entry.setdefault('p95', {})[backend] = latency_percentile(name, backend, 95)
+        entry.setdefault('samples', {})[backend] = len(samples)
+    return stats
+
+
+async def _timed(name: str, backend: str, factory: Callable[[], Awaitable]):
+    started = time.monotonic()
+    result = await factory()
+    if result:
+        record_latency(name, backend, time.monotonic() - started)
+    return result
+
+
+async def hedged(name: str, primary: Callable[[], Awaitable], fallback: Callable[[], Awaitable],
+                 primary_backend: str = 'py_yt', fallback_backend: str = 'yt-dlp') -> tuple:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + hedge_delay(name, primary_backend)
+    tasks = {asyncio.ensure_future(_timed(name, primary_backend, primary)): primary_backend}
+    fallback_started = False
+    try:
+        while tasks:
+            timeout = None if fallback_started else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                backend = tasks.pop(task)
+                try:
+                    result = task.result()
+                except asyncio.CancelledError:
+                    LOGGER.warning(f"Hedged {name}: {backend} was cancelled")
+                    continue
+                except Exception as e:
+                    LOGGER.warning(f"Hedged {name}: {backend} failed: {e}")
+                    continue
+                if result:
+                    record_winner(name, backend)
+                    LOGGER.info(f"Hedged {name}: {backend} won after {loop.time() - started:.2f}s")
+                    return result, backend
+            if not fallback_started:
+                fallback_started = True
+                tasks[asyncio.ensure_future(_timed(name, fallback_backend, fallback))] = fallback_backend
+        record_winner(name, 'none')
+        return None, None
+    finally:
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
@@ -0,0 +1,249 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from telethon.errors import (
+    DocumentInvalidError,
+    FileReferenceEmptyError,
+    FileReferenceExpiredError,
+    FileReferenceInvalidError,
+    MediaEmptyError,
+    MediaInvalidError,
+)
+from telethon.tl.types import InputDocument
+
+import config
+from helpers.logger import LOGGER
+
+MEDIA_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "media_cache.db"
+MIRROR_TAG = "#ytcache"
+REBUILD_BATCH = 100
+REBUILD_MAX_EMPTY_BATCHES = 3
+FILE_REFERENCE_ERRORS = (FileReferenceExpiredError, FileReferenceInvalidError, FileReferenceEmptyError)
+DOCUMENT_GONE_ERRORS = (MediaInvalidError, MediaEmptyError, DocumentInvalidError)
+
+
+class MediaCache:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "video_id TEXT NOT NULL, kind TEXT NOT NULL, quality TEXT NOT NULL, "
+            "doc_id INTEGER NOT NULL, access_hash INTEGER NOT NULL, file_reference BLOB NOT NULL, "
+            "ref_chat INTEGER, ref_msg INTEGER, hits INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+            "PRIMARY KEY (video_id, kind, quality))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    def get(self, video_id: str, kind: str, quality: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_id, access_hash, file_reference, ref_chat, ref_msg FROM media "
+                "WHERE video_id = ? AND kind = ? AND quality = ?",
+                (video_id, kind, quality),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'doc_id': row[0],
+            'access_hash': row[1],
+            'file_reference': bytes(row[2]),
+            'ref_chat': row[3],
+            'ref_msg': row[4],
+        }
+
+    def put(self, video_id: str, kind: str, quality: str, document, ref_chat: Optional[int], ref_msg: Optional[int]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media "
+                "(video_id, kind, quality, doc_id, access_hash, file_reference, ref_chat, ref_msg, hits, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                (video_id, kind, quality, document.id, document.access_hash,
+                 document.file_reference, ref_chat, ref_msg, time.time()),
+            )
+            self._conn.commit()
+
+    def update_reference(self, video_id: str, kind: str, quality: str, file_reference: bytes):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE media SET file_reference = ? WHERE video_id = ? AND kind = ? AND quality = ?",
+                (file_reference, video_id, kind, quality),
+            )
+            self._conn.commit()
+
+    def record_hit(self, video_id: str, kind: str, quality: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE media SET hits = hits + 1 WHERE video_id = ? AND kind = ? AND quality = ?",
+                (video_id, kind, quality),
+            )
+            self._conn.commit()
+
+    def delete(self, video_id: str, kind: str, quality: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM media WHERE video_id = ? AND kind = ? AND quality = ?",
+                (video_id, kind, quality),
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+
+media_cache = MediaCache(MEDIA_CACHE_PATH)
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mediacache")
+
+
+async def _db(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_db_executor, func, *args)
+
+
+def _mirror_caption(video_id: str, kind: str, quality: str) -> str:
+    return f"{MIRROR_TAG} {video_id}|{kind}|{quality}"
+
+
+def _parse_mirror_caption(text: Optional[str]) -> Optional[tuple]:
+    if not text or not text.startswith(MIRROR_TAG):
+        return None
+    parts = text[len(MIRROR_TAG):].strip().split('|')
+    if len(parts) != 3 or not all(parts):
+        return None
+    return tuple(parts)
+
+
+def _input_document(entry: dict) -> InputDocument:
+    return InputDocument(
+        id=entry['doc_id'],
+        access_hash=entry['access_hash'],
+        file_reference=entry['file_reference'],
+    )
+
+
+async def _refresh_reference(video_id: str, kind: str, quality: str, entry: dict) -> Optional[dict]:
+    if not entry.get('ref_chat') or not entry.get('ref_msg'):
+        return None
+    from bot import get_client
+    SmartYTUtil = get_client()
+    message = await SmartYTUtil.get_messages(entry['ref_chat'], ids=entry['ref_msg'])
+    document = getattr(message, 'document', None) if message else None
+    if not document or document.id != entry['doc_id']:
+        return None
+    await _db(media_cache.update_reference, video_id, kind, quality, document.file_reference)
+    entry['file_reference'] = document.file_reference
+    return entry
+
+
+async def send_cached_media(chat_id, video_id: Optional[str], kind: str, quality: str,
+                            caption: str, parse_mode: str = 'markdown'):
+    if not video_id:
+        return None
+    entry = await _db(media_cache.get, video_id, kind, quality)
+    if not entry:
+        return None
+    from bot import get_client
+    SmartYTUtil = get_client()
+    refreshed = False
+    while True:
+        try:
+            sent = await SmartYTUtil.send_file(
+                chat_id, file=_input_document(entry), caption=caption, parse_mode=parse_mode,
+            )
+            asyncio.get_running_loop().run_in_executor(_db_executor, media_cache.record_hit, video_id, kind, quality)
+            LOGGER.info(f"Media cache hit: {video_id} [{kind} {quality}] → {chat_id}")
+            return sent
+        except FILE_REFERENCE_ERRORS as e:
+            if refreshed:
+                LOGGER.warning(f"Media cache reference still invalid for {video_id} [{kind} {quality}]: {e}")
+                break
+        except DOCUMENT_GONE_ERRORS as e:
+            LOGGER.warning(f"Media cache document gone for {video_id} [{kind} {quality}]: {e}")
+            break
+        except Exception as e:
+            LOGGER.error(f"Media cache send failed for {video_id} [{kind} {quality}]: {e}")
+            return None
+        refreshed = True
+        try:
+            entry = await _refresh_reference(video_id, kind, quality, entry)
+        except Exception as e:
+            LOGGER.warning(f"Media cache refresh failed for {video_id} [{kind} {quality}]: {e}")
+            return None
+        if not entry:
+            break
+    await _db(media_cache.delete, video_id, kind, quality)
+    return None
+
+
+async def remember_sent_media(video_id: Optional[str], kind: str, quality: str, sent) -> None:
+    document = getattr(sent, 'document', None) if sent else None
+    if not video_id or not document:
+        return
+    ref_chat, ref_msg = sent.chat_id, sent.id
+    if config.MEDIA_CACHE_MIRROR and config.LOG_CHANNEL_ID:
+        from bot import get_client
+        SmartYTUtil = get_client()
+        try:
+            mirror = await SmartYTUtil.send_file(
+                config.LOG_CHANNEL_ID,
+                file=InputDocument(document.id, document.access_hash, document.file_reference),
+                caption=_mirror_caption(video_id, kind, quality),
+                parse_mode=None,
+            )
+            ref_chat, ref_msg = mirror.chat_id, mirror.id
+            last = int(await _db(media_cache.get_meta, 'mirror_last_id') or 0)
+            if mirror.id > last:
+                await _db(media_cache.set_meta, 'mirror_last_id', str(mirror.id))
+        except Exception as e:
+            LOGGER.warning(f"Media cache mirror failed for {video_id}: {e}")
+    await _db(media_cache.put, video_id, kind, quality, document, ref_chat, ref_msg)
+    LOGGER.info(f"Media cached: {video_id} [{kind} {quality}]")
+
+
+async def rebuild_media_cache() -> int:
+    if not config.MEDIA_CACHE_MIRROR or not config.LOG_CHANNEL_ID:
+        return 0
+    from bot import get_client
+    SmartYTUtil = get_client()
+    next_id = int(await _db(media_cache.get_meta, 'mirror_last_id') or 0) + 1
+    restored = 0
+    empty_batches = 0
+    while empty_batches < REBUILD_MAX_EMPTY_BATCHES:
+        ids = list(range(next_id, next_id + REBUILD_BATCH))
+        next_id += REBUILD_BATCH
+        try:
+            messages = await SmartYTUtil.get_messages(config.LOG_CHANNEL_ID, ids=ids)
+        except Exception as e:
+            LOGGER.error(f"Media cache rebuild stopped: {e}")
+            break
+        found = [m for m in messages if m]
+        if not found:
+            empty_batches += 1
+            continue
+        empty_batches = 0
+        for message in found:
+            key = _parse_mirror_caption(message.message)
+            if key and message.document:
+                await _db(media_cache.put, *key, message.document, message.chat_id, message.id)
+                restored += 1
+        await _db(media_cache.set_meta, 'mirror_last_id', str(found[-1].id))
+    LOGGER.info(f"Media cache rebuilt from log channel: {restored} entries")
+    return restored
@@ -1,13 +1,17 @@
+import asyncio
 import time
+from collections import deque
+from typing import Callable, Optional
 
+from telethon.errors import FloodWaitError, MessageNotModifiedError
+
+import config
 from helpers.logger import LOGGER
 
+_chat_flushers: dict = {}
 
-async def progress_bar(current, total, status_message, start_time, last_update_time):
-    if time.time() - last_update_time[0] < 1:
-        return
-    last_update_time[0] = time.time()
 
+def render_progress(current, total, start_time) -> str:
     elapsed_time = time.time() - start_time
     percentage = (current / total) * 100 if total else 0
     progress = f"{'▓' * int(percentage // 5)}{'░' * (20 - int(percentage // 5))}"
@@ -15,7 +19,7 @@ async def progress_bar(current, total, status_message, start_time, last_update_t
     uploaded = current / 1024 / 1024
     total_size = total / 1024 / 1024
 
-    text = (
+    return (
         f"**Smart Upload Progress Bar ✅**\n"
         f"**━━━━━━━━━━━━━━━━━**\n"
         f"{progress}\n"
@@ -26,7 +30,111 @@ async def progress_bar(current, total, status_message, start_time, last_update_t
         f"**Smooth Transfer → Activated ✅**"
     )
 
+
+async def progress_bar(current, total, status_message, start_time, last_update_time):
+    if time.time() - last_update_time[0] < 1:
+        return
+    last_update_time[0] = time.time()
+
     try:
-        await status_message.edit(text)
+        await status_message.edit(render_progress(current, total, start_time))
     except Exception as e:
         LOGGER.error(f"Progress bar update error: {e}")
+
+
+class ProgressReporter:
+    def __init__(self, status_message, render: Optional[Callable[[], str]] = None, buttons=None):
+        self.status_message = status_message
+        self.chat_id = status_message.chat_id if status_message else None
+        self.render = render
+        self.buttons = buttons
+        self.start_time = time.time()
+        self.current = 0
+        self.total = 0
+        self.dirty = False
+        self.closed = False
+
+    def text(self) -> str:
+        if self.render:
+            return self.render()
+        return render_progress(self.current, self.total, self.start_time)
+
+    def update(self, current, total):
+        self.current = current
+        self.total = total
+        self.refresh()
+
+    def refresh(self):
+        if self.closed or self.status_message is None:
+            return
+        self.dirty = True
+        flusher = _chat_flushers.get(self.chat_id)
+        if flusher is None:
+            flusher = _chat_flushers[self.chat_id] = _ChatFlusher(self.chat_id)
+        flusher.add(self)
+
+    def close(self):
+        self.closed = True
+        flusher = _chat_flushers.get(self.chat_id)
+        if flusher:
+            flusher.remove(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class _ChatFlusher:
+    def __init__(self, chat_id):
+        self.chat_id = chat_id
+        self.reporters: deque = deque()
+        self.interval = config.PROGRESS_EDIT_INTERVAL
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def add(self, reporter: ProgressReporter):
+        if reporter not in self.reporters:
+            self.reporters.append(reporter)
+
+    def remove(self, reporter: ProgressReporter):
+        try:
+            self.reporters.remove(reporter)
+        except ValueError:
+            pass
+
+    def _next_dirty(self):
+        for _ in range(len(self.reporters)):
+            reporter = self.reporters[0]
+            self.reporters.rotate(-1)
+            if reporter.dirty and not reporter.closed:
+                return reporter
+        return None
+
+    async def _run(self):
+        try:
+            while self.reporters:
+                await asyncio.sleep(self.interval)
+                reporter = self._next_dirty()
+                if reporter is None:
+                    continue
+                reporter.dirty = False
+                try:
+                    if reporter.buttons is None:
+                        await reporter.status_message.edit(reporter.text())
+                    else:
+                        await reporter.status_message.edit(reporter.text(), buttons=reporter.buttons)
+                    self.interval = max(config.PROGRESS_EDIT_INTERVAL, self.interval * 0.9)
+                except FloodWaitError as e:
+                    self.interval = min(config.PROGRESS_MAX_EDIT_INTERVAL,
+                                        max(self.interval * 2, e.seconds))
+                    LOGGER.warning(f"FloodWait {e.seconds}s on progress edit in {self.chat_id}, "
+                                   f"interval now {self.interval:.0f}s")
+                except MessageNotModifiedError:
+                    pass
+                except Exception as e:
+                    LOGGER.error(f"Progress bar update error: {e}")
+        finally:
+            if _chat_flushers.get(self.chat_id) is self:
+                _chat_flushers.pop(self.chat_id, None)
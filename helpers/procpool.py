@@ -0,0 +1,193 @@
+import asyncio
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from helpers.logger import LOGGER
+
+_ctx = multiprocessing.get_context('spawn')
+
+
+def _worker_main(conn, max_jobs: int):
+    import yt_dlp  # noqa: F401  warm the extractor package before the first job
+    done = 0
+    while done < max_jobs:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        func, args = job
+        try:
+            reply = ('ok', func(*args))
+        except BaseException as e:
+            try:
+                pickle.dumps(e)
+                reply = ('err', e)
+            except Exception:
+                reply = ('err', RuntimeError(f"{type(e).__name__}: {e}"))
+        done += 1
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send(('err', RuntimeError(f"Unpicklable result: {e}")))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self.jobs = 0
+        self.conn, child_conn = _ctx.Pipe()
+        self.process = _ctx.Process(target=_worker_main, args=(child_conn, max_jobs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self._conn_lock = threading.Lock()
+        self._receiving = False
+        self._close_pending = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.jobs >= self.max_jobs
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def recv(self):
+        with self._conn_lock:
+            self._receiving = True
+        try:
+            return self.conn.recv()
+        finally:
+            with self._conn_lock:
+                self._receiving = False
+                close = self._close_pending
+            if close:
+                self.conn.close()
+
+    def _close_conn(self):
+        # A thread blocked in recv() sees EOF once the process is gone and closes the pipe itself.
+        with self._conn_lock:
+            if self._receiving:
+                self._close_pending = True
+                return
+        self.conn.close()
+
+    def terminate(self):
+        try:
+            self.process.terminate()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+        except Exception as e:
+            LOGGER.warning(f"Worker terminate failed: {e}")
+        self._close_conn()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.terminate()
+        else:
+            self._close_conn()
+
+
+class ProcessPool:
+    def __init__(self, workers: int, max_jobs_per_worker: int):
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._idle: Optional[asyncio.Queue] = None
+        self._all: set = set()
+        self._waiters = ThreadPoolExecutor(max_workers=workers * 2, thread_name_prefix="procpool")
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._replacing: set = set()
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            idle = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+            for _ in range(self.workers):
+                worker = await loop.run_in_executor(self._waiters, _Worker, self.max_jobs_per_worker)
+                self._all.add(worker)
+                idle.put_nowait(worker)
+            self._idle = idle
+            LOGGER.info(f"Process pool started with {self.workers} warm workers")
+
+    async def _replace(self, worker: _Worker, graceful: bool):
+        self._all.discard(worker)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._waiters, worker.stop if graceful else worker.terminate)
+        if self._closed:
+            return
+        fresh = await loop.run_in_executor(self._waiters, _Worker, self.max_jobs_per_worker)
+        if self._closed:
+            await loop.run_in_executor(self._waiters, fresh.terminate)
+            return
+        self._all.add(fresh)
+        self._idle.put_nowait(fresh)
+
+    def _schedule_replace(self, worker: _Worker, graceful: bool):
+        task = asyncio.create_task(self._replace(worker, graceful))
+        self._replacing.add(task)
+        task.add_done_callback(self._replace_done)
+
+    def _replace_done(self, task: asyncio.Task):
+        self._replacing.discard(task)
+        if not task.cancelled() and task.exception():
+            LOGGER.error(f"Worker replacement failed: {task.exception()}")
+
+    async def run(self, func: Callable, *args):
+        if self._closed:
+            raise RuntimeError("Process pool is shut down")
+        if not self.started:
+            await self.start()
+        worker = await self._idle.get()
+        if not worker.alive():
+            self._schedule_replace(worker, graceful=False)
+            worker = await self._idle.get()
+        loop = asyncio.get_running_loop()
+        try:
+            worker.conn.send((func, args))
+            worker.jobs += 1
+            status, value = await loop.run_in_executor(self._waiters, worker.recv)
+        except asyncio.CancelledError:
+            LOGGER.info(f"Terminating worker {worker.process.pid} for cancelled {func.__name__}")
+            self._schedule_replace(worker, graceful=False)
+            raise
+        except (EOFError, OSError) as e:
+            LOGGER.error(f"Worker {worker.process.pid} died during {func.__name__}: {e}")
+            self._schedule_replace(worker, graceful=False)
+            raise RuntimeError(f"Worker process died during {func.__name__}") from e
+        if worker.exhausted:
+            LOGGER.info(f"Recycling worker {worker.process.pid} after {worker.jobs} jobs")
+            self._schedule_replace(worker, graceful=True)
+        else:
+            self._idle.put_nowait(worker)
+        if status == 'err':
+            raise value
+        return value
+
+    async def shutdown(self):
+        self._closed = True
+        if self._replacing:
+            await asyncio.gather(*self._replacing, return_exceptions=True)
+        for worker in list(self._all):
+            worker.terminate()
+        self._all.clear()
+        self._idle = None
+        self._waiters.shutdown(wait=False)
@@ -0,0 +1,209 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Optional
+
+import config
+from helpers.logger import LOGGER
+from helpers.buttons import SmartButtons
+from helpers.botutils import edit_message
+
+AUDIO_PRIORITY = 0
+
+
+def job_priority(kind: str, height: Optional[int] = None) -> int:
+    if kind == 'audio':
+        return AUDIO_PRIORITY
+    return height or 720
+
+
+class Job:
+    def __init__(self, token: str, user_id: int, chat_id: int, msg_id: Optional[int],
+                 label: str, priority: int, factory: Callable[[], Awaitable], cancel_data: Optional[str]):
+        self.token = token
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.msg_id = msg_id
+        self.label = label
+        self.priority = priority
+        self.factory = factory
+        self.cancel_data = cancel_data
+        self.task: Optional[asyncio.Task] = None
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.reported_position: Optional[int] = None
+        self.position_edit: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        return scheduler.cancel(self.token)
+
+    def __await__(self):
+        return asyncio.shield(self.future).__await__()
+
+
+class JobScheduler:
+    def __init__(self, max_jobs: int, max_per_user: int, max_queued_per_user: int):
+        self.max_jobs = max_jobs
+        self.max_per_user = max_per_user
+        self.max_queued_per_user = max_queued_per_user
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._jobs: dict = {}
+        self._running: dict = {}
+        self._user_running: dict = {}
+        self._user_queued: dict = {}
+        self._reporter: Optional[asyncio.Task] = None
+        self._positions_stale = False
+        self._closed = False
+
+    def get(self, token: str) -> Optional[Job]:
+        return self._jobs.get(token)
+
+    def stats(self) -> dict:
+        return {
+            'running': len(self._running),
+            'queued': len(self._jobs) - len(self._running),
+            'max_jobs': self.max_jobs,
+        }
+
+    def can_accept(self, user_id: int) -> bool:
+        return self._user_queued.get(user_id, 0) < self.max_queued_per_user
+
+    def submit(self, token: str, user_id: int, chat_id: int, msg_id: Optional[int], label: str,
+               factory: Callable[[], Awaitable], priority: int = 0,
+               cancel_data: Optional[str] = None) -> Optional[Job]:
+        existing = self._jobs.get(token)
+        if existing and not existing.done():
+            return existing
+        if self._closed or not self.can_accept(user_id):
+            return None
+        job = Job(token, user_id, chat_id, msg_id, label, priority, factory, cancel_data)
+        self._jobs[token] = job
+        self._user_queued[user_id] = self._user_queued.get(user_id, 0) + 1
+        heapq.heappush(self._heap, (priority, next(self._seq), job))
+        LOGGER.info(f"Job queued: {label} | User: {user_id} | Priority: {priority}")
+        self._dispatch()
+        return job
+
+    def cancel(self, token: str) -> bool:
+        job = self._jobs.get(token)
+        if not job or job.done():
+            return False
+        if job.running:
+            job.task.cancel()
+            return True
+        self._heap = [entry for entry in self._heap if entry[2] is not job]
+        heapq.heapify(self._heap)
+        self._forget(job)
+        job.future.cancel()
+        LOGGER.info(f"Job cancelled while queued: {job.label} | User: {job.user_id}")
+        self._dispatch()
+        return True
+
+    def _forget(self, job: Job):
+        self._jobs.pop(job.token, None)
+        remaining = self._user_queued.get(job.user_id, 1) - 1
+        if remaining > 0:
+            self._user_queued[job.user_id] = remaining
+        else:
+            self._user_queued.pop(job.user_id, None)
+
+    def _dispatch(self):
+        if self._closed:
+            return
+        deferred = []
+        while self._heap and len(self._running) < self.max_jobs:
+            entry = heapq.heappop(self._heap)
+            job = entry[2]
+            if self._user_running.get(job.user_id, 0) >= self.max_per_user:
+                deferred.append(entry)
+                continue
+            self._start(job)
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        if self._heap:
+            self._schedule_report()
+
+    def _schedule_report(self):
+        self._positions_stale = True
+        if self._reporter is None or self._reporter.done():
+            self._reporter = asyncio.create_task(self._report_positions())
+
+    async def shutdown(self):
+        self._closed = True
+        tasks = [job.task for job in self._running.values()]
+        if self._reporter:
+            tasks.append(self._reporter)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._reporter = None
+
+    def _start(self, job: Job):
+        job.started_at = time.monotonic()
+        self._running[job.token] = job
+        self._user_running[job.user_id] = self._user_running.get(job.user_id, 0) + 1
+        job.task = asyncio.create_task(self._run(job))
+        LOGGER.info(
+            f"Job started: {job.label} | User: {job.user_id} | "
+            f"Waited: {job.started_at - job.queued_at:.1f}s | Running: {len(self._running)}/{self.max_jobs}"
+        )
+
+    async def _run(self, job: Job):
+        try:
+            if job.position_edit and not job.position_edit.done():
+                # Let an in-flight "Queued" edit land before the job starts editing the same message.
+                await asyncio.wait([job.position_edit])
+            result = await job.factory()
+        except asyncio.CancelledError:
+            LOGGER.info(f"Job cancelled while running: {job.label} | User: {job.user_id}")
+            job.future.cancel()
+        except Exception as e:
+            LOGGER.error(f"Job failed: {job.label} | User: {job.user_id} | {e}")
+            job.future.set_exception(e)
+            job.future.exception()
+        else:
+            job.future.set_result(result)
+        finally:
+            self._running.pop(job.token, None)
+            remaining = self._user_running.get(job.user_id, 1) - 1
+            if remaining > 0:
+                self._user_running[job.user_id] = remaining
+            else:
+                self._user_running.pop(job.user_id, None)
+            self._forget(job)
+            self._dispatch()
+
+    async def _report_positions(self):
+        while self._positions_stale:
+            self._positions_stale = False
+            for position, (_, _, job) in enumerate(sorted(self._heap), 1):
+                if job.msg_id is None or job.running or job.done() or job.reported_position == position:
+                    continue
+                job.reported_position = position
+                buttons = None
+                if job.cancel_data:
+                    sb = SmartButtons()
+                    sb.button("❌ Cancel", callback_data=job.cancel_data)
+                    buttons = sb.build_menu(b_cols=1)
+                job.position_edit = asyncio.ensure_future(edit_message(
+                    job.chat_id, job.msg_id,
+                    f"**⏳ Queued: {job.label}**\n"
+                    f"**━━━━━━━━━━━━━━━━━━━━━**\n"
+                    f"**Position:** {position} | **Active:** {len(self._running)}/{self.max_jobs}\n"
+                    f"**Your download will start automatically.**",
+                    buttons=buttons,
+                ))
+                await asyncio.wait([job.position_edit])
+
+
+scheduler = JobScheduler(config.MAX_CONCURRENT_JOBS, config.MAX_JOBS_PER_USER, config.MAX_QUEUED_PER_USER)
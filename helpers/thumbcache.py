@@ -0,0 +1,216 @@
+import asyncio
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+
+import config
+from helpers.logger import LOGGER
+
+THUMB_CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "thumbs"
+THUMB_URL = "https://i.ytimg.com/vi/{vid}/{variant}.jpg"
+THUMB_PROBE_BUDGET = 1.5
+VARIANT_MEMORY_SIZE = 4096
+
+_session: Optional[aiohttp.ClientSession] = None
+_variant_status: "OrderedDict[tuple, bool]" = OrderedDict()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=30, connect=10),
+        )
+    return _session
+
+
+async def run_io(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def close_http_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class ThumbCache:
+    def __init__(self, directory: Path, max_bytes: int):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        files = [f for f in directory.iterdir() if f.is_file() and f.suffix == '.jpg']
+        for f in sorted(files, key=lambda f: f.stat().st_mtime):
+            size = f.stat().st_size
+            self._entries[f.name] = size
+            self._size += size
+        self._evict()
+
+    @staticmethod
+    def _name(video_id: str, variant: str) -> str:
+        return f"{video_id}_{variant}.jpg"
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                os.remove(self.directory / name)
+            except OSError:
+                pass
+
+    def get(self, video_id: str, variant: str) -> Optional[Path]:
+        name = self._name(video_id, variant)
+        path = self.directory / name
+        with self._lock:
+            if name not in self._entries or not path.exists():
+                self._size -= self._entries.pop(name, 0)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def read(self, video_id: str, variant: str) -> Optional[bytes]:
+        path = self.get(video_id, variant)
+        if not path:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def copy_to(self, video_id: str, variant: str, out_path: str) -> Optional[str]:
+        path = self.get(video_id, variant)
+        if not path:
+            return None
+        try:
+            shutil.copyfile(path, out_path)
+        except OSError as e:
+            LOGGER.warning(f"Thumb cache copy failed for {video_id} [{variant}]: {e}")
+            return None
+        return out_path
+
+    def put(self, video_id: str, variant: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        name = self._name(video_id, variant)
+        tmp_path = self.directory / f"{name}.tmp"
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.directory / name)
+        except OSError as e:
+            LOGGER.warning(f"Thumb cache write failed for {video_id} [{variant}]: {e}")
+            return
+        with self._lock:
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    def put_file(self, video_id: str, variant: str, path: str):
+        try:
+            with open(path, 'rb') as f:
+                self.put(video_id, variant, f.read())
+        except OSError as e:
+            LOGGER.warning(f"Thumb cache read failed for {path}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+thumb_cache = ThumbCache(THUMB_CACHE_DIR, config.THUMB_CACHE_MAX_MB * 1024 * 1024)
+
+
+def _remember_variant(video_id: str, variant: str, exists: bool):
+    _variant_status[(video_id, variant)] = exists
+    _variant_status.move_to_end((video_id, variant))
+    while len(_variant_status) > VARIANT_MEMORY_SIZE:
+        _variant_status.popitem(last=False)
+
+
+def variant_exists(video_id: str, variant: str) -> Optional[bool]:
+    return _variant_status.get((video_id, variant))
+
+
+async def _probe_variant(video_id: str, variant: str, headers: Optional[dict]) -> Optional[bytes]:
+    url = THUMB_URL.format(vid=video_id, variant=variant)
+    try:
+        async with get_http_session().get(url, headers=headers) as resp:
+            if resp.status == 404:
+                _remember_variant(video_id, variant, False)
+                return None
+            if resp.status != 200:
+                return None
+            raw = await resp.read()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        LOGGER.error(f"Thumb fetch error from {url}: {e}")
+        return None
+    if not raw:
+        return None
+    _remember_variant(video_id, variant, True)
+    asyncio.get_running_loop().run_in_executor(None, thumb_cache.put, video_id, f"raw_{variant}", raw)
+    return raw
+
+
+async def fetch_best_raw_thumb(video_id: str, variants: list, headers: Optional[dict] = None) -> Optional[tuple]:
+    loop = asyncio.get_running_loop()
+    candidates = []
+    tasks = {}
+    for variant in variants:
+        if variant_exists(video_id, variant) is False:
+            continue
+        candidates.append(variant)
+        raw = await run_io(thumb_cache.read, video_id, f"raw_{variant}")
+        if raw:
+            tasks[variant] = loop.create_future()
+            tasks[variant].set_result(raw)
+            break
+        tasks[variant] = asyncio.ensure_future(_probe_variant(video_id, variant, headers))
+
+    deadline = loop.time() + THUMB_PROBE_BUDGET
+    try:
+        while True:
+            for variant in candidates:
+                task = tasks[variant]
+                if not task.done():
+                    break
+                if task.result():
+                    return variant, task.result()
+            else:
+                return None
+            if loop.time() >= deadline:
+                available = [v for v in candidates if tasks[v].done() and tasks[v].result()]
+                if available:
+                    LOGGER.info(f"Thumb probe budget spent for {video_id}, using {available[0]}")
+                    return available[0], tasks[available[0]].result()
+            pending = [task for task in tasks.values() if not task.done()]
+            timeout = max(0.0, deadline - loop.time()) if loop.time() < deadline else None
+            await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,88 @@
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PIL import Image
+
+import config
+from helpers.logger import LOGGER
+
+TG_THUMB_BOX = (320, 320)
+TG_THUMB_MAX_BYTES = 20 * 1024
+TG_THUMB_MIN_QUALITY = 40
+TG_THUMB_MAX_QUALITY = 85
+TG_THUMB_PROBE_QUALITY = 55
+TG_THUMB_SIZE_MARGIN = 0.95
+
+thumb_executor = ThreadPoolExecutor(max_workers=config.THUMB_ENCODE_WORKERS, thread_name_prefix="thumb")
+
+
+def _fit_size(size: tuple, box: tuple) -> tuple:
+    scale = min(box[0] / size[0], box[1] / size[1], 1.0)
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def decode_draft(raw_bytes: bytes, target: tuple) -> Image.Image:
+    img = Image.open(io.BytesIO(raw_bytes))
+    if img.format == 'JPEG':
+        img.draft('RGB', (target[0] * 2, target[1] * 2))
+    return img.convert('RGB')
+
+
+def _encode(img: Image.Image, quality: int) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, 'JPEG', quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def predict_quality(high: tuple, low: tuple, max_bytes: int) -> int:
+    (q_high, size_high), (q_low, size_low) = high, low
+    if size_high <= size_low:
+        return q_low
+    # Encoded size grows roughly exponentially with quality in this range, so interpolate log sizes.
+    ratio = (math.log(max_bytes * TG_THUMB_SIZE_MARGIN) - math.log(size_low)) / (
+        math.log(size_high) - math.log(size_low)
+    )
+    return max(q_low, min(q_high - 1, int(q_low + ratio * (q_high - q_low))))
+
+
+def encode_to_fit(img: Image.Image, max_bytes: int) -> bytes:
+    data = _encode(img, TG_THUMB_MAX_QUALITY)
+    if len(data) <= max_bytes:
+        return data
+    high = (TG_THUMB_MAX_QUALITY, len(data))
+    data = _encode(img, TG_THUMB_PROBE_QUALITY)
+    if len(data) > max_bytes:
+        return _encode(img, TG_THUMB_MIN_QUALITY)
+    quality = predict_quality(high, (TG_THUMB_PROBE_QUALITY, len(data)), max_bytes)
+    if quality <= TG_THUMB_PROBE_QUALITY:
+        return data
+    predicted = _encode(img, quality)
+    return predicted if len(predicted) <= max_bytes else data
+
+
+def encode_tg_thumb(raw_bytes: bytes, out_path: str) -> Optional[str]:
+    try:
+        with Image.open(io.BytesIO(raw_bytes)) as probe:
+            target = _fit_size(probe.size, TG_THUMB_BOX)
+        img = decode_draft(raw_bytes, target)
+        img = img.resize(target, Image.LANCZOS)
+        data = encode_to_fit(img, TG_THUMB_MAX_BYTES)
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        return out_path
+    except Exception as e:
+        LOGGER.error(f"Thumb save error: {e}")
+        return None
+
+
+def encode_resized(raw_bytes: bytes, out_path: str, size: tuple, jpeg_quality: int) -> Optional[str]:
+    try:
+        img = decode_draft(raw_bytes, size)
+        img = img.resize(size, Image.LANCZOS)
+        img.save(out_path, 'JPEG', quality=jpeg_quality, optimize=True)
+        return out_path
+    except Exception as e:
+        LOGGER.error(f"Thumb process error: {e}")
+        return None
@@ -1,22 +1,27 @@
 import asyncio
+import copy
 import hashlib
-import io
 import os
 import re
-import subprocess
+import threading
 import time
+from bisect import bisect_right
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
-import aiohttp
 import yt_dlp
-from PIL import Image
 
+import config
 from config import VIDEO_QUALITY_OPTIONS, AUDIO_QUALITY_OPTIONS
 from helpers.logger import LOGGER
 from helpers.utils import clean_download, clean_temp_files
 from helpers.buttons import SmartButtons
+from helpers.hedge import hedged
+from helpers.procpool import ProcessPool
+from helpers.thumbcache import thumb_cache, fetch_best_raw_thumb, run_io
+from helpers.thumbencode import thumb_executor, encode_tg_thumb
 
 TEMP_DIR = Path("./downloads")
 TEMP_DIR.mkdir(exist_ok=True)
@@ -28,6 +33,12 @@ MAX_DURATION = 10800
 SOCKET_TIMEOUT = 60
 RETRIES = 3
 EXECUTOR_WORKERS = 8
+INFO_CACHE_TTL = 1800
+INFO_CACHE_SIZE = 64
+PLAYER_CLIENTS = ("ANDROID", "MWEB", "TV_EMBED")
+PLAYER_TIMEOUT = 3
+PLAYER_STAGGER = 0.3
+KEYFRAME_SEEK_EPSILON = 0.001
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124',
@@ -37,6 +48,13 @@ HEADERS = {
 }
 
 executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS)
+ydl_pool = ProcessPool(config.YDL_PROCESS_WORKERS, config.YDL_WORKER_MAX_JOBS)
+
+_info_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_info_cache_lock = threading.Lock()
+_info_inflight: dict = {}
+_player_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_player_inflight: dict = {}
 
 _DENO_BIN = os.path.expanduser("~/.deno/bin")
 if _DENO_BIN not in os.environ.get("PATH", ""):
@@ -131,56 +149,31 @@ def extract_video_id(url: str) -> Optional[str]:
     return url if len(url) == 11 else None
 
 
-def _save_thumb(raw_bytes: bytes, out_path: str) -> Optional[str]:
-    try:
-        img = Image.open(io.BytesIO(raw_bytes)).convert('RGB')
-        img.thumbnail((320, 320), Image.LANCZOS)
-        for quality in [85, 60, 40]:
-            buf = io.BytesIO()
-            img.save(buf, 'JPEG', quality=quality, optimize=True)
-            if buf.tell() <= 20 * 1024:
-                with open(out_path, 'wb') as f:
-                    f.write(buf.getvalue())
-                return out_path
-        buf.seek(0)
-        with open(out_path, 'wb') as f:
-            f.write(buf.getvalue())
-        return out_path
-    except Exception as e:
-        LOGGER.error(f"Thumb save error: {e}")
-        return None
-
-
 async def fetch_thumbnail(video_id: str, out_path: str) -> Optional[str]:
     if not video_id:
         return None
-    urls = [
-        f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
-        f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
-    ]
-    try:
-        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
-            for url in urls:
-                try:
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            raw = await resp.read()
-                            loop = asyncio.get_running_loop()
-                            result = await loop.run_in_executor(
-                                executor, lambda r=raw, p=out_path: _save_thumb(r, p)
-                            )
-                            if result and os.path.exists(result):
-                                LOGGER.info(f"Thumbnail saved: {result} ({os.path.getsize(result)} bytes)")
-                                return result
-                except Exception as e:
-                    LOGGER.error(f"Thumb URL error: {e}")
-    except Exception as e:
-        LOGGER.error(f"Thumbnail session error: {e}")
+    cached = await run_io(thumb_cache.copy_to, video_id, 'tg', out_path)
+    if cached:
+        return cached
+    found = await fetch_best_raw_thumb(video_id, ['maxresdefault', 'hqdefault'], HEADERS)
+    if not found:
+        return None
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(thumb_executor, encode_tg_thumb, found[1], out_path)
+    if result and os.path.exists(result):
+        await run_io(thumb_cache.put_file, video_id, 'tg', result)
+        LOGGER.info(f"Thumbnail saved from {found[0]}: {result} ({os.path.getsize(result)} bytes)")
+        return result
     return None
 
 
+async def run_ydl_task(func, *args):
+    if config.YDL_BACKEND == 'process':
+        return await ydl_pool.run(func, *args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
 def _ydl_search_info(query: str) -> Optional[dict]:
     opts = {
         'quiet': True,
@@ -213,33 +206,72 @@ def _ydl_search_info(query: str) -> Optional[dict]:
 
 async def search_youtube_metadata(query: str) -> Optional[dict]:
     try:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(executor, _ydl_search_info, query)
+        return await run_ydl_task(_ydl_search_info, query)
     except Exception as e:
         LOGGER.error(f"search_youtube_metadata error: {e}")
     return None
 
 
-async def search_youtube_url(query: str) -> Optional[str]:
-    for attempt in range(2):
-        try:
-            loop = asyncio.get_running_loop()
-            info = await loop.run_in_executor(executor, _ydl_search_info, query)
-            if info and info.get('link'):
-                return info['link']
-            simplified = re.sub(r'[^\w\s]', '', query).strip()
-            if simplified and simplified != query:
-                info2 = await loop.run_in_executor(executor, _ydl_search_info, simplified)
-                if info2 and info2.get('link'):
-                    return info2['link']
-        except Exception as e:
-            LOGGER.error(f"Search attempt {attempt + 1} error: {e}")
-            if attempt < 1:
-                await asyncio.sleep(1)
+async def _py_yt_search_link(query: str) -> Optional[str]:
+    from py_yt import VideosSearch
+    search = VideosSearch(query, limit=1, fields=("id", "link"))
+    result = await search.next()
+    for entry in result.get('result') or []:
+        if entry.get('link'):
+            return entry['link']
     return None
 
 
-def _ydl_extract_url_info(video_url: str) -> Optional[dict]:
+async def _ydl_search_link(query: str) -> Optional[str]:
+    info = await run_ydl_task(_ydl_search_info, query)
+    return info.get('link') if info else None
+
+
+async def search_youtube_url(query: str) -> Optional[str]:
+    link, _ = await hedged('url_search', lambda: _py_yt_search_link(query), lambda: _ydl_search_link(query))
+    if link:
+        return link
+    simplified = re.sub(r'[^\w\s]', '', query).strip()
+    if simplified and simplified != query:
+        link, _ = await hedged(
+            'url_search', lambda: _py_yt_search_link(simplified), lambda: _ydl_search_link(simplified)
+        )
+    return link
+
+
+def _info_cache_get(video_id: Optional[str]) -> Optional[dict]:
+    if not video_id:
+        return None
+    with _info_cache_lock:
+        entry = _info_cache.get(video_id)
+        if not entry:
+            return None
+        stored_at, info = entry
+        if time.time() - stored_at > INFO_CACHE_TTL:
+            _info_cache.pop(video_id, None)
+            return None
+        _info_cache.move_to_end(video_id)
+        return info
+
+
+def _info_cache_put(video_id: Optional[str], info: dict) -> None:
+    if not video_id or not info:
+        return
+    with _info_cache_lock:
+        _info_cache[video_id] = (time.time(), info)
+        _info_cache.move_to_end(video_id)
+        while len(_info_cache) > INFO_CACHE_SIZE:
+            _info_cache.popitem(last=False)
+
+
+def invalidate_cached_info(video_url: str) -> None:
+    video_id = extract_video_id(video_url)
+    if video_id:
+        with _info_cache_lock:
+            _info_cache.pop(video_id, None)
+
+
+def _ydl_extract_info(video_url: str) -> Optional[dict]:
     opts = {
         'quiet': True,
         'no_warnings': True,
@@ -247,6 +279,7 @@ def _ydl_extract_url_info(video_url: str) -> Optional[dict]:
         'nocheckcertificate': True,
         'socket_timeout': SOCKET_TIMEOUT,
         'noplaylist': True,
+        'ignore_no_formats_error': True,
         'remote_components': 'ejs:github',
     }
     opts.update(get_cookies_opt())
@@ -255,74 +288,190 @@ def _ydl_extract_url_info(video_url: str) -> Optional[dict]:
             info = ydl.extract_info(video_url, download=False)
             if not info:
                 return None
-            return {
-                'title': info.get('title', 'Unknown'),
-                'channel': info.get('uploader') or info.get('channel', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'viewCount': info.get('view_count', 0),
-                'link': info.get('webpage_url', video_url),
-                'id': info.get('id', ''),
-            }
+            return ydl.sanitize_info(info)
     except Exception as e:
         LOGGER.error(f"yt-dlp URL extract error: {e}")
     return None
 
 
-async def fetch_metadata_from_url(video_url: str) -> Optional[dict]:
+async def _extract_video_info(video_url: str, video_id: Optional[str]) -> Optional[dict]:
+    try:
+        info = await run_ydl_task(_ydl_extract_info, video_url)
+    except Exception as e:
+        LOGGER.error(f"get_video_info error: {e}")
+        return None
+    if info:
+        _info_cache_put(info.get('id') or video_id, info)
+    return info
+
+
+async def get_video_info(video_url: str) -> Optional[dict]:
     if not video_url:
         return None
+    video_id = extract_video_id(video_url)
+    info = _info_cache_get(video_id)
+    if info:
+        LOGGER.info(f"Info cache hit: {video_id}")
+        return info
+    if not video_id:
+        return await _extract_video_info(video_url, video_id)
+    return await asyncio.shield(_video_info_task(video_url, video_id))
+
+
+def _video_info_task(video_url: str, video_id: str) -> asyncio.Future:
+    task = _info_inflight.get(video_id)
+    if task is None:
+        task = asyncio.ensure_future(_extract_video_info(video_url, video_id))
+        _info_inflight[video_id] = task
+        task.add_done_callback(lambda _: _info_inflight.pop(video_id, None))
+    return task
+
+
+async def _race_player(video_id: str) -> Optional[dict]:
+    from py_yt import Video
+    started = time.monotonic()
     try:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(executor, _ydl_extract_url_info, video_url)
+        player = await Video.getRaced(
+            video_id, clients=PLAYER_CLIENTS, timeout=PLAYER_TIMEOUT, stagger=PLAYER_STAGGER
+        )
     except Exception as e:
-        LOGGER.error(f"fetch_metadata_from_url error: {e}")
-    return None
+        LOGGER.warning(f"Innertube player lookup failed for {video_id}: {e}")
+        return None
+    if not player:
+        LOGGER.warning(f"Innertube player lookup returned nothing for {video_id}")
+        return None
+    LOGGER.info(f"Innertube player: {video_id} via {player.get('client')} in {time.monotonic() - started:.2f}s")
+    _player_cache[video_id] = (time.time(), player)
+    _player_cache.move_to_end(video_id)
+    while len(_player_cache) > INFO_CACHE_SIZE:
+        _player_cache.popitem(last=False)
+    return player
 
 
-def _get_available_formats(url: str) -> dict:
-    opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'skip_download': True,
-        'nocheckcertificate': True,
-        'socket_timeout': SOCKET_TIMEOUT,
-        'ignoreerrors': True,
-        'ignore_no_formats_error': True,
-        'extractor_args': {'youtube': {'skip': ['hls', 'dash']}},
-        'remote_components': 'ejs:github',
+async def get_player_info(video_url: str) -> Optional[dict]:
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        return None
+    entry = _player_cache.get(video_id)
+    if entry and time.time() - entry[0] <= INFO_CACHE_TTL:
+        return entry[1]
+    task = _player_inflight.get(video_id)
+    if task is None:
+        task = asyncio.ensure_future(_race_player(video_id))
+        _player_inflight[video_id] = task
+        task.add_done_callback(lambda _: _player_inflight.pop(video_id, None))
+    return await asyncio.shield(task)
+
+
+def _meta_from_player(player: dict, video_url: str) -> dict:
+    seconds = (player.get('duration') or {}).get('secondsText')
+    views = (player.get('viewCount') or {}).get('text')
+    return {
+        'title': player.get('title') or 'Unknown',
+        'channel': (player.get('channel') or {}).get('name') or 'Unknown',
+        'duration': int(seconds) if str(seconds).isdigit() else 0,
+        'viewCount': int(views) if str(views).isdigit() else 0,
+        'link': player.get('link') or video_url,
+        'id': player.get('id', ''),
     }
-    opts.update(get_cookies_opt())
+
+
+def _formats_from_player(player: Optional[dict]) -> dict:
+    streaming = (player or {}).get('streamingData') or {}
+    video_heights = set()
+    audio_abrs = set()
+    for f in (streaming.get('formats') or []) + (streaming.get('adaptiveFormats') or []):
+        mime = f.get('mimeType') or ''
+        if mime.startswith('video/') and f.get('height'):
+            video_heights.add(int(f['height']))
+        elif mime.startswith('audio/'):
+            bitrate = f.get('averageBitrate') or f.get('bitrate')
+            if bitrate:
+                audio_abrs.add(int(bitrate) // 1000)
+    return {
+        'video_heights': sorted(video_heights, reverse=True),
+        'audio_abrs': sorted(audio_abrs, reverse=True),
+    }
+
+
+def _meta_from_info(info: dict, video_url: str) -> dict:
+    return {
+        'title': info.get('title', 'Unknown'),
+        'channel': info.get('uploader') or info.get('channel', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'viewCount': info.get('view_count', 0),
+        'link': info.get('webpage_url', video_url),
+        'id': info.get('id', ''),
+    }
+
+
+def _formats_from_info(info: Optional[dict]) -> dict:
+    if not info:
+        return {'video_heights': [], 'audio_abrs': []}
+    video_heights = set()
+    audio_abrs = set()
+    for f in info.get('formats') or []:
+        h = f.get('height')
+        vcodec = f.get('vcodec', 'none') or 'none'
+        acodec = f.get('acodec', 'none') or 'none'
+        if h and vcodec != 'none':
+            video_heights.add(int(h))
+        abr = f.get('abr')
+        if not abr:
+            abr = f.get('tbr')
+        if abr and acodec != 'none' and vcodec == 'none':
+            audio_abrs.add(int(abr))
+    return {
+        'video_heights': sorted(list(video_heights), reverse=True),
+        'audio_abrs': sorted(list(audio_abrs), reverse=True),
+    }
+
+
+async def fetch_metadata_from_url(video_url: str) -> Optional[dict]:
+    info = _info_cache_get(extract_video_id(video_url))
+    if not info:
+        player = await get_player_info(video_url)
+        if player:
+            return _meta_from_player(player, video_url)
+        info = await get_video_info(video_url)
+    if not info:
+        return None
+    return _meta_from_info(info, video_url)
+
+
+async def fetch_available_formats(video_url: str) -> dict:
     try:
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            if not info:
-                return {'video_heights': [], 'audio_abrs': []}
-            formats = info.get('formats', [])
-            video_heights = set()
-            audio_abrs = set()
-            for f in formats:
-                h = f.get('height')
-                vcodec = f.get('vcodec', 'none') or 'none'
-                acodec = f.get('acodec', 'none') or 'none'
-                if h and vcodec != 'none':
-                    video_heights.add(int(h))
-                abr = f.get('abr')
-                if not abr:
-                    abr = f.get('tbr')
-                if abr and acodec != 'none' and vcodec == 'none':
-                    audio_abrs.add(int(abr))
-            return {
-                'video_heights': sorted(list(video_heights), reverse=True),
-                'audio_abrs': sorted(list(audio_abrs), reverse=True),
-            }
+        info = _info_cache_get(extract_video_id(video_url))
+        if not info:
+            formats = _formats_from_player(await get_player_info(video_url))
+            if formats['video_heights']:
+                return formats
+        return _formats_from_info(info or await get_video_info(video_url))
     except Exception as e:
         LOGGER.error(f"Formats fetch error: {e}")
         return {'video_heights': [], 'audio_abrs': []}
 
 
-def _run_ydl(opts: dict, url: str):
+def _run_ydl(opts: dict, url: str, info: Optional[dict] = None) -> bool:
     with yt_dlp.YoutubeDL(opts) as ydl:
+        if info:
+            try:
+                ydl.process_ie_result(copy.deepcopy(info), download=True)
+                return False
+            except yt_dlp.utils.DownloadError as e:
+                LOGGER.warning(f"Cached info download failed, re-extracting: {e}")
         ydl.download([url])
+    return bool(info)
+
+
+async def download_with_ydl(opts: dict, url: str):
+    video_id = extract_video_id(url)
+    info = _info_cache_get(video_id)
+    if not info and video_id:
+        info = await asyncio.shield(_video_info_task(url, video_id))
+    stale = await run_ydl_task(_run_ydl, opts, url, info)
+    if stale:
+        invalidate_cached_info(url)
 
 
 def get_video_ydl_opts(output_base: str, quality_key: str) -> dict:
@@ -460,27 +609,138 @@ def build_audio_quality_markup(token: str, qualities: list, cb_prefix: str = "YA
     return sb.build_menu(b_cols=2, f_cols=1)
 
 
-def split_file_ffmpeg(file_path: str, output_dir: str, segment_duration: int, ext: str) -> List[str]:
-    os.makedirs(output_dir, exist_ok=True)
-    output_pattern = os.path.join(output_dir, f"part_%03d{ext}")
-    cmd = [
-        'ffmpeg', '-y', '-i', file_path,
-        '-f', 'segment',
-        '-segment_time', str(segment_duration),
+async def probe_duration(file_path: str) -> int:
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1', file_path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    try:
+        return int(float(out.decode().strip()))
+    except ValueError:
+        return 0
+
+
+async def probe_keyframes(file_path: str) -> List[float]:
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0', file_path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    keyframes = []
+    for line in out.decode().splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' not in flags:
+            continue
+        try:
+            keyframes.append(float(pts))
+        except ValueError:
+            continue
+    return sorted(keyframes)
+
+
+def plan_split_parts(duration: float, segment_duration: int, keyframes: Optional[List[float]] = None) -> List[tuple]:
+    if not keyframes:
+        parts = []
+        start = 0
+        while start < duration:
+            length = min(segment_duration, duration - start)
+            parts.append((start, length))
+            start += length
+        return parts
+    cuts = [0.0]
+    while duration - cuts[-1] > segment_duration:
+        index = bisect_right(keyframes, cuts[-1] + segment_duration) - 1
+        if index < 0 or keyframes[index] <= cuts[-1]:
+            index = bisect_right(keyframes, cuts[-1])
+            if index >= len(keyframes):
+                break
+        cuts.append(keyframes[index])
+    ends = cuts[1:] + [duration]
+    return [(start, end - start) for start, end in zip(cuts, ends)]
+
+
+async def cut_part_ffmpeg(file_path: str, out_path: str, start: float, length: Optional[float]) -> str:
+    # Cuts sit on keyframes; the epsilon keeps input seeking from snapping back to the previous one.
+    offset = KEYFRAME_SEEK_EPSILON if start > 0 else 0.0
+    limit = ['-t', f"{length - offset:.6f}"] if length else []
+    proc = await asyncio.create_subprocess_exec(
+        'ffmpeg', '-v', 'error', '-y',
+        '-ss', f"{start + offset:.6f}", '-i', file_path, *limit,
         '-c', 'copy',
-        '-reset_timestamps', '1',
         '-avoid_negative_ts', 'make_zero',
-        output_pattern
-    ]
-    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-    if result.returncode != 0:
-        raise RuntimeError(f"FFmpeg split failed: {result.stderr.decode()}")
-    parts = sorted([
-        os.path.join(output_dir, f)
-        for f in os.listdir(output_dir)
-        if f.startswith('part_') and f.endswith(ext)
-    ])
-    return parts
+        out_path,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, err = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        await proc.wait()
+        clean_download(out_path)
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg split failed: {err.decode()}")
+    return out_path
+
+
+async def iter_split_parts(file_path: str, output_dir: str, segment_duration: int, duration: int, ext: str):
+    os.makedirs(output_dir, exist_ok=True)
+    if duration <= 0:
+        duration = await probe_duration(file_path)
+    keyframes = await probe_keyframes(file_path)
+    if keyframes:
+        duration = max(duration, keyframes[-1])
+    plan = plan_split_parts(duration, segment_duration, keyframes)
+    if not plan:
+        raise RuntimeError("Cannot split a file with unknown duration")
+    total_parts = len(plan)
+    slots = asyncio.Semaphore(max(1, config.SPLIT_PARTS_IN_FLIGHT))
+    ready: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            for index, (start, length) in enumerate(plan, 1):
+                await slots.acquire()
+                part_path = os.path.join(output_dir, f"part_{index:03d}{ext}")
+                await cut_part_ffmpeg(file_path, part_path, start, length if index < total_parts else None)
+                await ready.put((index, part_path, max(1, round(length))))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await ready.put(e)
+            return
+        await ready.put(None)
+
+    producer = asyncio.create_task(produce())
+    part_path = None
+    try:
+        while True:
+            item = await ready.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            index, part_path, length = item
+            yield index, total_parts, part_path, length
+            clean_download(part_path)
+            part_path = None
+            slots.release()
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except (asyncio.CancelledError, Exception):
+            pass
+        while not ready.empty():
+            item = ready.get_nowait()
+            if isinstance(item, tuple):
+                clean_download(item[1])
+        if part_path:
+            clean_download(part_path)
 
 
 def compute_segment_duration(file_size: int, duration: int) -> int:
@@ -2,19 +2,34 @@ import asyncio
 import sys
 from pathlib import Path
 
+import config
 from helpers.logger import LOGGER
 from bot import start_bot
 from handler_loader import register_all_handlers
+from helpers.mediacache import rebuild_media_cache
+from helpers.scheduler import scheduler
+from helpers.thumbcache import close_http_session
+from helpers.ythelpers import ydl_pool
+from py_yt import closeClients
 
 async def run_bot():
     LOGGER.info("Starting bot initialization...")
+    if config.YDL_BACKEND == 'process':
+        await ydl_pool.start()
     SmartYTUtil = await start_bot()
     LOGGER.info("Registering event handlers...")
     await register_all_handlers(SmartYTUtil)
+    asyncio.create_task(rebuild_media_cache())
     me = await SmartYTUtil.get_me()
     LOGGER.info(f"Bot Successfully Started | @{me.username}")
     LOGGER.info("Bot is now running and listening for events...")
-    await SmartYTUtil.run_until_disconnected()
+    try:
+        await SmartYTUtil.run_until_disconnected()
+    finally:
+        await scheduler.shutdown()
+        await ydl_pool.shutdown()
+        await closeClients()
+        await close_http_session()
 
 async def main():
     LOGGER.info("=" * 60)
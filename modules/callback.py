@@ -72,7 +72,8 @@ async def callback_handler(event):
             "• /video — Download a YouTube video\n"
             "• /mp3   — Download a song as audio\n"
             "• /aud   — Convert video to audio\n"
-            "• /song  — Download a song as audio\n\n"
+            "• /song  — Download a song as audio\n"
+            "• /playlist — Download a whole playlist\n\n"
             "**🔍 Search & Info:**\n"
             "• /search — Search for audio or video\n"
             "• /info   — Get detailed info about a video\n"
@@ -1,7 +1,5 @@
-import asyncio
 import os
 import re
-import time
 
 from telethon import events
 from telethon.tl.types import DocumentAttributeAudio, DocumentAttributeVideo
@@ -9,19 +7,21 @@ from telethon.tl.types import DocumentAttributeAudio, DocumentAttributeVideo
 import config
 from helpers import (
     LOGGER, SmartButtons, send_message, edit_message, delete_messages,
-    send_file, get_messages, progress_bar, clean_download,
+    send_file, get_messages, ProgressReporter, clean_download,
 )
 from helpers.ythelpers import (
-    TEMP_DIR, MAX_FILE_SIZE, executor,
+    TEMP_DIR, MAX_FILE_SIZE,
     VIDEO_QUALITY_OPTIONS, AUDIO_QUALITY_OPTIONS,
     generate_token, youtube_parser, extract_video_id,
     fetch_thumbnail, fetch_metadata_from_url, search_youtube_metadata,
     extract_meta_fields, build_user_info, find_downloaded_file,
-    _get_available_formats, _run_ydl,
+    fetch_available_formats, download_with_ydl,
     get_video_ydl_opts, get_audio_ydl_opts,
     resolve_video_qualities, resolve_audio_qualities,
     format_views, format_dur, clean_temp_files,
 )
+from helpers.mediacache import send_cached_media, remember_sent_media
+from helpers.scheduler import scheduler, job_priority
 
 prefixes = ''.join(re.escape(p) for p in config.COMMAND_PREFIXES)
 info_pattern = re.compile(rf'^[{prefixes}]info(?:\s+.+)?$', re.IGNORECASE)
@@ -168,8 +168,7 @@ async def info_filetype_cb(event):
 
     elif action == "video":
         await event.answer("📡 Fetching Available Qualities...", alert=False)
-        loop = asyncio.get_running_loop()
-        fmt_data = await loop.run_in_executor(executor, _get_available_formats, data['url'])
+        fmt_data = await fetch_available_formats(data['url'])
         video_qualities = resolve_video_qualities(fmt_data['video_heights'])
         try:
             await event.edit(
@@ -217,13 +216,25 @@ async def info_video_quality_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
-    await event.answer("⬇️ Download Has Started", alert=True)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], f"{quality_key} Video",
+        lambda: do_info_video_download(token, quality_key),
+        priority=job_priority('video', VIDEO_QUALITY_OPTIONS[quality_key]["height"]),
+        cancel_data=f"IFX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit(f"**⬇️ Starting {quality_key} Download...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_info_video_download(token, quality_key))
+    await event.answer("⬇️ Download Has Started", alert=True)
 
 
 async def info_audio_quality_cb(event):
@@ -252,13 +263,25 @@ async def info_audio_quality_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
-    await event.answer("⬇️ Download Has Started", alert=True)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], f"{quality_key} Audio",
+        lambda: do_info_audio_download(token, quality_key),
+        priority=job_priority('audio'),
+        cancel_data=f"IFX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit(f"**🎵 Starting {quality_key} Download...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_info_audio_download(token, quality_key))
+    await event.answer("⬇️ Download Has Started", alert=True)
 
 
 async def info_cancel_cb(event):
@@ -274,10 +297,15 @@ async def info_cancel_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
+    scheduler.cancel(token)
+
     if data:
         thumb_path = data.get('thumb_path')
         if thumb_path:
             clean_download(thumb_path)
+        temp_id = data.get('temp_id')
+        if temp_id:
+            clean_temp_files(TEMP_DIR / temp_id)
         clean_temp_files(TEMP_DIR / token)
 
     pending_info.pop(token, None)
@@ -305,9 +333,29 @@ async def do_info_video_download(token: str, quality_key: str):
     title, channel, duration, view_count, safe_title = extract_meta_fields(meta)
     height = VIDEO_QUALITY_OPTIONS[quality_key]["height"]
 
+    caption = (
+        f"🎵 **Title:** `{title}`\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+        f"**🔗 Url:** [Watch On YouTube]({url})\n"
+        f"⏱️ **Duration:** {format_dur(duration)}\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"**Downloaded By** {user_info}"
+    )
+
+    video_id = extract_video_id(url)
+    cached = await send_cached_media(chat_id, video_id, 'video', quality_key, caption)
+    if cached:
+        await delete_messages(chat_id, msg_id)
+        if thumb_path:
+            clean_download(thumb_path)
+        pending_info.pop(token, None)
+        return
+
     temp_id = generate_token()
     temp_dir = TEMP_DIR / temp_id
     temp_dir.mkdir(exist_ok=True)
+    data['temp_id'] = temp_id
     output_base = str(temp_dir / "media")
 
     status_msg = await get_messages(chat_id, msg_id)
@@ -320,11 +368,10 @@ async def do_info_video_download(token: str, quality_key: str):
         f"**Please wait...**"
     )
 
-    loop = asyncio.get_running_loop()
     opts = get_video_ydl_opts(output_base, quality_key)
 
     try:
-        await loop.run_in_executor(executor, _run_ydl, opts, url)
+        await download_with_ydl(opts, url)
     except Exception as e:
         LOGGER.error(f"Info video download failed: {e}")
         await edit_message(chat_id, msg_id, "**❌ Download Failed. Please try again.**")
@@ -346,45 +393,32 @@ async def do_info_video_download(token: str, quality_key: str):
         pending_info.pop(token, None)
         return
 
-    caption = (
-        f"🎵 **Title:** `{title}`\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-        f"**🔗 Url:** [Watch On YouTube]({url})\n"
-        f"⏱️ **Duration:** {format_dur(duration)}\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"**Downloaded By** {user_info}"
-    )
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
             thumb_data = tf.read()
 
-    start_time = time.time()
-    last_update_time = [0]
-
-    sent = await send_file(
-        chat_id,
-        file=file_path,
-        caption=caption,
-        parse_mode='markdown',
-        thumb=thumb_data,
-        attributes=[
-            DocumentAttributeVideo(
-                duration=duration,
-                w=1280,
-                h=height,
-                supports_streaming=True,
-            )
-        ],
-        progress_callback=lambda c, t: asyncio.ensure_future(
-            progress_bar(c, t, status_msg, start_time, last_update_time)
-        ),
-    )
+    with ProgressReporter(status_msg) as reporter:
+        sent = await send_file(
+            chat_id,
+            file=file_path,
+            caption=caption,
+            parse_mode='markdown',
+            thumb=thumb_data,
+            attributes=[
+                DocumentAttributeVideo(
+                    duration=duration,
+                    w=1280,
+                    h=height,
+                    supports_streaming=True,
+                )
+            ],
+            progress_callback=reporter.update,
+        )
 
     if sent:
         await delete_messages(chat_id, msg_id)
+        await remember_sent_media(video_id, 'video', quality_key, sent)
     else:
         await edit_message(chat_id, msg_id, "**❌ Upload Failed. Please try again.**")
 
@@ -409,9 +443,29 @@ async def do_info_audio_download(token: str, quality_key: str):
 
     title, channel, duration, view_count, safe_title = extract_meta_fields(meta)
 
+    caption = (
+        f"🎵 **Title:** `{title}`\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+        f"**🔗 Url:** [Listen On YouTube]({url})\n"
+        f"⏱️ **Duration:** {format_dur(duration)}\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"**Downloaded By** {user_info}"
+    )
+
+    video_id = extract_video_id(url)
+    cached = await send_cached_media(chat_id, video_id, 'audio', quality_key, caption)
+    if cached:
+        await delete_messages(chat_id, msg_id)
+        if thumb_path:
+            clean_download(thumb_path)
+        pending_info.pop(token, None)
+        return
+
     temp_id = generate_token()
     temp_dir = TEMP_DIR / temp_id
     temp_dir.mkdir(exist_ok=True)
+    data['temp_id'] = temp_id
     output_base = str(temp_dir / "media")
 
     status_msg = await get_messages(chat_id, msg_id)
@@ -424,11 +478,10 @@ async def do_info_audio_download(token: str, quality_key: str):
         f"**Please wait...**"
     )
 
-    loop = asyncio.get_running_loop()
     opts = get_audio_ydl_opts(output_base, quality_key)
 
     try:
-        await loop.run_in_executor(executor, _run_ydl, opts, url)
+        await download_with_ydl(opts, url)
     except Exception as e:
         LOGGER.error(f"Info audio download failed: {e}")
         await edit_message(chat_id, msg_id, "**❌ Download Failed. Please try again.**")
@@ -450,44 +503,31 @@ async def do_info_audio_download(token: str, quality_key: str):
         pending_info.pop(token, None)
         return
 
-    caption = (
-        f"🎵 **Title:** `{title}`\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-        f"**🔗 Url:** [Listen On YouTube]({url})\n"
-        f"⏱️ **Duration:** {format_dur(duration)}\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"**Downloaded By** {user_info}"
-    )
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
             thumb_data = tf.read()
 
-    start_time = time.time()
-    last_update_time = [0]
-
-    sent = await send_file(
-        chat_id,
-        file=file_path,
-        caption=caption,
-        parse_mode='markdown',
-        thumb=thumb_data,
-        attributes=[
-            DocumentAttributeAudio(
-                duration=duration,
-                title=title,
-                performer=channel,
-            )
-        ],
-        progress_callback=lambda c, t: asyncio.ensure_future(
-            progress_bar(c, t, status_msg, start_time, last_update_time)
-        ),
-    )
+    with ProgressReporter(status_msg) as reporter:
+        sent = await send_file(
+            chat_id,
+            file=file_path,
+            caption=caption,
+            parse_mode='markdown',
+            thumb=thumb_data,
+            attributes=[
+                DocumentAttributeAudio(
+                    duration=duration,
+                    title=title,
+                    performer=channel,
+                )
+            ],
+            progress_callback=reporter.update,
+        )
 
     if sent:
         await delete_messages(chat_id, msg_id)
+        await remember_sent_media(video_id, 'audio', quality_key, sent)
     else:
         await edit_message(chat_id, msg_id, "**❌ Upload Failed. Please try again.**")
 
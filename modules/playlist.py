@@ -0,0 +1,410 @@
+import asyncio
+import os
+import re
+import time
+from contextlib import aclosing
+from urllib.parse import parse_qs, urlparse
+
+from telethon import events
+from telethon.tl.types import DocumentAttributeAudio, DocumentAttributeVideo
+
+import config
+from helpers import LOGGER, SmartButtons, send_message, edit_message, send_file, get_messages, ProgressReporter
+from helpers.ythelpers import (
+    TEMP_DIR, MAX_FILE_SIZE, MAX_DURATION, EXECUTOR_WORKERS,
+    VIDEO_QUALITY_OPTIONS, AUDIO_QUALITY_OPTIONS,
+    generate_token, fetch_thumbnail, find_downloaded_file, download_with_ydl,
+    get_video_ydl_opts, get_audio_ydl_opts, parse_duration_to_seconds,
+    build_user_info, format_dur, clean_temp_files,
+)
+from helpers.mediacache import send_cached_media, remember_sent_media
+from helpers.scheduler import scheduler, job_priority
+
+prefixes = ''.join(re.escape(p) for p in config.COMMAND_PREFIXES)
+playlist_pattern = re.compile(rf'^[{prefixes}]playlist(?:\s+.+)?$', re.IGNORECASE)
+
+PLAYLIST_FIELDS = ("id", "title", "duration", "channel.name", "isPlayable")
+DEFAULT_QUALITY = {'audio': '128kbps', 'video': '720p'}
+MEDIA_EXTS = {
+    'audio': ['.mp3', '.m4a', '.webm', '.ogg'],
+    'video': ['.mp4', '.mkv', '.webm'],
+}
+
+pending_playlists: dict = {}
+
+
+def extract_playlist_id(url: str) -> str:
+    parsed = urlparse(url if '://' in url else f"https://{url}")
+    if 'youtube.com' not in parsed.netloc and 'youtu.be' not in parsed.netloc:
+        return ''
+    return (parse_qs(parsed.query).get('list') or [''])[0]
+
+
+def parse_playlist_args(args: list):
+    kind, quality_key = 'audio', None
+    for arg in args:
+        arg = arg.lower()
+        if arg in ('audio', 'mp3'):
+            kind = 'audio'
+        elif arg in ('video', 'mp4'):
+            kind = 'video'
+        elif arg in AUDIO_QUALITY_OPTIONS:
+            kind, quality_key = 'audio', arg
+        elif arg in VIDEO_QUALITY_OPTIONS:
+            kind, quality_key = 'video', arg
+        else:
+            return None
+    if quality_key is None:
+        quality_key = DEFAULT_QUALITY[kind]
+    return kind, quality_key
+
+
+def download_worker_count() -> int:
+    pool_size = config.YDL_PROCESS_WORKERS if config.YDL_BACKEND == 'process' else EXECUTOR_WORKERS
+    share = max(1, pool_size // max(1, config.MAX_CONCURRENT_JOBS))
+    if config.PLAYLIST_DOWNLOAD_WORKERS:
+        return min(config.PLAYLIST_DOWNLOAD_WORKERS, share)
+    return max(1, min(os.cpu_count() or 1, share))
+
+
+def build_item_caption(data: dict, item: dict, url: str, duration: int) -> str:
+    icon = "🎵" if data['kind'] == 'audio' else "🎬"
+    link_text = "Listen On YouTube" if data['kind'] == 'audio' else "Watch On YouTube"
+    return (
+        f"{icon} **Title:** `{item.get('title') or 'Unknown'}`\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"📃 **Playlist:** `{data['title']}`\n"
+        f"**🔗 Url:** [{link_text}]({url})\n"
+        f"⏱️ **Duration:** {format_dur(duration)}\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"**Downloaded By** {data['user_info']}"
+    )
+
+
+def build_status_text(data: dict, finished: bool = False) -> str:
+    found = f"{data['found']}" if data['enumerated'] else f"{data['found']}+"
+    header = "**✅ Playlist Finished**" if finished else f"**⬇️ Downloading Playlist ({data['quality_key']} {data['kind'].title()})...**"
+    lines = [
+        header,
+        f"**Title:** `{data['title']}`",
+        "**━━━━━━━━━━━━━━━━━━━━━**",
+        f"**Found:** {found} | **Delivered:** {data['delivered'] + data['cached']}",
+        f"**From Cache:** {data['cached']} | **Failed:** {data['failed']} | **Skipped:** {data['skipped']}",
+    ]
+    if not finished:
+        lines.append(f"**In Progress:** {data['active']}")
+        lines.append(f"**Elapsed:** {format_dur(time.monotonic() - data['started_at'])}")
+    return "\n".join(lines)
+
+
+def build_cancel_markup(token: str):
+    sb = SmartButtons()
+    sb.button("❌ Cancel", callback_data=f"PX|{token}")
+    return sb.build_menu(b_cols=1)
+
+
+def _changed(data: dict):
+    progress = data.get('progress')
+    if progress:
+        progress.refresh()
+
+
+def _bump(data: dict, counter: str, amount: int = 1):
+    data[counter] += amount
+    _changed(data)
+
+
+def _discard_temp_dir(data: dict, temp_dir):
+    clean_temp_files(temp_dir)
+    try:
+        temp_dir.rmdir()
+    except OSError:
+        pass
+    data['temp_dirs'].discard(temp_dir)
+
+
+async def _enumerate_playlist(data: dict, download_queue: asyncio.Queue):
+    from py_yt import Playlist
+    stream = Playlist.stream(data['url'], fields=PLAYLIST_FIELDS)
+    index = 0
+    async with aclosing(aiter(stream)) as videos:
+        async for item in videos:
+            if stream.info and data['title'] == 'Unknown':
+                data['title'] = stream.info.get('title') or 'Unknown'
+            if not item.get('id'):
+                continue
+            if index >= config.PLAYLIST_MAX_ITEMS:
+                break
+            index += 1
+            _bump(data, 'found')
+            if item.get('isPlayable') is False:
+                _bump(data, 'skipped')
+                continue
+            await download_queue.put((index, item))
+    data['enumerated'] = True
+    _changed(data)
+
+
+async def _download_worker(data: dict, download_queue: asyncio.Queue, upload_queue: asyncio.Queue):
+    kind = data['kind']
+    quality_key = data['quality_key']
+    while True:
+        entry = await download_queue.get()
+        if entry is None:
+            return
+        index, item = entry
+        video_id = item['id']
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        duration = parse_duration_to_seconds(item.get('duration') or '0')
+        caption = build_item_caption(data, item, url, duration)
+
+        _bump(data, 'active')
+        if await send_cached_media(data['chat_id'], video_id, kind, quality_key, caption):
+            _bump(data, 'active', -1)
+            _bump(data, 'cached')
+            continue
+
+        if duration > MAX_DURATION:
+            _bump(data, 'active', -1)
+            _bump(data, 'skipped')
+            continue
+
+        temp_dir = TEMP_DIR / f"{data['token']}_{index}"
+        temp_dir.mkdir(exist_ok=True)
+        data['temp_dirs'].add(temp_dir)
+        output_base = str(temp_dir / "media")
+        if kind == 'audio':
+            opts = get_audio_ydl_opts(output_base, quality_key)
+        else:
+            opts = get_video_ydl_opts(output_base, quality_key)
+
+        thumb_path, downloaded = await asyncio.gather(
+            fetch_thumbnail(video_id, str(temp_dir / "thumb.jpg")),
+            download_with_ydl(opts, url),
+            return_exceptions=True,
+        )
+        if isinstance(thumb_path, BaseException):
+            LOGGER.warning(f"Playlist item thumbnail failed: {video_id} | {thumb_path}")
+            thumb_path = None
+        if isinstance(downloaded, BaseException):
+            LOGGER.error(f"Playlist item download failed: {video_id} | {downloaded}")
+            file_path = None
+        else:
+            file_path = find_downloaded_file(temp_dir, MEDIA_EXTS[kind])
+
+        if not file_path or os.path.getsize(file_path) > MAX_FILE_SIZE:
+            _discard_temp_dir(data, temp_dir)
+            _bump(data, 'active', -1)
+            _bump(data, 'failed' if not file_path else 'skipped')
+            continue
+
+        await upload_queue.put((item, temp_dir, file_path, thumb_path, caption, duration))
+
+
+async def _upload_worker(data: dict, upload_queue: asyncio.Queue):
+    kind = data['kind']
+    quality_key = data['quality_key']
+    while True:
+        entry = await upload_queue.get()
+        if entry is None:
+            return
+        item, temp_dir, file_path, thumb_path, caption, duration = entry
+        title = item.get('title') or 'Unknown'
+
+        thumb_data = None
+        if thumb_path and os.path.exists(thumb_path):
+            with open(thumb_path, 'rb') as tf:
+                thumb_data = tf.read()
+
+        if kind == 'audio':
+            channel = (item.get('channel') or {}).get('name') or 'Unknown'
+            attributes = [DocumentAttributeAudio(duration=duration, title=title, performer=channel)]
+        else:
+            attributes = [
+                DocumentAttributeVideo(
+                    duration=duration,
+                    w=1280,
+                    h=VIDEO_QUALITY_OPTIONS[quality_key]["height"],
+                    supports_streaming=True,
+                )
+            ]
+
+        try:
+            sent = await send_file(
+                data['chat_id'],
+                file=file_path,
+                caption=caption,
+                parse_mode='markdown',
+                thumb=thumb_data,
+                attributes=attributes,
+            )
+        except Exception as e:
+            LOGGER.error(f"Playlist item upload failed: {item['id']} | {e}")
+            sent = None
+        finally:
+            _discard_temp_dir(data, temp_dir)
+            _bump(data, 'active', -1)
+
+        if sent:
+            await remember_sent_media(item['id'], kind, quality_key, sent)
+            _bump(data, 'delivered')
+            LOGGER.info(f"Delivered playlist {quality_key} {kind}: {title} → {data['chat_id']}")
+        else:
+            _bump(data, 'failed')
+
+
+async def do_playlist_download(token: str):
+    data = pending_playlists.get(token)
+    if not data:
+        return
+
+    download_workers = download_worker_count()
+    upload_workers = max(1, config.PLAYLIST_UPLOAD_WORKERS)
+    download_queue = asyncio.Queue(maxsize=download_workers)
+    upload_queue = asyncio.Queue(maxsize=upload_workers)
+    data['started_at'] = time.monotonic()
+
+    status_msg = await get_messages(data['chat_id'], data['msg_id'])
+    progress = ProgressReporter(status_msg, render=lambda: build_status_text(data), buttons=build_cancel_markup(token))
+    data['progress'] = progress
+    progress.refresh()
+    downloaders = [
+        asyncio.create_task(_download_worker(data, download_queue, upload_queue))
+        for _ in range(download_workers)
+    ]
+    uploaders = [
+        asyncio.create_task(_upload_worker(data, upload_queue))
+        for _ in range(upload_workers)
+    ]
+    tasks = [*downloaders, *uploaders]
+
+    try:
+        try:
+            await _enumerate_playlist(data, download_queue)
+        except Exception as e:
+            LOGGER.error(f"Playlist enumeration failed: {data['url']} | {e}")
+            data['enumerated'] = True
+        for _ in downloaders:
+            await download_queue.put(None)
+        await asyncio.gather(*downloaders)
+        for _ in uploaders:
+            await upload_queue.put(None)
+        await asyncio.gather(*uploaders)
+    finally:
+        progress.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for temp_dir in list(data['temp_dirs']):
+            _discard_temp_dir(data, temp_dir)
+        pending_playlists.pop(token, None)
+
+    if not data['found']:
+        await edit_message(data['chat_id'], data['msg_id'], "**❌ Could not fetch playlist videos. Try again.**")
+        return
+
+    await edit_message(data['chat_id'], data['msg_id'], build_status_text(data, finished=True))
+    LOGGER.info(
+        f"Playlist finished: {data['title']} | Delivered: {data['delivered']} | "
+        f"Cached: {data['cached']} | Failed: {data['failed']} | Skipped: {data['skipped']}"
+    )
+
+
+async def playlist_command(event):
+    text = event.message.text.strip()
+    args = re.sub(rf'^[{prefixes}]playlist\s*', '', text, flags=re.IGNORECASE).split()
+
+    usage = (
+        "**❌ Please provide a YouTube playlist link.**\n"
+        "**Usage:** `/playlist <link> [audio|video] [quality]`\n"
+        "**Example:** `/playlist <link> video 720p`"
+    )
+
+    if not args or not extract_playlist_id(args[0]):
+        await send_message(event.chat_id, usage)
+        return
+
+    parsed = parse_playlist_args(args[1:])
+    if not parsed:
+        await send_message(event.chat_id, usage)
+        return
+    kind, quality_key = parsed
+
+    sender = await event.get_sender()
+    LOGGER.info(f"Playlist | User: {sender.id} | Url: {args[0]} | {quality_key} {kind}")
+
+    if not scheduler.can_accept(sender.id):
+        await send_message(event.chat_id, "**⏳ You already have too many downloads queued.**")
+        return
+
+    status = await send_message(event.chat_id, "**📃 Fetching Playlist...**")
+    if not status:
+        return
+
+    token = generate_token(sender.id)
+    pending_playlists[token] = {
+        'token': token,
+        'url': args[0],
+        'kind': kind,
+        'quality_key': quality_key,
+        'title': 'Unknown',
+        'user_id': sender.id,
+        'user_info': build_user_info(event),
+        'chat_id': event.chat_id,
+        'msg_id': status.id,
+        'found': 0,
+        'delivered': 0,
+        'cached': 0,
+        'failed': 0,
+        'skipped': 0,
+        'active': 0,
+        'enumerated': False,
+        'started_at': time.monotonic(),
+        'temp_dirs': set(),
+    }
+
+    height = VIDEO_QUALITY_OPTIONS[quality_key]["height"] if kind == 'video' else None
+    job = scheduler.submit(
+        token, sender.id, event.chat_id, status.id, f"{quality_key} {kind.title()} Playlist",
+        lambda: do_playlist_download(token),
+        priority=job_priority(kind, height),
+        cancel_data=f"PX|{token}",
+    )
+    if not job:
+        pending_playlists.pop(token, None)
+        await edit_message(event.chat_id, status.id, "**⏳ You already have too many downloads queued.**")
+
+
+async def playlist_cancel_cb(event):
+    raw = event.data.decode()
+    parts = raw.split('|')
+    if len(parts) != 2:
+        return
+
+    token = parts[1]
+    data = pending_playlists.get(token)
+
+    if data and data['user_id'] != event.sender_id:
+        await event.answer("❌ This is not your session.", alert=True)
+        return
+
+    job = scheduler.get(token)
+    running = job is not None and job.running
+    scheduler.cancel(token)
+    if not running:
+        pending_playlists.pop(token, None)
+
+    try:
+        if data and data['found']:
+            await event.edit(f"{build_status_text(data, finished=True)}\n**Cancelled ❌**", buttons=None)
+        else:
+            await event.edit("**Cancelled ❌ playlist download...**", buttons=None)
+    except Exception:
+        pass
+
+    await event.answer("✅ Cancelled", alert=False)
+
+
+def register_handlers(client):
+    client.on(events.NewMessage(pattern=playlist_pattern))(playlist_command)
+    client.on(events.CallbackQuery(pattern=rb'^PX\|'))(playlist_cancel_cb)
@@ -6,13 +6,17 @@ from telethon import events
 
 import config
 from helpers import LOGGER, send_message, edit_message, SmartButtons
-from helpers.ythelpers import generate_token, executor, get_cookies_opt
+from helpers.hedge import hedged
+from helpers.ythelpers import generate_token, get_cookies_opt, run_ydl_task
 
 prefixes = ''.join(re.escape(p) for p in config.COMMAND_PREFIXES)
 search_pattern = re.compile(rf'^[{prefixes}]search(?:\s+.+)?$', re.IGNORECASE)
 
 RESULTS_PER_PAGE = 5
 MAX_RESULTS = 50
+PAGE_FETCH_SIZE = 20
+SEARCH_FIELDS = ("id", "title", "channel.name", "link")
+SEARCH_ENDPOINT = "/youtubei/v1/search"
 
 pending_searches: dict = {}
 
@@ -22,7 +26,7 @@ def _format_ydl_entry(entry: dict) -> dict:
     webpage_url = entry.get('webpage_url') or entry.get('url') or ''
     if video_id and not webpage_url.startswith('http'):
         webpage_url = f"https://www.youtube.com/watch?v={video_id}"
-    thumbnails = entry.get('thumbnails') or []
+    thumbnails = (entry.get('thumbnails') or [])[-1:]
     channel = entry.get('uploader') or entry.get('channel') or entry.get('channel_id') or 'Unknown'
     duration = entry.get('duration')
     duration_text = str(duration) if duration else ''
@@ -54,28 +58,71 @@ def _search_with_ytdlp(query: str) -> list:
 
 async def fetch_all_results(query: str) -> list:
     try:
-        from py_yt import VideosSearch
-        src = VideosSearch(query, limit=MAX_RESULTS, language="en", region="US")
-        data = await src.next()
-        if data and data.get('result'):
-            return [r for r in data['result'] if r.get('type') == 'video']
-    except Exception as e:
-        LOGGER.error(f"py_yt search failed, using yt-dlp fallback: {e}")
-    try:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(executor, _search_with_ytdlp, query)
+        return await run_ydl_task(_search_with_ytdlp, query)
     except Exception as e:
         LOGGER.error(f"yt-dlp search fallback error: {e}")
         return []
 
 
-def get_page(all_results: list, page: int) -> tuple:
+def open_result_stream(query: str):
+    from py_yt import VideosSearch
+    src = VideosSearch(query, limit=PAGE_FETCH_SIZE, language="en", region="US", fields=SEARCH_FIELDS)
+    return src.stream(maxResults=MAX_RESULTS)
+
+
+async def fill_results(data: dict, count: int):
+    async with data['lock']:
+        stream = data['stream']
+        while stream is not None and len(data['results']) < count:
+            try:
+                result = await anext(stream)
+            except StopAsyncIteration:
+                stream = None
+            except Exception as e:
+                LOGGER.error(f"py_yt search page fetch failed: {e}")
+                await stream.aclose()
+                stream = None
+            else:
+                if result.get('type') == 'video':
+                    data['results'].append(result)
+        data['stream'] = stream
+
+
+async def close_result_stream(data: dict):
+    async with data['lock']:
+        if data['stream'] is not None:
+            await data['stream'].aclose()
+            data['stream'] = None
+
+
+async def start_search(query: str) -> dict:
+    from py_yt import isCircuitOpen
+    if isCircuitOpen(SEARCH_ENDPOINT):
+        LOGGER.warning(f"py_yt search circuit open, using yt-dlp for: {query}")
+        return {'results': await fetch_all_results(query), 'stream': None, 'lock': asyncio.Lock()}
+    data = {'results': [], 'stream': open_result_stream(query), 'lock': asyncio.Lock()}
+
+    async def first_page():
+        await fill_results(data, RESULTS_PER_PAGE + 1)
+        return data['results']
+
+    results, backend = await hedged('search', first_page, lambda: fetch_all_results(query))
+    if backend != 'py_yt':
+        await close_result_stream(data)
+        data['results'] = results or []
+    return data
+
+
+def get_page(data: dict, page: int) -> tuple:
+    all_results = data['results']
     start = (page - 1) * RESULTS_PER_PAGE
     end = start + RESULTS_PER_PAGE
     page_results = all_results[start:end]
     has_prev = page > 1
     has_next = end < len(all_results)
     total_pages = (len(all_results) + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
+    if data['stream'] is not None:
+        total_pages = f"{total_pages}+"
     return page_results, has_prev, has_next, total_pages
 
 
@@ -138,21 +185,21 @@ async def search_command(event):
     if not status:
         return
 
-    all_results = await fetch_all_results(query)
+    data = await start_search(query)
 
-    if not all_results:
+    if not data['results']:
         await edit_message(event.chat_id, status.id, "**Sorry Failed To Search**")
         return
 
     token = generate_token(sender.id)
-    pending_searches[token] = {
+    data.update({
         'query': query,
-        'results': all_results,
         'user_id': sender.id,
         'chat_id': event.chat_id,
-    }
+    })
+    pending_searches[token] = data
 
-    page_results, has_prev, has_next, total_pages = get_page(all_results, 1)
+    page_results, has_prev, has_next, total_pages = get_page(data, 1)
     result_text = build_result_text(page_results, 1, total_pages)
     markup = build_nav_markup(token, 1, has_prev, has_next)
 
@@ -184,8 +231,8 @@ async def search_nav_cb(event):
         await event.answer("❌ This is not your search session.", alert=True)
         return
 
-    all_results = data['results']
-    page_results, has_prev, has_next, total_pages = get_page(all_results, page)
+    await fill_results(data, page * RESULTS_PER_PAGE + 1)
+    page_results, has_prev, has_next, total_pages = get_page(data, page)
 
     if not page_results:
         await event.answer("❌ No results on this page.", alert=True)
@@ -216,7 +263,9 @@ async def search_close_cb(event):
         await event.answer("❌ This is not your search session.", alert=True)
         return
 
-    pending_searches.pop(token, None)
+    data = pending_searches.pop(token, None)
+    if data:
+        await close_result_stream(data)
 
     try:
         await event.delete()
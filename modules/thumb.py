@@ -1,19 +1,18 @@
 import asyncio
-import io
 import os
 import re
 
-import aiohttp
-from PIL import Image
 from telethon import events
 
 import config
 from helpers import LOGGER, SmartButtons, send_message, edit_message, delete_messages, clean_download
 from helpers.ythelpers import (
-    TEMP_DIR, HEADERS, executor,
+    TEMP_DIR, HEADERS,
     generate_token, youtube_parser, extract_video_id,
     clean_temp_files,
 )
+from helpers.thumbcache import thumb_cache, fetch_best_raw_thumb, run_io
+from helpers.thumbencode import thumb_executor, encode_resized
 
 prefixes = ''.join(re.escape(p) for p in config.COMMAND_PREFIXES)
 thumb_pattern = re.compile(rf'^[{prefixes}]thumb(?:\s+.+)?$', re.IGNORECASE)
@@ -23,27 +22,19 @@ pending_thumb: dict = {}
 THUMB_RESOLUTIONS = {
     "high": {
         "label": "💫 High Quality",
-        "urls": [
-            "https://i.ytimg.com/vi/{vid}/maxresdefault.jpg",
-            "https://i.ytimg.com/vi/{vid}/sddefault.jpg",
-        ],
+        "variants": ["maxresdefault", "sddefault"],
         "size": (1280, 720),
         "jpeg_quality": 95,
     },
     "medium": {
         "label": "🗯️ Medium",
-        "urls": [
-            "https://i.ytimg.com/vi/{vid}/hqdefault.jpg",
-        ],
+        "variants": ["hqdefault"],
         "size": (480, 360),
         "jpeg_quality": 85,
     },
     "small": {
         "label": "🌸 Small",
-        "urls": [
-            "https://i.ytimg.com/vi/{vid}/mqdefault.jpg",
-            "https://i.ytimg.com/vi/{vid}/default.jpg",
-        ],
+        "variants": ["mqdefault", "default"],
         "size": (320, 180),
         "jpeg_quality": 75,
     },
@@ -59,45 +50,26 @@ def build_thumb_resolution_markup(token: str):
     return sb.build_menu(b_cols=2, f_cols=1)
 
 
-def _process_thumb(raw_bytes: bytes, out_path: str, size: tuple, jpeg_quality: int):
-    try:
-        img = Image.open(io.BytesIO(raw_bytes)).convert('RGB')
-        img = img.resize(size, Image.LANCZOS)
-        img.save(out_path, 'JPEG', quality=jpeg_quality, optimize=True)
-        return out_path
-    except Exception as e:
-        LOGGER.error(f"Thumb process error: {e}")
-        return None
-
-
 async def fetch_thumb_by_resolution(video_id: str, out_path: str, res_key: str):
     res = THUMB_RESOLUTIONS[res_key]
-    urls = [u.format(vid=video_id) for u in res["urls"]]
     size = res["size"]
     jpeg_quality = res["jpeg_quality"]
 
-    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
-    timeout = aiohttp.ClientTimeout(total=30, connect=10)
+    cached = await run_io(thumb_cache.copy_to, video_id, res_key, out_path)
+    if cached:
+        LOGGER.info(f"Thumb [{res_key}] cache hit: {video_id}")
+        return cached
 
-    try:
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
-            for url in urls:
-                try:
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            raw = await resp.read()
-                            loop = asyncio.get_running_loop()
-                            result = await loop.run_in_executor(
-                                executor,
-                                lambda r=raw, p=out_path, s=size, q=jpeg_quality: _process_thumb(r, p, s, q)
-                            )
-                            if result and os.path.exists(result):
-                                LOGGER.info(f"Thumb [{res_key}] saved: {result} ({os.path.getsize(result)} bytes)")
-                                return result
-                except Exception as e:
-                    LOGGER.error(f"Thumb [{res_key}] fetch error from {url}: {e}")
-    except Exception as e:
-        LOGGER.error(f"Thumb session error: {e}")
+    found = await fetch_best_raw_thumb(video_id, res["variants"], HEADERS)
+    if not found:
+        return None
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(thumb_executor, encode_resized, found[1], out_path, size, jpeg_quality)
+    if result and os.path.exists(result):
+        await run_io(thumb_cache.put_file, video_id, res_key, result)
+        LOGGER.info(f"Thumb [{res_key}] saved from {found[0]}: {result} ({os.path.getsize(result)} bytes)")
+        return result
 
     return None
 
@@ -1,27 +1,28 @@
-import asyncio
 import os
 import re
-import time
+from contextlib import aclosing
 
 from telethon import events
 from telethon.tl.types import DocumentAttributeAudio, DocumentAttributeVideo
 
 import config
-from helpers import LOGGER, send_message, edit_message, delete_messages, send_file, get_messages, progress_bar, clean_download
+from helpers import LOGGER, send_message, edit_message, delete_messages, send_file, get_messages, ProgressReporter, clean_download
 from helpers.ythelpers import (
-    TEMP_DIR, MAX_FILE_SIZE, MAX_DURATION, executor,
+    TEMP_DIR, MAX_FILE_SIZE, MAX_DURATION,
     VIDEO_QUALITY_OPTIONS, AUDIO_QUALITY_OPTIONS,
     generate_token, youtube_parser, extract_video_id,
     fetch_thumbnail, fetch_metadata_from_url, search_youtube_metadata, search_youtube_url,
     extract_meta_fields, build_user_info, find_downloaded_file,
-    _get_available_formats, _run_ydl,
+    fetch_available_formats, download_with_ydl,
     get_video_ydl_opts, get_audio_ydl_opts,
     resolve_video_qualities, resolve_audio_qualities,
     build_video_quality_markup, build_audio_quality_markup,
     format_views, format_dur, clean_temp_files,
-    split_file_ffmpeg, compute_segment_duration,
+    iter_split_parts, compute_segment_duration,
 )
 from helpers.buttons import SmartButtons
+from helpers.mediacache import send_cached_media, remember_sent_media
+from helpers.scheduler import scheduler, job_priority
 
 prefixes = ''.join(re.escape(p) for p in config.COMMAND_PREFIXES)
 yt_video_pattern = re.compile(rf'^[{prefixes}](yt|video|mp4|dl)(?:\s+.+)?$', re.IGNORECASE)
@@ -74,19 +75,6 @@ async def do_split_upload_video(token: str):
     ext = os.path.splitext(file_path)[1] or '.mp4'
     split_dir = str(TEMP_DIR / temp_id / "splits")
 
-    loop = asyncio.get_running_loop()
-    try:
-        parts = await loop.run_in_executor(executor, split_file_ffmpeg, file_path, split_dir, segment_dur, ext)
-    except Exception as e:
-        LOGGER.error(f"FFmpeg split failed: {e}")
-        await edit_message(chat_id, msg_id, "**❌ Split Failed. Please try again.**")
-        clean_temp_files(TEMP_DIR / temp_id)
-        pending_downloads.pop(token, None)
-        return
-
-    total_parts = len(parts)
-    LOGGER.info(f"Splitting video into {total_parts} parts for {title}")
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
@@ -94,54 +82,62 @@ async def do_split_upload_video(token: str):
 
     status_msg = await get_messages(chat_id, msg_id)
 
-    for i, part_path in enumerate(parts, 1):
-        start_time = time.time()
-        last_update_time = [0]
-
-        await edit_message(
-            chat_id, msg_id,
-            f"**📤 Uploading Part {i}/{total_parts}...**\n"
-            f"**Title:** `{title}`\n"
-            f"**━━━━━━━━━━━━━━━━━━━━━**\n"
-            f"**Please wait...**"
-        )
-
-        part_caption = (
-            f"🎬 **Title:** `{title}` — Part {i}/{total_parts}\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n"
-            f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-            f"**🔗 Url:** [Watch On YouTube]({url})\n"
-            f"⏱️ **Part Duration:** {format_dur(segment_dur)} | **Total:** {format_dur(duration)}\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n"
-            f"**Downloaded By** {user_info}"
-        )
+    total_parts = 0
+    try:
+        async with aclosing(iter_split_parts(file_path, split_dir, segment_dur, duration, ext)) as parts:
+            async for i, total_parts, part_path, part_dur in parts:
+                if i == 1:
+                    LOGGER.info(f"Splitting video into {total_parts} parts for {title}")
+
+                await edit_message(
+                    chat_id, msg_id,
+                    f"**📤 Uploading Part {i}/{total_parts}...**\n"
+                    f"**Title:** `{title}`\n"
+                    f"**━━━━━━━━━━━━━━━━━━━━━**\n"
+                    f"**Please wait...**"
+                )
 
-        sent = await send_file(
-            chat_id,
-            file=part_path,
-            caption=part_caption,
-            parse_mode='markdown',
-            thumb=thumb_data,
-            attributes=[
-                DocumentAttributeVideo(
-                    duration=segment_dur,
-                    w=1280,
-                    h=height,
-                    supports_streaming=True,
+                part_caption = (
+                    f"🎬 **Title:** `{title}` — Part {i}/{total_parts}\n"
+                    f"━━━━━━━━━━━━━━━━━━━━━\n"
+                    f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+                    f"**🔗 Url:** [Watch On YouTube]({url})\n"
+                    f"⏱️ **Part Duration:** {format_dur(part_dur)} | **Total:** {format_dur(duration)}\n"
+                    f"━━━━━━━━━━━━━━━━━━━━━\n"
+                    f"**Downloaded By** {user_info}"
                 )
-            ],
-            progress_callback=lambda c, t: asyncio.ensure_future(
-                progress_bar(c, t, status_msg, start_time, last_update_time)
-            ),
-        )
 
-        if not sent:
-            await edit_message(chat_id, msg_id, f"**❌ Upload Failed on Part {i}. Please try again.**")
-            clean_temp_files(TEMP_DIR / temp_id)
-            if thumb_path:
-                clean_download(thumb_path)
-            pending_downloads.pop(token, None)
-            return
+                with ProgressReporter(status_msg) as reporter:
+                    sent = await send_file(
+                        chat_id,
+                        file=part_path,
+                        caption=part_caption,
+                        parse_mode='markdown',
+                        thumb=thumb_data,
+                        attributes=[
+                            DocumentAttributeVideo(
+                                duration=part_dur,
+                                w=1280,
+                                h=height,
+                                supports_streaming=True,
+                            )
+                        ],
+                        progress_callback=reporter.update,
+                    )
+
+                if not sent:
+                    await edit_message(chat_id, msg_id, f"**❌ Upload Failed on Part {i}. Please try again.**")
+                    clean_temp_files(TEMP_DIR / temp_id)
+                    if thumb_path:
+                        clean_download(thumb_path)
+                    pending_downloads.pop(token, None)
+                    return
+    except Exception as e:
+        LOGGER.error(f"FFmpeg split failed: {e}")
+        await edit_message(chat_id, msg_id, "**❌ Split Failed. Please try again.**")
+        clean_temp_files(TEMP_DIR / temp_id)
+        pending_downloads.pop(token, None)
+        return
 
     await delete_messages(chat_id, msg_id)
     LOGGER.info(f"Delivered split video ({total_parts} parts): {title} → {chat_id}")
@@ -181,19 +177,6 @@ async def do_split_upload_audio(token: str):
     ext = os.path.splitext(file_path)[1] or '.mp3'
     split_dir = str(TEMP_DIR / temp_id / "splits")
 
-    loop = asyncio.get_running_loop()
-    try:
-        parts = await loop.run_in_executor(executor, split_file_ffmpeg, file_path, split_dir, segment_dur, ext)
-    except Exception as e:
-        LOGGER.error(f"FFmpeg audio split failed: {e}")
-        await edit_message(chat_id, msg_id, "**❌ Split Failed. Please try again.**")
-        clean_temp_files(TEMP_DIR / temp_id)
-        pending_downloads.pop(token, None)
-        return
-
-    total_parts = len(parts)
-    LOGGER.info(f"Splitting audio into {total_parts} parts for {title}")
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
@@ -201,53 +184,61 @@ async def do_split_upload_audio(token: str):
 
     status_msg = await get_messages(chat_id, msg_id)
 
-    for i, part_path in enumerate(parts, 1):
-        start_time = time.time()
-        last_update_time = [0]
-
-        await edit_message(
-            chat_id, msg_id,
-            f"**📤 Uploading Part {i}/{total_parts}...**\n"
-            f"**Title:** `{title}`\n"
-            f"**━━━━━━━━━━━━━━━━━━━━━**\n"
-            f"**Please wait...**"
-        )
-
-        part_caption = (
-            f"🎵 **Title:** `{title}` — Part {i}/{total_parts}\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n"
-            f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-            f"**🔗 Url:** [Listen On YouTube]({url})\n"
-            f"⏱️ **Part Duration:** {format_dur(segment_dur)} | **Total:** {format_dur(duration)}\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n"
-            f"**Downloaded By** {user_info}"
-        )
+    total_parts = 0
+    try:
+        async with aclosing(iter_split_parts(file_path, split_dir, segment_dur, duration, ext)) as parts:
+            async for i, total_parts, part_path, part_dur in parts:
+                if i == 1:
+                    LOGGER.info(f"Splitting audio into {total_parts} parts for {title}")
+
+                await edit_message(
+                    chat_id, msg_id,
+                    f"**📤 Uploading Part {i}/{total_parts}...**\n"
+                    f"**Title:** `{title}`\n"
+                    f"**━━━━━━━━━━━━━━━━━━━━━**\n"
+                    f"**Please wait...**"
+                )
 
-        sent = await send_file(
-            chat_id,
-            file=part_path,
-            caption=part_caption,
-            parse_mode='markdown',
-            thumb=thumb_data,
-            attributes=[
-                DocumentAttributeAudio(
-                    duration=segment_dur,
-                    title=f"{title} (Part {i}/{total_parts})",
-                    performer=channel,
+                part_caption = (
+                    f"🎵 **Title:** `{title}` — Part {i}/{total_parts}\n"
+                    f"━━━━━━━━━━━━━━━━━━━━━\n"
+                    f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+                    f"**🔗 Url:** [Listen On YouTube]({url})\n"
+                    f"⏱️ **Part Duration:** {format_dur(part_dur)} | **Total:** {format_dur(duration)}\n"
+                    f"━━━━━━━━━━━━━━━━━━━━━\n"
+                    f"**Downloaded By** {user_info}"
                 )
-            ],
-            progress_callback=lambda c, t: asyncio.ensure_future(
-                progress_bar(c, t, status_msg, start_time, last_update_time)
-            ),
-        )
 
-        if not sent:
-            await edit_message(chat_id, msg_id, f"**❌ Upload Failed on Part {i}. Please try again.**")
-            clean_temp_files(TEMP_DIR / temp_id)
-            if thumb_path:
-                clean_download(thumb_path)
-            pending_downloads.pop(token, None)
-            return
+                with ProgressReporter(status_msg) as reporter:
+                    sent = await send_file(
+                        chat_id,
+                        file=part_path,
+                        caption=part_caption,
+                        parse_mode='markdown',
+                        thumb=thumb_data,
+                        attributes=[
+                            DocumentAttributeAudio(
+                                duration=part_dur,
+                                title=f"{title} (Part {i}/{total_parts})",
+                                performer=channel,
+                            )
+                        ],
+                        progress_callback=reporter.update,
+                    )
+
+                if not sent:
+                    await edit_message(chat_id, msg_id, f"**❌ Upload Failed on Part {i}. Please try again.**")
+                    clean_temp_files(TEMP_DIR / temp_id)
+                    if thumb_path:
+                        clean_download(thumb_path)
+                    pending_downloads.pop(token, None)
+                    return
+    except Exception as e:
+        LOGGER.error(f"FFmpeg audio split failed: {e}")
+        await edit_message(chat_id, msg_id, "**❌ Split Failed. Please try again.**")
+        clean_temp_files(TEMP_DIR / temp_id)
+        pending_downloads.pop(token, None)
+        return
 
     await delete_messages(chat_id, msg_id)
     LOGGER.info(f"Delivered split audio ({total_parts} parts): {title} → {chat_id}")
@@ -273,9 +264,30 @@ async def do_video_download(token: str, quality_key: str):
     title, channel, duration, view_count, safe_title = extract_meta_fields(meta)
     height = VIDEO_QUALITY_OPTIONS[quality_key]["height"]
 
+    caption = (
+        f"🎵 **Title:** `{title}`\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+        f"**🔗 Url:** [Watch On YouTube]({url})\n"
+        f"⏱️ **Duration:** {format_dur(duration)}\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"**Downloaded By** {user_info}"
+    )
+
+    video_id = extract_video_id(url)
+    if not do_split:
+        cached = await send_cached_media(chat_id, video_id, 'video', quality_key, caption)
+        if cached:
+            await delete_messages(chat_id, msg_id)
+            if thumb_path:
+                clean_download(thumb_path)
+            pending_downloads.pop(token, None)
+            return
+
     temp_id = generate_token()
     temp_dir = TEMP_DIR / temp_id
     temp_dir.mkdir(exist_ok=True)
+    data['temp_id'] = temp_id
     output_base = str(temp_dir / "media")
 
     status_msg = await get_messages(chat_id, msg_id)
@@ -288,11 +300,10 @@ async def do_video_download(token: str, quality_key: str):
         f"**Please wait...**"
     )
 
-    loop = asyncio.get_running_loop()
     opts = get_video_ydl_opts(output_base, quality_key)
 
     try:
-        await loop.run_in_executor(executor, _run_ydl, opts, url)
+        await download_with_ydl(opts, url)
     except Exception as e:
         LOGGER.error(f"Video download failed: {e}")
         await edit_message(chat_id, msg_id, "**❌ Download Failed. Please try again.**")
@@ -320,7 +331,7 @@ async def do_video_download(token: str, quality_key: str):
         pending_downloads[token]['split_height'] = height
 
         if do_split:
-            asyncio.create_task(do_split_upload_video(token))
+            await do_split_upload_video(token)
             return
 
         await edit_message(
@@ -330,45 +341,32 @@ async def do_video_download(token: str, quality_key: str):
         )
         return
 
-    caption = (
-        f"🎵 **Title:** `{title}`\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-        f"**🔗 Url:** [Watch On YouTube]({url})\n"
-        f"⏱️ **Duration:** {format_dur(duration)}\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"**Downloaded By** {user_info}"
-    )
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
             thumb_data = tf.read()
 
-    start_time = time.time()
-    last_update_time = [0]
-
-    sent = await send_file(
-        chat_id,
-        file=file_path,
-        caption=caption,
-        parse_mode='markdown',
-        thumb=thumb_data,
-        attributes=[
-            DocumentAttributeVideo(
-                duration=duration,
-                w=1280,
-                h=height,
-                supports_streaming=True,
-            )
-        ],
-        progress_callback=lambda c, t: asyncio.ensure_future(
-            progress_bar(c, t, status_msg, start_time, last_update_time)
-        ),
-    )
+    with ProgressReporter(status_msg) as reporter:
+        sent = await send_file(
+            chat_id,
+            file=file_path,
+            caption=caption,
+            parse_mode='markdown',
+            thumb=thumb_data,
+            attributes=[
+                DocumentAttributeVideo(
+                    duration=duration,
+                    w=1280,
+                    h=height,
+                    supports_streaming=True,
+                )
+            ],
+            progress_callback=reporter.update,
+        )
 
     if sent:
         await delete_messages(chat_id, msg_id)
+        await remember_sent_media(video_id, 'video', quality_key, sent)
     else:
         await edit_message(chat_id, msg_id, "**❌ Upload Failed. Please try again.**")
 
@@ -394,9 +392,30 @@ async def do_audio_download(token: str, quality_key: str):
 
     title, channel, duration, view_count, safe_title = extract_meta_fields(meta)
 
+    caption = (
+        f"🎵 **Title:** `{title}`\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
+        f"**🔗 Url:** [Listen On YouTube]({url})\n"
+        f"⏱️ **Duration:** {format_dur(duration)}\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"**Downloaded By** {user_info}"
+    )
+
+    video_id = extract_video_id(url)
+    if not do_split:
+        cached = await send_cached_media(chat_id, video_id, 'audio', quality_key, caption)
+        if cached:
+            await delete_messages(chat_id, msg_id)
+            if thumb_path:
+                clean_download(thumb_path)
+            pending_downloads.pop(token, None)
+            return
+
     temp_id = generate_token()
     temp_dir = TEMP_DIR / temp_id
     temp_dir.mkdir(exist_ok=True)
+    data['temp_id'] = temp_id
     output_base = str(temp_dir / "media")
 
     status_msg = await get_messages(chat_id, msg_id)
@@ -409,11 +428,10 @@ async def do_audio_download(token: str, quality_key: str):
         f"**Please wait...**"
     )
 
-    loop = asyncio.get_running_loop()
     opts = get_audio_ydl_opts(output_base, quality_key)
 
     try:
-        await loop.run_in_executor(executor, _run_ydl, opts, url)
+        await download_with_ydl(opts, url)
     except Exception as e:
         LOGGER.error(f"Audio download failed: {e}")
         await edit_message(chat_id, msg_id, "**❌ Download Failed. Please try again.**")
@@ -440,7 +458,7 @@ async def do_audio_download(token: str, quality_key: str):
         pending_downloads[token]['split_view_count'] = view_count
 
         if do_split:
-            asyncio.create_task(do_split_upload_audio(token))
+            await do_split_upload_audio(token)
             return
 
         await edit_message(
@@ -450,44 +468,31 @@ async def do_audio_download(token: str, quality_key: str):
         )
         return
 
-    caption = (
-        f"🎵 **Title:** `{title}`\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"👁️‍🗨️ **Views:** {format_views(view_count)}\n"
-        f"**🔗 Url:** [Listen On YouTube]({url})\n"
-        f"⏱️ **Duration:** {format_dur(duration)}\n"
-        f"━━━━━━━━━━━━━━━━━━━━━\n"
-        f"**Downloaded By** {user_info}"
-    )
-
     thumb_data = None
     if thumb_path and os.path.exists(thumb_path):
         with open(thumb_path, 'rb') as tf:
             thumb_data = tf.read()
 
-    start_time = time.time()
-    last_update_time = [0]
-
-    sent = await send_file(
-        chat_id,
-        file=file_path,
-        caption=caption,
-        parse_mode='markdown',
-        thumb=thumb_data,
-        attributes=[
-            DocumentAttributeAudio(
-                duration=duration,
-                title=title,
-                performer=channel,
-            )
-        ],
-        progress_callback=lambda c, t: asyncio.ensure_future(
-            progress_bar(c, t, status_msg, start_time, last_update_time)
-        ),
-    )
+    with ProgressReporter(status_msg) as reporter:
+        sent = await send_file(
+            chat_id,
+            file=file_path,
+            caption=caption,
+            parse_mode='markdown',
+            thumb=thumb_data,
+            attributes=[
+                DocumentAttributeAudio(
+                    duration=duration,
+                    title=title,
+                    performer=channel,
+                )
+            ],
+            progress_callback=reporter.update,
+        )
 
     if sent:
         await delete_messages(chat_id, msg_id)
+        await remember_sent_media(video_id, 'audio', quality_key, sent)
     else:
         await edit_message(chat_id, msg_id, "**❌ Upload Failed. Please try again.**")
 
@@ -528,8 +533,7 @@ async def handle_yt_command(event, query: str):
     video_id = extract_video_id(video_url)
 
     await edit_message(chat_id, status.id, "**📡 Fetching Available Qualities...**")
-    loop = asyncio.get_running_loop()
-    fmt_data = await loop.run_in_executor(executor, _get_available_formats, video_url)
+    fmt_data = await fetch_available_formats(video_url)
     video_qualities = resolve_video_qualities(fmt_data['video_heights'])
 
     token = generate_token(sender.id)
@@ -639,8 +643,7 @@ async def handle_audio_command(event, query: str):
     video_id = extract_video_id(video_url)
 
     await edit_message(chat_id, status.id, "**📡 Fetching Available Audio Qualities...**")
-    loop = asyncio.get_running_loop()
-    fmt_data = await loop.run_in_executor(executor, _get_available_formats, video_url)
+    fmt_data = await fetch_available_formats(video_url)
     audio_qualities = resolve_audio_qualities(fmt_data['audio_abrs'])
 
     token = generate_token(sender.id)
@@ -790,13 +793,25 @@ async def yt_video_cb(event):
         await event.answer("❌ This is not your download session.", alert=True)
         return
 
-    await event.answer("⬇️ Download Has Started", alert=True)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], f"{quality_key} Video",
+        lambda: do_video_download(token, quality_key),
+        priority=job_priority('video', VIDEO_QUALITY_OPTIONS[quality_key]["height"]),
+        cancel_data=f"YX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit(f"**⬇️ Starting {quality_key} Download...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_video_download(token, quality_key))
+    await event.answer("⬇️ Download Has Started", alert=True)
 
 
 async def yt_audio_cb(event):
@@ -825,13 +840,25 @@ async def yt_audio_cb(event):
         await event.answer("❌ This is not your download session.", alert=True)
         return
 
-    await event.answer("⬇️ Download Has Started", alert=True)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], f"{quality_key} Audio",
+        lambda: do_audio_download(token, quality_key),
+        priority=job_priority('audio'),
+        cancel_data=f"YX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit(f"**🎵 Starting {quality_key} Download...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_audio_download(token, quality_key))
+    await event.answer("⬇️ Download Has Started", alert=True)
 
 
 async def yt_split_yes_video_cb(event):
@@ -945,13 +972,25 @@ async def yt_split_file_video_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
-    await event.answer("✅ Starting Split Upload...", alert=False)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], "Split Video",
+        lambda: do_split_upload_video(token),
+        priority=job_priority('video', data.get('split_height')),
+        cancel_data=f"YX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit("**✂️ Starting Split Upload...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_split_upload_video(token))
+    await event.answer("✅ Starting Split Upload...", alert=False)
 
 
 async def yt_split_file_audio_cb(event):
@@ -975,13 +1014,25 @@ async def yt_split_file_audio_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
-    await event.answer("✅ Starting Split Upload...", alert=False)
+    if scheduler.get(token):
+        await event.answer("⏳ This download is already in progress.", alert=True)
+        return
+
+    job = scheduler.submit(
+        token, data['user_id'], data['chat_id'], data['msg_id'], "Split Audio",
+        lambda: do_split_upload_audio(token),
+        priority=job_priority('audio'),
+        cancel_data=f"YX|{token}",
+    )
+    if not job:
+        await event.answer("⏳ You already have too many downloads queued.", alert=True)
+        return
+
     try:
         await event.edit("**✂️ Starting Split Upload...**", buttons=None)
     except Exception:
         pass
-
-    asyncio.create_task(do_split_upload_audio(token))
+    await event.answer("✅ Starting Split Upload...", alert=False)
 
 
 async def yt_cancel_cb(event):
@@ -997,6 +1048,8 @@ async def yt_cancel_cb(event):
         await event.answer("❌ This is not your session.", alert=True)
         return
 
+    scheduler.cancel(token)
+
     if data:
         thumb_path = data.get('thumb_path')
         if thumb_path:
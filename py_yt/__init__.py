@@ -2,6 +2,7 @@ from __future__ import annotations
 from .extras import (
     Video,
     Playlist,
+    PlaylistStream,
     Suggestions,
     Hashtag,
     Transcript,
@@ -18,10 +19,21 @@ from .search import (
 )
 
 from .handlers import ComponentHandler, RequestHandler
+from .core.cache import responseCache
+from .core.models import ChannelRef, VideoResult, ChannelResult, PlaylistResult
+from .core.requests import closeClients
+from .core.retry import (
+    RetryPolicy,
+    CircuitOpenError,
+    setDefaultRetryPolicy,
+    isCircuitOpen,
+    breakerStats,
+)
 
 __all__ = [
     "Video",
     "Playlist",
+    "PlaylistStream",
     "Suggestions",
     "Hashtag",
     "Transcript",
@@ -35,4 +47,15 @@ __all__ = [
     "ChannelSearch",
     "ComponentHandler",
     "RequestHandler",
+    "ChannelRef",
+    "VideoResult",
+    "ChannelResult",
+    "PlaylistResult",
+    "responseCache",
+    "closeClients",
+    "RetryPolicy",
+    "CircuitOpenError",
+    "setDefaultRetryPolicy",
+    "isCircuitOpen",
+    "breakerStats",
 ]
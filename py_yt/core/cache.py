@@ -0,0 +1,262 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+endpointTTLs: Dict[str, int] = {
+    "/youtubei/v1/search": 300,
+    "/youtubei/v1/player": 300,
+    "/youtubei/v1/browse": 600,
+    "/youtubei/v1/next": 300,
+}
+
+CachedEntry = Tuple[float, int, str, bytes]
+
+_abandoned = object()
+
+
+class ResponseCache:
+    """In-memory LRU of innertube responses, optionally backed by a bounded directory on disk.
+
+    Args:
+        maxEntries (int, optional): Responses kept in memory. Defaults to 512.
+        directory (str, optional): Directory that persists responses across restarts. Defaults to None.
+        maxDiskEntries (int, optional): Files kept in `directory`. Defaults to 4096.
+        maxDiskBytes (int, optional): Total size of the files kept in `directory`. Defaults to 64 MB.
+    """
+
+    def __init__(
+        self,
+        maxEntries: int = 512,
+        directory: Optional[str] = None,
+        maxDiskEntries: int = 4096,
+        maxDiskBytes: int = 64 * 1024 * 1024,
+    ):
+        self.maxEntries = maxEntries
+        self.directory = directory
+        self.maxDiskEntries = maxDiskEntries
+        self.maxDiskBytes = maxDiskBytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, CachedEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._diskEntries: "OrderedDict[str, int]" = OrderedDict()
+        self._diskSize = 0
+        self._diskLock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._loadDiskIndex()
+
+    @staticmethod
+    def makeKey(url: str, data: Optional[dict]) -> str:
+        """Hashes the URL and a canonical form of the request body."""
+        body = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(f"{url}\n{body}".encode("utf_8")).hexdigest()
+
+    @staticmethod
+    def ttlFor(url: str) -> int:
+        return endpointTTLs.get(urlparse(url).path, 0)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+            "diskEntries": len(self._diskEntries),
+            "diskBytes": self._diskSize,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _diskPath(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _get(self, key: str) -> Optional[CachedEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: CachedEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def _loadDiskIndex(self) -> None:
+        """Indexes the files left by a previous run, dropping those that have surely expired."""
+        oldest = time.time() - max(endpointTTLs.values(), default=0)
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".bin"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime < oldest:
+                self._removePath(path)
+                continue
+            files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._diskEntries[key] = size
+            self._diskSize += size
+        self._evictDisk()
+
+    def _evictDisk(self) -> None:
+        with self._diskLock:
+            evicted = []
+            while self._diskEntries and (
+                len(self._diskEntries) > self.maxDiskEntries or self._diskSize > self.maxDiskBytes
+            ):
+                key, size = self._diskEntries.popitem(last=False)
+                self._diskSize -= size
+                evicted.append(key)
+        for key in evicted:
+            self._removePath(self._diskPath(key))
+
+    def _forgetDisk(self, key: str) -> None:
+        with self._diskLock:
+            self._diskSize -= self._diskEntries.pop(key, 0)
+        self._removePath(self._diskPath(key))
+
+    def _readDisk(self, key: str) -> Optional[CachedEntry]:
+        with self._diskLock:
+            if key not in self._diskEntries:
+                return None
+            self._diskEntries.move_to_end(key)
+        try:
+            with open(self._diskPath(key), "rb") as f:
+                header = json.loads(f.readline())
+                content = f.read()
+        except (OSError, ValueError):
+            self._forgetDisk(key)
+            return None
+        if header["expires"] < time.time():
+            self._forgetDisk(key)
+            return None
+        return header["expires"], header["status"], header["contentType"], content
+
+    def _writeDisk(self, key: str, entry: CachedEntry) -> None:
+        expires, status, contentType, content = entry
+        header = json.dumps({"expires": expires, "status": status, "contentType": contentType})
+        data = header.encode("utf_8") + b"\n" + content
+        if len(data) > self.maxDiskBytes:
+            return
+        tmpPath = self._diskPath(key) + ".tmp"
+        try:
+            with open(tmpPath, "wb") as f:
+                f.write(data)
+            os.replace(tmpPath, self._diskPath(key))
+        except OSError:
+            logger.debug("Could not persist cached response", exc_info=True)
+            return
+        with self._diskLock:
+            self._diskSize += len(data) - self._diskEntries.pop(key, 0)
+            self._diskEntries[key] = len(data)
+        self._evictDisk()
+
+    @staticmethod
+    def _removePath(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _build(url: str, entry: CachedEntry) -> httpx.Response:
+        _, status, contentType, content = entry
+        return httpx.Response(
+            status,
+            headers={"Content-Type": contentType},
+            content=content,
+            request=httpx.Request("POST", url),
+        )
+
+    async def fetch(
+        self,
+        url: str,
+        data: Optional[dict],
+        loader: Callable[[], Awaitable[Optional[httpx.Response]]],
+    ) -> Optional[httpx.Response]:
+        """Returns a cached response for this URL and body, or loads it once for all concurrent callers."""
+        ttl = self.ttlFor(url)
+        if not self.enabled or ttl <= 0:
+            return await loader()
+        key = self.makeKey(url, data)
+        entry = self._get(key)
+        if entry:
+            self.hits += 1
+            return self._build(url, entry)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            entry = await asyncio.shield(pending)
+            if entry is _abandoned:
+                return await self.fetch(url, data, loader)
+            return self._build(url, entry) if entry else None
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            if self.directory:
+                entry = await loop.run_in_executor(None, self._readDisk, key)
+                if entry:
+                    self.hits += 1
+                    self._store(key, entry)
+                    future.set_result(entry)
+                    return self._build(url, entry)
+            self.misses += 1
+            response = await loader()
+            entry = None
+            if response is not None and response.status_code == 200:
+                entry = (
+                    time.time() + ttl,
+                    response.status_code,
+                    response.headers.get("Content-Type", "application/json"),
+                    response.content,
+                )
+                self._store(key, entry)
+                if self.directory:
+                    loop.run_in_executor(None, self._writeDisk, key, entry)
+            future.set_result(entry)
+            return response
+        except asyncio.CancelledError:
+            # Only the caller that started the load was cancelled; the waiters retry on their own.
+            future.set_result(_abandoned)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+responseCache = ResponseCache(
+    maxEntries=int(os.environ.get("PY_YT_CACHE_SIZE", 512)),
+    directory=os.environ.get("PY_YT_CACHE_DIR") or None,
+    maxDiskEntries=int(os.environ.get("PY_YT_CACHE_DISK_ENTRIES", 4096)),
+    maxDiskBytes=int(os.environ.get("PY_YT_CACHE_DISK_MB", 64)) * 1024 * 1024,
+)
+responseCache.enabled = os.environ.get("PY_YT_CACHE", "1") != "0"
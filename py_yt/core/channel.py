@@ -5,6 +5,7 @@ from urllib.parse import urlencode
 
 from py_yt.core.componenthandler import getValue
 from py_yt.core.constants import searchKey, requestPayload
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
 
 
@@ -41,7 +42,7 @@ class ChannelCore(RequestCore):
         }
 
     def parse_response(self):
-        response = self.data.json()
+        response = loads(self.data.content)
 
         thumbnails = []
         try:
@@ -204,7 +205,7 @@ class ChannelCore(RequestCore):
         }
 
     def parse_next_response(self):
-        response = self.data.json()
+        response = loads(self.data.content)
 
         self.continuation = None
 
@@ -5,6 +5,7 @@ from typing import Optional, Union
 from urllib.parse import urlencode
 
 from py_yt.core.constants import requestPayload, searchKey, ResultMode
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
 from py_yt.handlers.componenthandler import ComponentHandler
 
@@ -89,7 +90,7 @@ class ChannelSearchCore(RequestCore, ComponentHandler):
 
         request = await self.asyncPostRequest()
         try:
-            self.response = request.json()
+            self.response = loads(request.content)
         except:
             raise Exception("ERROR: Could not make request.")
 
@@ -1,23 +1,146 @@
 from __future__ import annotations
-from typing import List, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+_compiledPaths: Dict[Tuple, Callable] = {}
+
+
+def _walk(keys: Tuple) -> Callable[[Any], Any]:
+    if len(keys) == 1:
+        (k0,) = keys
+
+        def accessor(source):
+            try:
+                return source[k0]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+    elif len(keys) == 2:
+        k0, k1 = keys
+
+        def accessor(source):
+            try:
+                return source[k0][k1]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+    elif len(keys) == 3:
+        k0, k1, k2 = keys
+
+        def accessor(source):
+            try:
+                return source[k0][k1][k2]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+    else:
+
+        def accessor(source):
+            try:
+                for key in keys:
+                    source = source[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+            return source
+
+    return accessor
+
+
+def _fanOut(segments: List[Tuple]) -> Callable[[Any], Iterator]:
+    head = _walk(segments[0]) if segments[0] else None
+    if len(segments) == 1:
+
+        def accessor(source):
+            yield head(source) if head else source
+
+        return accessor
+    wildcardKey = segments[1][0]
+    rest = _fanOut([segments[1][1:]] + segments[2:])
+
+    def accessor(source):
+        value = head(source) if head else source
+        if not isinstance(value, (list, tuple)):
+            return
+        for item in value:
+            if isinstance(item, dict) and wildcardKey in item:
+                yield from rest(item[wildcardKey])
+
+    return accessor
+
+
+def compilePath(path: Iterable[Union[str, int, None]]) -> Callable:
+    """Compiles a key path once into an accessor.
+
+    Paths without ``None`` compile to a function returning the value or ``None``.
+    Each ``None`` matches every item of a list holding the key that follows it, and
+    such paths compile to a function yielding every match."""
+    key = tuple(path)
+    accessor = _compiledPaths.get(key)
+    if accessor is None:
+        if None in key:
+            segments = [[]]
+            for index, part in enumerate(key):
+                if part is None:
+                    if index + 1 == len(key) or key[index + 1] is None:
+                        raise ValueError(
+                            "Cannot search for a key twice consecutive or at the end with no key given"
+                        )
+                    segments.append([])
+                else:
+                    segments[-1].append(part)
+            accessor = _fanOut([tuple(segment) for segment in segments])
+        elif key:
+            accessor = _walk(key)
+        else:
+            accessor = lambda source: source
+        _compiledPaths[key] = accessor
+    return accessor
 
 
 def getValue(source: dict, path: List[str]) -> Union[str, int, dict, None]:
-    value = source
-    for key in path:
-        if type(key) is str:
-            if key in value.keys():
-                value = value[key]
-            else:
-                value = None
-                break
-        elif type(key) is int:
-            if len(value) != 0:
-                value = value[key]
-            else:
-                value = None
-                break
-    return value
+    return compilePath(path)(source)
+
+
+def getValues(source: dict, path: List[Union[str, int, None]]) -> Iterator:
+    """Yields every value matched by a path containing ``None`` wildcards."""
+    accessor = compilePath(path)
+    if None not in path:
+        return iter((accessor(source),))
+    return accessor(source)
+
+
+def getFirstValue(source: dict, path: List[Union[str, int, None]]) -> Any:
+    for value in getValues(source, path):
+        if value is not None:
+            return value
+    return None
+
+
+def projectSpec(spec: dict, fields: Iterable[str]) -> dict:
+    """Narrows a component spec to the given fields. ``"channel.name"`` selects a nested field."""
+    projected = {}
+    for field in fields:
+        name, _, rest = field.partition(".")
+        if name not in spec or projected.get(name) is spec[name]:
+            continue
+        if rest and isinstance(spec[name], dict):
+            projected[name] = {**projected.get(name, {}), **projectSpec(spec[name], [rest])}
+        else:
+            projected[name] = spec[name]
+    return projected
+
+
+def compileComponent(spec: dict) -> Callable[[dict], dict]:
+    """Compiles a nested ``{field: path}`` spec into one function extracting every field."""
+    fields = [
+        (name, compileComponent(path) if isinstance(path, dict) else compilePath(path))
+        for name, path in spec.items()
+    ]
+
+    def extract(source: dict) -> dict:
+        return {name: accessor(source) for name, accessor in fields}
+
+    return extract
 
 
 def getVideoId(video_link: str) -> str:
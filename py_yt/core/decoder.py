@@ -0,0 +1,41 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+import json
+import os
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+
+def _stdlibLoads(data: JsonInput) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _orjsonLoads(data: JsonInput) -> Any:
+    return orjson.loads(data)
+
+
+_loads: Callable[[JsonInput], Any] = (
+    _orjsonLoads
+    if ORJSON_AVAILABLE and os.environ.get("PY_YT_JSON", "orjson") != "stdlib"
+    else _stdlibLoads
+)
+
+
+def setDecoder(decoder: Callable[[JsonInput], Any]) -> None:
+    """Replaces the function used to parse every py_yt response body."""
+    global _loads
+    _loads = decoder
+
+
+def loads(data: JsonInput) -> Any:
+    """Parses a JSON response body, preferably straight from the raw bytes."""
+    return _loads(data)
@@ -2,10 +2,6 @@ from __future__ import annotations
 import copy
 import json
 from typing import Optional, Union
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
-
-import httpx
 
 from py_yt.core.constants import (
     videoElementKey,
@@ -21,6 +17,8 @@ from py_yt.core.constants import (
     richItemKey,
     continuationKeyPath,
 )
+from py_yt.core.decoder import loads
+from py_yt.core.requests import getAsyncClient, getSyncClient, warnIfBlocking
 from py_yt.handlers.componenthandler import ComponentHandler
 
 
@@ -60,6 +58,7 @@ class HashtagCore(ComponentHandler):
 
     def next(self) -> bool:
         """Gets the videos from the next page. Call result
+        This blocks; from async code use the async `Hashtag.next` or run it with `asyncio.to_thread`.
         Returns:
             bool: Returns True if getting more results was successful.
         """
@@ -72,65 +71,28 @@ class HashtagCore(ComponentHandler):
             return True
         return False
 
-    def _getParams(self) -> None:
+    def _paramsRequestBody(self) -> dict:
         requestBody = copy.deepcopy(requestPayload)
         requestBody["query"] = "#" + self.hashtag
         requestBody["client"] = {
             "hl": self.language,
             "gl": self.region,
         }
-        requestBodyBytes = json.dumps(requestBody).encode("utf_8")
-        request = Request(
-            "https://www.youtube.com/youtubei/v1/search"
-            + "?"
-            + urlencode(
-                {
-                    "key": searchKey,
-                }
-            ),
-            data=requestBodyBytes,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Content-Length": len(requestBodyBytes),
-                "User-Agent": userAgent,
-            },
-        )
-        try:
-            response = urlopen(request, timeout=self.timeout).read().decode("utf_8")
-        except:
-            raise Exception("ERROR: Could not make request.")
-        content = self._getValue(json.loads(response), contentPath)
-        for item in self._getValue(content, [0, "itemSectionRenderer", "contents"]):
-            if hashtagElementKey in item.keys():
-                self.params = self._getValue(
-                    item[hashtagElementKey],
-                    ["onTapCommand", "browseEndpoint", "params"],
-                )
-                return
+        return requestBody
 
-    async def _asyncGetParams(self) -> None:
+    def _browseRequestBody(self) -> dict:
         requestBody = copy.deepcopy(requestPayload)
-        requestBody["query"] = "#" + self.hashtag
+        requestBody["browseId"] = hashtagBrowseKey
+        requestBody["params"] = self.params
         requestBody["client"] = {
             "hl": self.language,
             "gl": self.region,
         }
-        try:
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
-                response = await client.post(
-                    "https://www.youtube.com/youtubei/v1/search",
-                    params={
-                        "key": searchKey,
-                    },
-                    headers={
-                        "User-Agent": userAgent,
-                    },
-                    json=requestBody,
-                    timeout=self.timeout,
-                )
-                response = response.json()
-        except:
-            raise Exception("ERROR: Could not make request.")
+        if self.continuationKey:
+            requestBody["continuation"] = self.continuationKey
+        return requestBody
+
+    def _setParams(self, response: dict) -> None:
         content = self._getValue(response, contentPath)
         for item in self._getValue(content, [0, "itemSectionRenderer", "contents"]):
             if hashtagElementKey in item.keys():
@@ -140,67 +102,79 @@ class HashtagCore(ComponentHandler):
                 )
                 return
 
+    def _getParams(self) -> None:
+        warnIfBlocking("HashtagCore._getParams")
+        try:
+            response = getSyncClient(self.timeout, self.proxy).post(
+                "https://www.youtube.com/youtubei/v1/search",
+                params={
+                    "key": searchKey,
+                },
+                headers={
+                    "User-Agent": userAgent,
+                },
+                json=self._paramsRequestBody(),
+            )
+            response = loads(response.content)
+        except:
+            raise Exception("ERROR: Could not make request.")
+        self._setParams(response)
+
+    async def _asyncGetParams(self) -> None:
+        try:
+            client = getAsyncClient(self.timeout, self.proxy)
+            response = await client.post(
+                "https://www.youtube.com/youtubei/v1/search",
+                params={
+                    "key": searchKey,
+                },
+                headers={
+                    "User-Agent": userAgent,
+                },
+                json=self._paramsRequestBody(),
+                timeout=self.timeout,
+            )
+            response = loads(response.content)
+        except:
+            raise Exception("ERROR: Could not make request.")
+        self._setParams(response)
+
     def _makeRequest(self) -> None:
         if self.params == None:
             return
-        requestBody = copy.deepcopy(requestPayload)
-        requestBody["browseId"] = hashtagBrowseKey
-        requestBody["params"] = self.params
-        requestBody["client"] = {
-            "hl": self.language,
-            "gl": self.region,
-        }
-        if self.continuationKey:
-            requestBody["continuation"] = self.continuationKey
-        requestBodyBytes = json.dumps(requestBody).encode("utf_8")
-        request = Request(
-            "https://www.youtube.com/youtubei/v1/browse"
-            + "?"
-            + urlencode(
-                {
-                    "key": searchKey,
-                }
-            ),
-            data=requestBodyBytes,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Content-Length": len(requestBodyBytes),
-                "User-Agent": userAgent,
-            },
-        )
+        warnIfBlocking("HashtagCore._makeRequest")
         try:
-            self.response = (
-                urlopen(request, timeout=self.timeout).read().decode("utf_8")
+            response = getSyncClient(self.timeout, self.proxy).post(
+                "https://www.youtube.com/youtubei/v1/browse",
+                params={
+                    "key": searchKey,
+                },
+                headers={
+                    "User-Agent": userAgent,
+                },
+                json=self._browseRequestBody(),
             )
+            self.response = response.content
         except:
             raise Exception("ERROR: Could not make request.")
 
     async def _asyncMakeRequest(self) -> None:
         if self.params == None:
             return
-        requestBody = copy.deepcopy(requestPayload)
-        requestBody["browseId"] = hashtagBrowseKey
-        requestBody["params"] = self.params
-        requestBody["client"] = {
-            "hl": self.language,
-            "gl": self.region,
-        }
-        if self.continuationKey:
-            requestBody["continuation"] = self.continuationKey
         try:
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
-                response = await client.post(
-                    "https://www.youtube.com/youtubei/v1/browse",
-                    params={
-                        "key": searchKey,
-                    },
-                    headers={
-                        "User-Agent": userAgent,
-                    },
-                    json=requestBody,
-                    timeout=self.timeout,
-                )
-                self.response = response.content
+            client = getAsyncClient(self.timeout, self.proxy)
+            response = await client.post(
+                "https://www.youtube.com/youtubei/v1/browse",
+                params={
+                    "key": searchKey,
+                },
+                headers={
+                    "User-Agent": userAgent,
+                },
+                json=self._browseRequestBody(),
+                timeout=self.timeout,
+            )
+            self.response = response.content
         except:
             raise Exception("ERROR: Could not make request.")
 
@@ -211,11 +185,11 @@ class HashtagCore(ComponentHandler):
         try:
             if not self.continuationKey:
                 responseSource = self._getValue(
-                    json.loads(self.response), hashtagVideosPath
+                    loads(self.response), hashtagVideosPath
                 )
             else:
                 responseSource = self._getValue(
-                    json.loads(self.response), hashtagContinuationVideosPath
+                    loads(self.response), hashtagContinuationVideosPath
                 )
             if responseSource:
                 for element in responseSource:
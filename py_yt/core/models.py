@@ -0,0 +1,90 @@
+from __future__ import annotations
+from dataclasses import dataclass, fields as dataclassFields
+from typing import Any, Optional, Union
+
+
+@dataclass(slots=True)
+class ChannelRef:
+    name: Optional[str] = None
+    id: Optional[str] = None
+    link: Optional[str] = None
+    thumbnails: Optional[list] = None
+
+
+@dataclass(slots=True)
+class VideoResult:
+    id: Optional[str] = None
+    title: Optional[str] = None
+    publishedTime: Optional[str] = None
+    duration: Optional[str] = None
+    viewCount: Optional[dict] = None
+    thumbnails: Optional[list] = None
+    richThumbnail: Optional[dict] = None
+    descriptionSnippet: Optional[list] = None
+    channel: Optional[ChannelRef] = None
+    accessibility: Optional[dict] = None
+    link: Optional[str] = None
+    shelfTitle: Optional[str] = None
+    isPlayable: Optional[bool] = None
+    type: str = "video"
+
+
+@dataclass(slots=True)
+class ChannelResult:
+    id: Optional[str] = None
+    title: Optional[str] = None
+    thumbnails: Optional[list] = None
+    videoCount: Optional[str] = None
+    descriptionSnippet: Optional[list] = None
+    subscribers: Optional[str] = None
+    link: Optional[str] = None
+    type: str = "channel"
+
+
+@dataclass(slots=True)
+class PlaylistResult:
+    id: Optional[str] = None
+    title: Optional[str] = None
+    videoCount: Optional[str] = None
+    channel: Optional[ChannelRef] = None
+    thumbnails: Optional[list] = None
+    link: Optional[str] = None
+    type: str = "playlist"
+
+
+Result = Union[VideoResult, ChannelResult, PlaylistResult]
+
+resultModels = {
+    "video": VideoResult,
+    "channel": ChannelResult,
+    "playlist": PlaylistResult,
+}
+
+
+def toModel(component: dict, default: str = "video") -> Result:
+    """Builds the slotted result model for a component dict."""
+    model = resultModels[component.get("type", default)]
+    values = {}
+    for field in dataclassFields(model):
+        if field.name in component:
+            values[field.name] = component[field.name]
+    if isinstance(values.get("channel"), dict):
+        values["channel"] = ChannelRef(
+            **{key: value for key, value in values["channel"].items() if key in ChannelRef.__slots__}
+        )
+    return model(**values)
+
+
+def toDict(result: Any) -> Any:
+    """Converts result models, including ones nested in dicts and lists, back into dicts."""
+    if isinstance(result, dict):
+        return {key: toDict(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [toDict(value) for value in result]
+    if not hasattr(result, "__dataclass_fields__"):
+        return result
+    return {
+        field.name: toDict(getattr(result, field.name))
+        for field in dataclassFields(result)
+        if getattr(result, field.name) is not None
+    }
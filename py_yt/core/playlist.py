@@ -2,7 +2,7 @@ from __future__ import annotations
 import copy
 import json
 import re
-from typing import Iterable, List, Mapping, Optional, TypeVar, Union
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 from py_yt.core.constants import (
@@ -15,10 +15,59 @@ from py_yt.core.constants import (
     playlistSecondaryInfoKey,
     continuationItemKey,
 )
+from py_yt.core.componenthandler import (
+    compileComponent,
+    getFirstValue,
+    getValue,
+    projectSpec,
+)
+from py_yt.core.models import toDict, toModel
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
 
-K = TypeVar("K")
-T = TypeVar("T")
+_playlistVideoSpec = {
+    "id": ["videoId"],
+    "thumbnails": ["thumbnail", "thumbnails"],
+    "title": ["title", "runs", 0, "text"],
+    "channel": {
+        "name": ["shortBylineText", "runs", 0, "text"],
+        "id": [
+            "shortBylineText",
+            "runs",
+            0,
+            "navigationEndpoint",
+            "browseEndpoint",
+            "browseId",
+        ],
+        "link": [
+            "shortBylineText",
+            "runs",
+            0,
+            "navigationEndpoint",
+            "browseEndpoint",
+            "canonicalBaseUrl",
+        ],
+    },
+    "duration": ["lengthText", "simpleText"],
+    "accessibility": {
+        "title": ["title", "accessibility", "accessibilityData", "label"],
+        "duration": ["lengthText", "accessibility", "accessibilityData", "label"],
+    },
+    "link": ["navigationEndpoint", "commandMetadata", "webCommandMetadata", "url"],
+    "isPlayable": ["isPlayable"],
+}
+
+_extractors: Dict[Optional[Tuple[str, ...]], Callable[[dict], dict]] = {}
+
+
+def getExtractor(fields: Optional[Tuple[str, ...]] = None) -> Callable[[dict], dict]:
+    extractor = _extractors.get(fields)
+    if extractor is None:
+        spec = _playlistVideoSpec
+        if fields is not None:
+            spec = projectSpec(spec, ("id",) + fields)
+        extractor = _extractors[fields] = compileComponent(spec)
+    return extractor
 
 
 class PlaylistCore(RequestCore):
@@ -33,8 +82,12 @@ class PlaylistCore(RequestCore):
         result_mode: int,
         timeout: int,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         super().__init__(timeout=timeout, proxy=proxy)
+        self.fields = tuple(fields) if fields is not None else None
+        self.as_model = as_model
         self.componentMode = componentMode
         self.resultMode = result_mode
         self.timeout = timeout
@@ -44,7 +97,7 @@ class PlaylistCore(RequestCore):
         self.__parseSource()
         self.__getComponents()
         if self.resultMode == ResultMode.json:
-            self.result = json.dumps(self.playlistComponent, indent=4)
+            self.result = json.dumps(toDict(self.playlistComponent), indent=4)
         else:
             self.result = self.playlistComponent
 
@@ -59,7 +112,7 @@ class PlaylistCore(RequestCore):
         self.__parseSource()
         self.__getNextComponents()
         if self.resultMode == ResultMode.json:
-            self.result = json.dumps(self.playlistComponent, indent=4)
+            self.result = json.dumps(toDict(self.playlistComponent), indent=4)
         else:
             self.result = self.playlistComponent
 
@@ -67,7 +120,7 @@ class PlaylistCore(RequestCore):
         if self.continuationKey:
             self.prepare_next_request()
             statusCode = await self.asyncPostRequest()
-            self.response = statusCode.text
+            self.response = statusCode.content
             if statusCode.status_code == 200:
                 self.next_post_processing()
             else:
@@ -119,7 +172,7 @@ class PlaylistCore(RequestCore):
     async def __makeAsyncRequest(self) -> int:
         self.prepare_first_request()
         request = await self.asyncPostRequest()
-        self.response = request.text
+        self.response = request.content
         return request.status_code
 
     def prepare_next_request(self):
@@ -138,7 +191,7 @@ class PlaylistCore(RequestCore):
 
     def __parseSource(self) -> None:
         try:
-            self.responseSource = json.loads(self.response)
+            self.responseSource = loads(self.response)
         except:
             raise Exception("ERROR: Could not parse YouTube response.")
 
@@ -177,67 +230,9 @@ class PlaylistCore(RequestCore):
             videos = []
             for video in videorenderer:
                 try:
-                    video = video["playlistVideoRenderer"]
-                    j = {
-                        "id": self.__getValue(video, ["videoId"]),
-                        "thumbnails": self.__getValue(video, ["thumbnail", "thumbnails"]),
-                        "title": self.__getValue(video, ["title", "runs", 0, "text"]),
-                        "channel": {
-                            "name": self.__getValue(
-                                video, ["shortBylineText", "runs", 0, "text"]
-                            ),
-                            "id": self.__getValue(
-                                video,
-                                [
-                                    "shortBylineText",
-                                    "runs",
-                                    0,
-                                    "navigationEndpoint",
-                                    "browseEndpoint",
-                                    "browseId",
-                                ],
-                            ),
-                            "link": self.__getValue(
-                                video,
-                                [
-                                    "shortBylineText",
-                                    "runs",
-                                    0,
-                                    "navigationEndpoint",
-                                    "browseEndpoint",
-                                    "canonicalBaseUrl",
-                                ],
-                            ),
-                        },
-                        "duration": self.__getValue(video, ["lengthText", "simpleText"]),
-                        "accessibility": {
-                            "title": self.__getValue(
-                                video,
-                                ["title", "accessibility", "accessibilityData", "label"],
-                            ),
-                            "duration": self.__getValue(
-                                video,
-                                [
-                                    "lengthText",
-                                    "accessibility",
-                                    "accessibilityData",
-                                    "label",
-                                ],
-                            ),
-                        },
-                        "link": "https://www.youtube.com"
-                        + self.__getValue(
-                            video,
-                            [
-                                "navigationEndpoint",
-                                "commandMetadata",
-                                "webCommandMetadata",
-                                "url",
-                            ],
-                        ),
-                        "isPlayable": self.__getValue(video, ["isPlayable"]),
-                    }
-                    videos.append(j)
+                    videos.append(
+                        self.__getVideoComponent(video["playlistVideoRenderer"])
+                    )
                 except:
                     pass
 
@@ -388,7 +383,7 @@ class PlaylistCore(RequestCore):
                             "link": "https://www.youtube.com/watch?v="
                             + self.__getValue(video, ["videoId"]),
                         }
-                        videos.append(j)
+                        videos.append(toModel(j) if self.as_model else j)
                 except:
                     pass
             playlistElement = {
@@ -429,86 +424,22 @@ class PlaylistCore(RequestCore):
             return
         for videoElement in continuationElements:
             if playlistVideoKey in videoElement.keys():
-                videoComponent = {
-                    "id": self.__getValue(videoElement, [playlistVideoKey, "videoId"]),
-                    "title": self.__getValue(
-                        videoElement, [playlistVideoKey, "title", "runs", 0, "text"]
-                    ),
-                    "thumbnails": self.__getValue(
-                        videoElement, [playlistVideoKey, "thumbnail", "thumbnails"]
-                    ),
-                    "link": "https://www.youtube.com"
-                    + self.__getValue(
-                        videoElement,
-                        [
-                            playlistVideoKey,
-                            "navigationEndpoint",
-                            "commandMetadata",
-                            "webCommandMetadata",
-                            "url",
-                        ],
-                    ),
-                    "channel": {
-                        "name": self.__getValue(
-                            videoElement,
-                            [playlistVideoKey, "shortBylineText", "runs", 0, "text"],
-                        ),
-                        "id": self.__getValue(
-                            videoElement,
-                            [
-                                playlistVideoKey,
-                                "shortBylineText",
-                                "runs",
-                                0,
-                                "navigationEndpoint",
-                                "browseEndpoint",
-                                "browseId",
-                            ],
-                        ),
-                        "link": "https://www.youtube.com"
-                        + self.__getValue(
-                            videoElement,
-                            [
-                                playlistVideoKey,
-                                "shortBylineText",
-                                "runs",
-                                0,
-                                "navigationEndpoint",
-                                "browseEndpoint",
-                                "canonicalBaseUrl",
-                            ],
-                        ),
-                    },
-                    "duration": self.__getValue(
-                        videoElement, [playlistVideoKey, "lengthText", "simpleText"]
-                    ),
-                    "accessibility": {
-                        "title": self.__getValue(
-                            videoElement,
-                            [
-                                playlistVideoKey,
-                                "title",
-                                "accessibility",
-                                "accessibilityData",
-                                "label",
-                            ],
-                        ),
-                        "duration": self.__getValue(
-                            videoElement,
-                            [
-                                playlistVideoKey,
-                                "lengthText",
-                                "accessibility",
-                                "accessibilityData",
-                                "label",
-                            ],
-                        ),
-                    },
-                }
+                videoComponent = self.__getVideoComponent(
+                    videoElement[playlistVideoKey], channelLinkPrefix=True
+                )
                 playlistComponent["videos"].append(videoComponent)
             self.continuationKey = self.__getValue(videoElement, continuationKeyPath)
         self.playlistComponent["videos"].extend(playlistComponent["videos"])
 
+    def __getVideoComponent(self, video: dict, channelLinkPrefix: bool = False):
+        component = getExtractor(self.fields)(video)
+        if "link" in component:
+            component["link"] = "https://www.youtube.com" + component["link"]
+        channel = component.get("channel")
+        if channelLinkPrefix and channel and "link" in channel:
+            channel["link"] = "https://www.youtube.com" + channel["link"]
+        return toModel(component) if self.as_model else component
+
     def __getPlaylistComponent(self, element: dict, mode: str) -> dict:
         playlistComponent = {}
         if mode in ["getInfo", None]:
@@ -694,59 +625,14 @@ class PlaylistCore(RequestCore):
         if mode == ResultMode.dict:
             return self.playlistComponent
         elif mode == ResultMode.json:
-            return json.dumps(self.playlistComponent, indent=4)
+            return json.dumps(toDict(self.playlistComponent), indent=4)
 
     def __getValue(
         self, source: dict, path: Iterable[str]
     ) -> Union[str, int, dict, None]:
-        value = source
-        for key in path:
-            if type(key) is str:
-                if key in value.keys():
-                    value = value[key]
-                else:
-                    value = None
-                    break
-            elif type(key) is int:
-                if len(value) != 0:
-                    value = value[key]
-                else:
-                    value = None
-                    break
-        return value
-
-    def __getAllWithKey(self, source: Iterable[Mapping[K, T]], key: K) -> Iterable[T]:
-        for item in source:
-            if key in item:
-                yield item[key]
-
-    def __getValueEx(
-        self, source: dict, path: List[str]
-    ) -> Iterable[Union[str, int, dict, None]]:
-        if len(path) <= 0:
-            yield source
-            return
-        key = path[0]
-        upcoming = path[1:]
-        if key is None:
-            following_key = upcoming[0]
-            upcoming = upcoming[1:]
-            if following_key is None:
-                raise Exception(
-                    "Cannot search for a key twice consecutive or at the end with no key given"
-                )
-            values = self.__getAllWithKey(source, following_key)
-            for val in values:
-                yield from self.__getValueEx(val, path=upcoming)
-        else:
-            val = self.__getValue(source, path=[key])
-            yield from self.__getValueEx(val, path=upcoming)
+        return getValue(source, path)
 
     def __getFirstValue(
         self, source: dict, path: Iterable[str]
     ) -> Union[str, int, dict, list, None]:
-        values = self.__getValueEx(source, list(path))
-        for val in values:
-            if val is not None:
-                return val
-        return None
+        return getFirstValue(source, list(path))
@@ -8,6 +8,8 @@ from py_yt.core.constants import (
     requestPayload,
     searchKey,
 )
+from py_yt.core.componenthandler import getValue
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
 from py_yt.handlers.componenthandler import ComponentHandler
 
@@ -56,26 +58,12 @@ class RelatedVideosCore(RequestCore, ComponentHandler):
         self._getRequestBody()
         response = await self.asyncPostRequest()
         if response:
-            self.responseSource = response.json()
+            self.responseSource = loads(response.content)
         else:
             raise Exception("ERROR: Could not make request.")
 
     def _getValue(self, source: dict, path: list) -> Union[str, int, dict, list, None]:
-        value = source
-        for key in path:
-            if type(key) is str:
-                if isinstance(value, dict) and key in value.keys():
-                    value = value[key]
-                else:
-                    value = None
-                    break
-            elif type(key) is int:
-                if isinstance(value, list) and len(value) > key:
-                    value = value[key]
-                else:
-                    value = None
-                    break
-        return value
+        return getValue(source, path)
 
     async def next(self) -> dict:
         self.resultComponents = []
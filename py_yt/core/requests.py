@@ -1,91 +1,247 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
 import os
 import logging
+import threading
+import time
 
 import httpx
+from py_yt.core.cache import responseCache
 from py_yt.core.constants import userAgent
+from py_yt.core.retry import CircuitBreaker, RetryPolicy, getBreaker, parseRetryAfter
+import py_yt.core.retry as retry
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+clientLimits = httpx.Limits(
+    max_connections=int(os.environ.get("PY_YT_MAX_CONNECTIONS", 50)),
+    max_keepalive_connections=int(os.environ.get("PY_YT_MAX_KEEPALIVE", 20)),
+    keepalive_expiry=30.0,
+)
+
+_asyncClients: Dict[Tuple, httpx.AsyncClient] = {}
+_syncClients: Dict[Tuple, httpx.Client] = {}
+_syncClientsLock = threading.Lock()
+
+
+def getAsyncClient(timeout: float, proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """Returns the shared AsyncClient for this proxy and timeout on the running loop."""
+    http2 = HTTP2_AVAILABLE and os.environ.get("PY_YT_HTTP2", "1") != "0"
+    try:
+        loopId = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loopId = None
+    key = (loopId, proxy, timeout, http2)
+    client = _asyncClients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=timeout, proxy=proxy, limits=clientLimits, http2=http2
+        )
+        _asyncClients[key] = client
+    return client
+
+
+def getSyncClient(timeout: float, proxy: Optional[str] = None) -> httpx.Client:
+    """Returns the shared blocking Client for this proxy and timeout."""
+    key = (proxy, timeout)
+    with _syncClientsLock:
+        client = _syncClients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(timeout=timeout, proxy=proxy, limits=clientLimits)
+            _syncClients[key] = client
+    return client
+
+
+def warnIfBlocking(name: str) -> None:
+    """Logs when blocking I/O is about to run on a thread with a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    logger.warning(
+        "%s performs blocking I/O on the event loop thread; "
+        "use the async API or run it with asyncio.to_thread",
+        name,
+        stack_info=True,
+    )
+
+
+async def closeClients() -> None:
+    """Closes every shared client. Call once on shutdown."""
+    clients = list(_asyncClients.values())
+    _asyncClients.clear()
+    for client in clients:
+        if not client.is_closed:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.debug("Failed to close shared client", exc_info=True)
+    with _syncClientsLock:
+        syncClients = list(_syncClients.values())
+        _syncClients.clear()
+    for client in syncClients:
+        client.close()
+
 
 class RequestCore:
     def __init__(
-        self, timeout: float = 7.0, max_retries: int = 0, proxy: Optional[str] = None
+        self,
+        timeout: float = 7.0,
+        max_retries: int = 0,
+        proxy: Optional[str] = None,
+        retryPolicy: Optional[RetryPolicy] = None,
     ):
         self.url: Optional[str] = None
         self.data: Optional[dict] = None
         self.timeout: float = timeout
         self.max_retries: int = max_retries
+        self.retryPolicy: Optional[RetryPolicy] = retryPolicy
         self.proxy_url: Optional[str] = proxy or os.environ.get("PROXY_URL")
-        client_args = {"timeout": self.timeout, "proxy": self.proxy_url}
 
-        self.async_client = httpx.AsyncClient(**client_args)
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        return getAsyncClient(self.timeout, self.proxy_url)
 
-    async def asyncPostRequest(self) -> Optional[httpx.Response]:
-        """Sends an asynchronous POST request."""
-        if not self.url:
-            raise ValueError("URL must be set before making a request.")
+    def _getRetryPolicy(self) -> RetryPolicy:
+        if self.retryPolicy is not None:
+            return self.retryPolicy
+        if self.max_retries:
+            return retry.defaultRetryPolicy.withRetries(self.max_retries)
+        return retry.defaultRetryPolicy
 
-        headers = {"User-Agent": userAgent}
+    def _nextDelay(
+        self,
+        breaker: CircuitBreaker,
+        policy: RetryPolicy,
+        attempt: int,
+        response: Optional[httpx.Response],
+        error: Optional[Exception],
+    ) -> Optional[float]:
+        """Records the outcome of one attempt and returns how long to wait before the next one."""
+        if policy.isRetryable(response):
+            breaker.recordFailure(parseRetryAfter(response))
+        else:
+            breaker.recordSuccess()
+        statusCode = response.status_code if response is not None else None
+        delay = None if breaker.state == breaker.open else policy.delay(attempt, response)
+        if delay is None:
+            logger.error(
+                "HTTP request failed",
+                extra={
+                    "request_url": self.url,
+                    "status_code": statusCode,
+                    "attempts": attempt + 1,
+                },
+                exc_info=error,
+            )
+            return None
+        breaker.recordRetry()
+        logger.warning(
+            "Retrying HTTP request in %.2fs (attempt %d, status %s, error %r)",
+            delay,
+            attempt + 1,
+            statusCode,
+            error,
+            extra={"request_url": self.url},
+        )
+        return delay
 
-        for _ in range(self.max_retries + 1):
+    async def _asyncSend(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> Optional[httpx.Response]:
+        policy = self._getRetryPolicy()
+        breaker = getBreaker(self.url)
+        attempt = 0
+        while True:
+            breaker.allow()
+            response, error = None, None
             try:
-                response = await self.async_client.post(
-                    self.url,
-                    headers=headers,
-                    json=self.data,
-                )
-                response.raise_for_status()
+                response = await send()
+            except httpx.RequestError as e:
+                error = e
+            except BaseException:
+                breaker.release()
+                raise
+            if response is not None and response.is_success:
+                breaker.recordSuccess()
                 return response
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "HTTP error during HTTP request",
-                    extra={
-                        "status_code": getattr(e.response, "status_code", None),
-                        "response_text": getattr(e.response, "text", None),
-                    },
-                    exc_info=True,
-                )
+            delay = self._nextDelay(breaker, policy, attempt, response, error)
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _syncSend(self, send: Callable[[], httpx.Response]) -> Optional[httpx.Response]:
+        policy = self._getRetryPolicy()
+        breaker = getBreaker(self.url)
+        attempt = 0
+        while True:
+            breaker.allow()
+            response, error = None, None
+            try:
+                response = send()
             except httpx.RequestError as e:
-                logger.error(
-                    "Request error during HTTP request",
-                    extra={
-                        "request_url": getattr(getattr(e, "request", None), "url", None),
-                    },
-                    exc_info=True,
-                )
-        return None
+                error = e
+            except BaseException:
+                breaker.release()
+                raise
+            if response is not None and response.is_success:
+                breaker.recordSuccess()
+                return response
+            delay = self._nextDelay(breaker, policy, attempt, response, error)
+            if delay is None:
+                return None
+            time.sleep(delay)
+            attempt += 1
+
+    async def asyncPostRequest(self) -> Optional[httpx.Response]:
+        """Sends an asynchronous POST request, served from the response cache when possible.
+
+        Failed attempts are retried following the retry policy. Raises CircuitOpenError
+        without sending anything while the endpoint's circuit breaker is open.
+        """
+        if not self.url:
+            raise ValueError("URL must be set before making a request.")
+        return await responseCache.fetch(self.url, self.data, self._asyncPost)
+
+    async def _asyncPost(self) -> Optional[httpx.Response]:
+        return await self._asyncSend(
+            lambda: self.async_client.post(
+                self.url,
+                headers={"User-Agent": userAgent},
+                json=self.data,
+            )
+        )
+
+    def syncPostRequest(self) -> Optional[httpx.Response]:
+        """Sends a blocking POST request. Only call this off the event loop thread."""
+        if not self.url:
+            raise ValueError("URL must be set before making a request.")
+        warnIfBlocking(f"{type(self).__name__}.syncPostRequest")
+        client = getSyncClient(self.timeout, self.proxy_url)
+        return self._syncSend(
+            lambda: client.post(
+                self.url, headers={"User-Agent": userAgent}, json=self.data
+            )
+        )
 
     async def asyncGetRequest(self) -> Optional[httpx.Response]:
         """Sends an asynchronous GET request."""
         if not self.url:
             raise ValueError("URL must be set before making a request.")
         cookies = {"CONSENT": "YES+1"}
-        for _ in range(self.max_retries + 1):
-            try:
-                response = await self.async_client.get(
-                    self.url,
-                    headers={"User-Agent": userAgent},
-                    cookies=cookies,
-                )
-                response.raise_for_status()
-                return response
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "HTTP error during HTTP request",
-                    extra={
-                        "status_code": getattr(e.response, "status_code", None),
-                        "response_text": getattr(e.response, "text", None),
-                    },
-                    exc_info=True,
-                )
-            except httpx.RequestError as e:
-                logger.error(
-                    "Request error during HTTP request",
-                    extra={
-                        "request_url": getattr(getattr(e, "request", None), "url", None),
-                    },
-                    exc_info=True,
-                )
-        return None
+        return await self._asyncSend(
+            lambda: self.async_client.get(
+                self.url,
+                headers={"User-Agent": userAgent},
+                cookies=cookies,
+            )
+        )
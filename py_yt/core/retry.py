@@ -0,0 +1,245 @@
+from __future__ import annotations
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlparse
+import logging
+import os
+import random
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retryIn: float):
+        super().__init__(f"Circuit open for {endpoint}; retry in {retryIn:.1f}s")
+        self.endpoint = endpoint
+        self.retryIn = retryIn
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Delays grow exponentially from `baseDelay` up to `maxDelay`, with full jitter. A
+    `Retry-After` header on a retryable response overrides the computed delay; when it
+    asks for longer than `maxRetryAfter` the request is not retried.
+
+    Args:
+        maxRetries (int, optional): Retries after the first attempt. Defaults to 2.
+        baseDelay (float, optional): Delay before the first retry, in seconds. Defaults to 0.5.
+        maxDelay (float, optional): Upper bound of the backoff delay. Defaults to 8.
+        jitter (bool, optional): Picks a random delay between 0 and the backoff delay. Defaults to True.
+        retryStatuses (Iterable[int], optional): Status codes that are retried. Defaults to 429 and 5xx gateway errors.
+        maxRetryAfter (float, optional): Longest `Retry-After` that is honoured. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        maxRetries: int = 2,
+        baseDelay: float = 0.5,
+        maxDelay: float = 8.0,
+        jitter: bool = True,
+        retryStatuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504}),
+        maxRetryAfter: float = 30.0,
+    ):
+        self.maxRetries = maxRetries
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.jitter = jitter
+        self.retryStatuses = frozenset(retryStatuses)
+        self.maxRetryAfter = maxRetryAfter
+
+    def withRetries(self, maxRetries: int) -> RetryPolicy:
+        return RetryPolicy(
+            maxRetries,
+            self.baseDelay,
+            self.maxDelay,
+            self.jitter,
+            self.retryStatuses,
+            self.maxRetryAfter,
+        )
+
+    def isRetryable(self, response: Optional[httpx.Response]) -> bool:
+        """Transport errors (no response) and the configured status codes are retryable."""
+        return response is None or response.status_code in self.retryStatuses
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.maxDelay, self.baseDelay * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to wait before retry number `attempt + 1`, or None to stop retrying."""
+        if attempt >= self.maxRetries or not self.isRetryable(response):
+            return None
+        retryAfter = parseRetryAfter(response)
+        if retryAfter is None:
+            return self.backoff(attempt)
+        if retryAfter > self.maxRetryAfter:
+            return None
+        return retryAfter
+
+
+def parseRetryAfter(response: Optional[httpx.Response]) -> Optional[float]:
+    """Reads a `Retry-After` header given either as seconds or as an HTTP date."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures of one endpoint and fails fast while it is unhealthy.
+
+    After `failureThreshold` consecutive failures the breaker opens for `cooldown`
+    seconds (or longer if the endpoint sent `Retry-After`). Once the cooldown ends,
+    one probe request is let through; it closes the breaker on success and reopens it
+    on failure.
+
+    Args:
+        endpoint (str): Path of the endpoint this breaker guards.
+        failureThreshold (int, optional): Consecutive failures that open the breaker. Defaults to 5.
+        cooldown (float, optional): Seconds the breaker stays open. Defaults to 30.
+    """
+
+    closed = "closed"
+    open = "open"
+    halfOpen = "half_open"
+
+    def __init__(self, endpoint: str, failureThreshold: int = 5, cooldown: float = 30.0):
+        self.endpoint = endpoint
+        self.failureThreshold = failureThreshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.openedUntil = 0.0
+        self.opens = 0
+        self.rejected = 0
+        self.successes = 0
+        self.totalFailures = 0
+        self.retries = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failureThreshold:
+            return self.closed
+        if time.monotonic() < self.openedUntil:
+            return self.open
+        return self.halfOpen
+
+    @property
+    def isOpen(self) -> bool:
+        """True while requests to this endpoint are being rejected."""
+        state = self.state
+        return state == self.open or (state == self.halfOpen and self._probing)
+
+    def allow(self) -> None:
+        """Raises CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            state = self.state
+            if state == self.closed:
+                return
+            if state == self.halfOpen and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            retryIn = max(0.0, self.openedUntil - time.monotonic())
+        raise CircuitOpenError(self.endpoint, retryIn)
+
+    def recordSuccess(self) -> None:
+        with self._lock:
+            if self.failures >= self.failureThreshold:
+                logger.info("Circuit closed for %s", self.endpoint)
+            self.failures = 0
+            self.successes += 1
+            self._probing = False
+
+    def recordFailure(self, retryAfter: Optional[float] = None) -> None:
+        with self._lock:
+            self.failures += 1
+            self.totalFailures += 1
+            wasProbing = self._probing
+            self._probing = False
+            if self.failures == self.failureThreshold or (
+                wasProbing and self.failures > self.failureThreshold
+            ):
+                self.openedUntil = time.monotonic() + max(self.cooldown, retryAfter or 0.0)
+                self.opens += 1
+                logger.warning(
+                    "Circuit opened for %s after %d consecutive failures",
+                    self.endpoint,
+                    self.failures,
+                )
+
+    def recordRetry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def release(self) -> None:
+        """Frees the half-open probe slot when a request ends without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.failures,
+            "openFor": round(max(0.0, self.openedUntil - time.monotonic()), 1),
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "successes": self.successes,
+            "failures": self.totalFailures,
+            "retries": self.retries,
+        }
+
+
+defaultRetryPolicy = RetryPolicy(maxRetries=int(os.environ.get("PY_YT_MAX_RETRIES", 2)))
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakersLock = threading.Lock()
+
+
+def setDefaultRetryPolicy(policy: RetryPolicy) -> None:
+    """Replaces the policy used by requests that were not given one."""
+    global defaultRetryPolicy
+    defaultRetryPolicy = policy
+
+
+def getBreaker(urlOrPath: str) -> CircuitBreaker:
+    """Returns the shared circuit breaker for the endpoint of a URL or path."""
+    path = urlparse(urlOrPath).path or urlOrPath
+    with _breakersLock:
+        breaker = _breakers.get(path)
+        if breaker is None:
+            breaker = _breakers[path] = CircuitBreaker(
+                path,
+                failureThreshold=int(os.environ.get("PY_YT_BREAKER_THRESHOLD", 5)),
+                cooldown=float(os.environ.get("PY_YT_BREAKER_COOLDOWN", 30)),
+            )
+    return breaker
+
+
+def isCircuitOpen(urlOrPath: str) -> bool:
+    """True while requests to this endpoint fail fast."""
+    return getBreaker(urlOrPath).isOpen
+
+
+def breakerStats() -> Dict[str, dict]:
+    """Returns the state and counters of every endpoint's circuit breaker."""
+    with _breakersLock:
+        breakers = list(_breakers.values())
+    return {breaker.endpoint: breaker.stats() for breaker in breakers}
@@ -1,10 +1,12 @@
 from __future__ import annotations
+import asyncio
 import copy
 import json
 import re
-from typing import Optional, Union
+from typing import AsyncIterator, Iterable, Optional, Union
 from urllib.parse import urlencode
 
+from py_yt.core.componenthandler import getValue
 from py_yt.core.constants import (
     requestPayload,
     searchKey,
@@ -15,6 +17,7 @@ from py_yt.core.constants import (
     shelfElementKey,
     richItemKey,
 )
+from py_yt.core.models import Result, toDict, toModel
 from py_yt.core.requests import RequestCore
 from py_yt.handlers.componenthandler import ComponentHandler
 from py_yt.handlers.requesthandler import RequestHandler
@@ -36,6 +39,8 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
         with_live: bool = True,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         super().__init__(timeout=timeout, max_retries=max_retries, proxy=proxy)
         self.query = query
@@ -45,9 +50,12 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
         self.searchPreferences = searchPreferences
         self.timeout = timeout
         self.with_live = with_live
+        self.fields = tuple(fields) if fields is not None else None
+        self.as_model = as_model
         self.continuationKey = None
 
     def sync_create(self):
+        """Fetches the first page with blocking I/O. From async code, run it with `asyncio.to_thread`."""
         self._makeRequest()
         self._parseSource()
 
@@ -92,7 +100,7 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
         self._getRequestBody()
         request = self.syncPostRequest()
         try:
-            self.response = request.text
+            self.response = request.content
         except:
             raise Exception("ERROR: Could not make request.")
 
@@ -100,7 +108,7 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
         self._getRequestBody()
         request = await self.asyncPostRequest()
         if request:
-            self.response = request.text
+            self.response = request.content
         else:
             raise Exception("ERROR: Could not make request.")
 
@@ -114,7 +122,10 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
             Union[str, dict]: Returns JSON or dictionary.
         """
         if mode == ResultMode.json:
-            return json.dumps({"result": self.resultComponents}, indent=4)
+            return json.dumps(
+                {"result": [toDict(component) for component in self.resultComponents]},
+                indent=4,
+            )
         elif mode == ResultMode.dict:
             return {"result": self.resultComponents}
 
@@ -149,6 +160,57 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
             "result": self.resultComponents,
         }
 
+    async def stream(
+        self, maxResults: Optional[int] = None, prefetch: bool = True
+    ) -> AsyncIterator[Union[dict, Result]]:
+        """Yields results as soon as each page is parsed.
+
+        While the caller consumes a page, the next continuation page is fetched in the
+        background. Each page holds at most `limit` results.
+
+        Args:
+            maxResults (int, optional): Stops after this many results. Defaults to no limit.
+            prefetch (bool, optional): Fetches the next page ahead of time. Defaults to True.
+        """
+        pending = asyncio.ensure_future(self._nextAsync())
+        count = 0
+        try:
+            while pending is not None:
+                page = (await pending)["result"]
+                pending = None
+                hasMore = bool(page) and self.continuationKey is not None
+                if hasMore and prefetch and (
+                    maxResults is None or count + len(page) < maxResults
+                ):
+                    pending = asyncio.ensure_future(self._nextAsync())
+                for component in page:
+                    yield component
+                    count += 1
+                    if maxResults is not None and count >= maxResults:
+                        return
+                if hasMore and pending is None:
+                    pending = asyncio.ensure_future(self._nextAsync())
+        finally:
+            if pending is not None:
+                if pending.done() and not pending.cancelled():
+                    pending.exception()
+                pending.cancel()
+
+    def _isLive(self, element: dict) -> bool:
+        return (
+            getValue(element, [videoElementKey, "lengthText", "simpleText"]) is None
+            and getValue(element, [videoElementKey, "publishedTimeText", "simpleText"])
+            is None
+        )
+
+    def _addVideo(self, element: dict, shelfTitle: str = None) -> None:
+        if not self.with_live and self._isLive(element):
+            return
+        self._addComponent(self._getVideoComponent(element, shelfTitle=shelfTitle))
+
+    def _addComponent(self, component: dict) -> None:
+        self.resultComponents.append(toModel(component) if self.as_model else component)
+
     def _getComponents(
         self, findVideos: bool, findChannels: bool, findPlaylists: bool
     ) -> None:
@@ -158,42 +220,19 @@ class SearchCore(RequestCore, RequestHandler, ComponentHandler):
 
         for element in self.responseSource:
             if videoElementKey in element and findVideos:
-                videoComponent = self._getVideoComponent(element)
-                if (
-                    not self.with_live
-                    and videoComponent["duration"] is None
-                    and videoComponent["publishedTime"] is None
-                ):
-                    continue
-                self.resultComponents.append(videoComponent)
+                self._addVideo(element)
             if channelElementKey in element and findChannels:
-                self.resultComponents.append(self._getChannelComponent(element))
+                self._addComponent(self._getChannelComponent(element))
             if (playlistElementKey in element or "lockupViewModel" in element) and findPlaylists:
-                self.resultComponents.append(self._getPlaylistComponent(element))
+                self._addComponent(self._getPlaylistComponent(element))
             if shelfElementKey in element and findVideos:
-                for shelfElement in self._getShelfComponent(element)["elements"]:
-                    videoComponent = self._getVideoComponent(
-                        shelfElement,
-                        shelfTitle=self._getShelfComponent(element)["title"],
-                    )
-                    if (
-                        not self.with_live
-                        and videoComponent["duration"] is None
-                        and videoComponent["publishedTime"] is None
-                    ):
-                        continue
-                    self.resultComponents.append(videoComponent)
+                shelf = self._getShelfComponent(element)
+                for shelfElement in shelf["elements"]:
+                    self._addVideo(shelfElement, shelfTitle=shelf["title"])
             if richItemKey in element and findVideos:
                 richItemElement = self._getValue(element, [richItemKey, "content"])
                 """ Initial fallback handling for VideosSearch """
                 if videoElementKey in richItemElement:
-                    videoComponent = self._getVideoComponent(richItemElement)
-                    if (
-                        not self.with_live
-                        and videoComponent["duration"] is None
-                        and videoComponent["publishedTime"] is None
-                    ):
-                        continue
-                    self.resultComponents.append(videoComponent)
+                    self._addVideo(richItemElement)
             if len(self.resultComponents) >= self.limit:
                 break
@@ -5,6 +5,7 @@ from urllib.parse import urlencode
 
 from py_yt.core.componenthandler import getVideoId, getValue
 from py_yt.core.constants import searchKey, requestPayload
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
 
 
@@ -25,7 +26,7 @@ class TranscriptCore(RequestCore):
         self.data["videoId"] = getVideoId(self.videoLink)
 
     def extract_continuation_key(self, r):
-        j = r.json()
+        j = loads(r.content)
         panels = getValue(j, ["engagementPanels"])
         if not panels:
             raise Exception(
@@ -135,5 +136,5 @@ class TranscriptCore(RequestCore):
         self.prepare_transcript_request()
         response = await self.asyncPostRequest()
         if response:
-            self.data = response.json()
+            self.data = loads(response.content)
             self.extract_transcript()
@@ -1,12 +1,18 @@
 from __future__ import annotations
+import asyncio
 import copy
 import json
-from typing import Optional, Union
+import logging
+from typing import Iterable, Optional, Union
 from urllib.parse import urlencode, urlparse, parse_qs
 
 from py_yt.core.componenthandler import getVideoId, getValue
 from py_yt.core.constants import searchKey, ResultMode
+from py_yt.core.decoder import loads
 from py_yt.core.requests import RequestCore
+from py_yt.core.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
 
 CLIENTS = {
     "MWEB": {
@@ -43,6 +49,11 @@ CLIENTS = {
     },
 }
 
+raceClientOrder = ("ANDROID", "MWEB", "TV_EMBED")
+
+# A throttled client is raced by the next one instead of being retried
+_raceRetryPolicy = RetryPolicy(maxRetries=0)
+
 
 def _get_cleaned_url(video_link: str) -> str:
     """
@@ -111,7 +122,7 @@ class VideoCore(RequestCore):
                 f"Video link: {video_link}, Request parameters: {request_params}"
             )
 
-        self.response = response.text
+        self.response = response.content
         if response.status_code == 200:
             self.post_request_processing()
         else:
@@ -135,11 +146,11 @@ class VideoCore(RequestCore):
     async def async_html_create(self):
         self.prepare_html_request()
         response = await self.asyncPostRequest()
-        self.HTMLresponseSource = response.json()
+        self.HTMLresponseSource = loads(response.content)
 
     def __parseSource(self) -> None:
         try:
-            self.responseSource = json.loads(self.response)
+            self.responseSource = loads(self.response)
         except Exception as e:
             raise Exception("ERROR: Could not parse YouTube response." + str(e))
 
@@ -232,3 +243,66 @@ class VideoCore(RequestCore):
                 ["microformat", "playerMicroformatRenderer", "uploadDate"],
             )
         self.__videoComponent = videoComponent
+
+
+async def _fetchWithClient(
+    video_link: str, client: str, timeout: float, proxy: Optional[str]
+) -> dict:
+    video = VideoCore(
+        video_link, None, ResultMode.dict, timeout, False, client, proxy=proxy
+    )
+    video.retryPolicy = _raceRetryPolicy
+    await video.async_create()
+    return video.result
+
+
+async def raceClients(
+    video_link: str,
+    clients: Iterable[str] = raceClientOrder,
+    timeout: float = 3,
+    stagger: float = 0.3,
+    proxy: Optional[str] = None,
+) -> Optional[dict]:
+    """Fetches the player response with several innertube clients and returns the first complete one.
+
+    Clients are started in order; the next one starts as soon as the previous fails
+    or has not answered within `stagger` seconds. The first answer carrying both video
+    details and streaming data wins and the other requests are cancelled. When no
+    client returns streaming data, the first answer with video details is returned.
+    """
+    remaining = list(clients)
+    pending = {}
+    partial = None
+    try:
+        while remaining or pending:
+            if remaining:
+                client = remaining.pop(0)
+                task = asyncio.ensure_future(
+                    _fetchWithClient(video_link, client, timeout, proxy)
+                )
+                pending[task] = client
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=stagger if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                client = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.debug("Player request with %s client failed: %s", client, e)
+                    continue
+                if not result.get("id"):
+                    continue
+                result["client"] = client
+                if result.get("streamingData"):
+                    return result
+                if partial is None:
+                    partial = result
+        return partial
+    finally:
+        for task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
@@ -1,16 +1,17 @@
 from __future__ import annotations
-import copy
-from typing import Optional, Union
+import asyncio
+from typing import AsyncIterator, Iterable, Optional, Tuple, Union
 
 from py_yt.core.browse import BrowseCore
 from py_yt.core.channel import ChannelCore
 from py_yt.core.constants import ResultMode, ChannelRequestType
 from py_yt.core.hashtag import HashtagCore
+from py_yt.core.models import VideoResult
 from py_yt.core.playlist import PlaylistCore
 from py_yt.core.recommendations import RelatedVideosCore
 from py_yt.core.suggestions import SuggestionsCore
 from py_yt.core.transcript import TranscriptCore
-from py_yt.core.video import VideoCore
+from py_yt.core.video import VideoCore, raceClientOrder, raceClients
 
 
 class Video:
@@ -275,6 +276,37 @@ class Video:
         await video.async_create()
         return video.result
 
+    @staticmethod
+    async def getRaced(
+        video_link: str,
+        clients: Iterable[str] = raceClientOrder,
+        timeout: float = 3,
+        stagger: float = 0.3,
+        proxy: Optional[str] = None,
+    ) -> Union[dict, None]:
+        """Fetches information and formats in one player request, racing several innertube clients.
+
+        The next client in `clients` starts whenever the previous one fails or has not
+        answered within `stagger` seconds, so one throttled client does not stall the
+        lookup. The winning client is reported in the `client` key.
+        Returns None if no client could fetch the video.
+
+        Args:
+            video_link (str): link or ID of the video on YouTube.
+            clients (Iterable[str], optional): Names from `CLIENTS`, in start order. Defaults to ANDROID, MWEB, TV_EMBED.
+            timeout (float, optional): Timeout of each player request. Defaults to 3.
+            stagger (float, optional): Seconds to wait before starting the next client. Defaults to 0.3.
+
+        Examples:
+
+            >>> video = await Video.getRaced("E07s5ZYygMg")
+            >>> print(video["title"], video["client"])
+            Harry Styles - Watermelon Sugar (Official Video) ANDROID
+        """
+        return await raceClients(
+            video_link, clients, timeout=timeout, stagger=stagger, proxy=proxy
+        )
+
     @staticmethod
     async def getInfo(
         video_link: str,
@@ -630,6 +662,8 @@ class Playlist:
 
     Args:
         playlistLink (str): link of the playlist on YouTube.
+        fields (Iterable[str], optional): Only extracts these video fields, e.g. ('id', 'title', 'duration'). Defaults to all fields.
+        as_model (bool, optional): Stores videos as slotted result objects instead of dicts. Defaults to False.
     """
 
     playlistLink = None
@@ -638,9 +672,17 @@ class Playlist:
     hasMoreVideos = True
     __playlist = None
 
-    def __init__(self, playlistLink: str, proxy: Optional[str] = None):
+    def __init__(
+        self,
+        playlistLink: str,
+        proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
+    ):
         self.playlistLink = playlistLink
         self.proxy = proxy
+        self.fields = fields
+        self.as_model = as_model
 
     """Fetches more susequent videos of the playlist, and appends to the `videos` list.
     `hasMoreVideos` bool indicates whether more videos can be fetched or not.
@@ -649,18 +691,53 @@ class Playlist:
     async def getNextVideos(self) -> None:
         if not self.info:
             self.__playlist = PlaylistCore(
-                self.playlistLink, None, ResultMode.dict, 2, proxy=self.proxy
+                self.playlistLink,
+                None,
+                ResultMode.dict,
+                2,
+                proxy=self.proxy,
+                fields=self.fields,
+                as_model=self.as_model,
             )
             await self.__playlist._async_next()
-            self.info = copy.deepcopy(self.__playlist.playlistComponent)
             self.videos = self.__playlist.playlistComponent["videos"]
             self.hasMoreVideos = self.__playlist.continuationKey != None
-            self.info.pop("videos")
+            self.info = {
+                key: value
+                for key, value in self.__playlist.playlistComponent.items()
+                if key != "videos"
+            }
         else:
             await self.__playlist._async_next()
             self.videos = self.__playlist.playlistComponent["videos"]
             self.hasMoreVideos = self.__playlist.continuationKey != None
 
+    @staticmethod
+    def stream(
+        playlistLink: str,
+        proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
+        resumeToken: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> PlaylistStream:
+        """Iterates over every video of the playlist without keeping earlier pages in memory.
+
+        Examples:
+
+            >>> stream = Playlist.stream("https://www.youtube.com/playlist?list=PLRBp0Fe2GpgmsW46rJyudVFlY6IYjFBIK", fields=("id", "title"))
+            >>> async for video in stream:
+            ...     print(video["title"])
+        """
+        return PlaylistStream(
+            playlistLink,
+            proxy=proxy,
+            fields=fields,
+            as_model=as_model,
+            resumeToken=resumeToken,
+            prefetch=prefetch,
+        )
+
     @staticmethod
     async def get(
         playlistLink: str, proxy: Optional[str] = None
@@ -1292,13 +1369,16 @@ class Playlist:
 
     @staticmethod
     async def getVideos(
-        playlistLink: str, proxy: Optional[str] = None
+        playlistLink: str,
+        proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
     ) -> Union[dict, str, None]:
         """Fetches only videos in the given playlist from link.
         Returns None if playlist is unavailable.
 
         Args:
             playlistLink (str): link of the playlist on YouTube.
+            fields (Iterable[str], optional): Only extracts these video fields. Defaults to all fields.
 
         Examples:
 
@@ -1791,12 +1871,102 @@ class Playlist:
             }
         """
         playlist = PlaylistCore(
-            playlistLink, "getVideos", ResultMode.dict, 2, proxy=proxy
+            playlistLink, "getVideos", ResultMode.dict, 2, proxy=proxy, fields=fields
         )
         await playlist.async_create()
         return playlist.playlistComponent
 
 
+class PlaylistStream:
+    """Async iterator over the videos of a playlist, fetched one page at a time.
+
+    While a page is being consumed, the next page is fetched in the background. Only
+    the current page is held in memory, however long the playlist is.
+
+    `info` holds the playlist information once the first page is fetched; it stays None
+    when resuming. `resumeToken` is the continuation of the first page not yet fully
+    consumed. Pass it as `resumeToken` to `Playlist.stream` to continue later; the
+    partially consumed page is fetched again. Once every page is consumed,
+    `hasMoreVideos` is False and `resumeToken` is an empty string, which resumes to an
+    empty iterator; check `hasMoreVideos` before saving a token for later.
+
+    Args:
+        playlistLink (str): link of the playlist on YouTube.
+        fields (Iterable[str], optional): Only extracts these video fields. Defaults to all fields.
+        as_model (bool, optional): Yields slotted result objects instead of dicts. Defaults to False.
+        resumeToken (str, optional): Continues from a previously saved `resumeToken`.
+        prefetch (bool, optional): Fetches the next page ahead of time. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        playlistLink: str,
+        proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
+        resumeToken: Optional[str] = None,
+        prefetch: bool = True,
+    ):
+        self.playlistLink = playlistLink
+        self.proxy = proxy
+        self.fields = fields
+        self.as_model = as_model
+        self.resumeToken = resumeToken
+        self.prefetch = prefetch
+        self.info = None
+        self.hasMoreVideos = True
+
+    def __aiter__(self) -> AsyncIterator[Union[dict, VideoResult]]:
+        return self.__iterate()
+
+    async def __fetchPage(
+        self, continuationKey: Optional[str]
+    ) -> Tuple[Optional[dict], list, Optional[str]]:
+        page = PlaylistCore(
+            self.playlistLink,
+            None,
+            ResultMode.dict,
+            2,
+            proxy=self.proxy,
+            fields=self.fields,
+            as_model=self.as_model,
+        )
+        if continuationKey is None:
+            await page.async_create()
+            info = page.playlistComponent.get("info")
+        else:
+            info = None
+            page.continuationKey = continuationKey
+            page.playlistComponent = {"videos": []}
+            await page._async_next()
+        return info, page.playlistComponent["videos"], page.continuationKey
+
+    async def __iterate(self) -> AsyncIterator[Union[dict, VideoResult]]:
+        if self.resumeToken == "":
+            self.hasMoreVideos = False
+            return
+        pending = asyncio.ensure_future(self.__fetchPage(self.resumeToken))
+        try:
+            while pending is not None:
+                info, videos, continuationKey = await pending
+                pending = None
+                if info is not None:
+                    self.info = info
+                if continuationKey and self.prefetch:
+                    pending = asyncio.ensure_future(self.__fetchPage(continuationKey))
+                for video in videos:
+                    yield video
+                self.resumeToken = continuationKey or ""
+                self.hasMoreVideos = bool(continuationKey)
+                if continuationKey and pending is None:
+                    pending = asyncio.ensure_future(self.__fetchPage(continuationKey))
+        finally:
+            if pending is not None:
+                if pending.done() and not pending.cancelled():
+                    pending.exception()
+                pending.cancel()
+
+
 class Hashtag(HashtagCore):
     """Fetches videos for the given hashtag.
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import List, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+from py_yt.core.componenthandler import compileComponent, getValue, projectSpec
 from py_yt.core.constants import (
     videoElementKey,
     channelElementKey,
@@ -8,201 +9,200 @@ from py_yt.core.constants import (
     shelfElementKey,
 )
 
+_videoSpec = {
+    "id": ["videoId"],
+    "title": ["title", "runs", 0, "text"],
+    "publishedTime": ["publishedTimeText", "simpleText"],
+    "duration": ["lengthText", "simpleText"],
+    "viewCount": {
+        "text": ["viewCountText", "simpleText"],
+        "short": ["shortViewCountText", "simpleText"],
+    },
+    "thumbnails": ["thumbnail", "thumbnails"],
+    "richThumbnail": [
+        "richThumbnail",
+        "movingThumbnailRenderer",
+        "movingThumbnailDetails",
+        "thumbnails",
+        0,
+    ],
+    "descriptionSnippet": ["detailedMetadataSnippets", 0, "snippetText", "runs"],
+    "channel": {
+        "name": ["ownerText", "runs", 0, "text"],
+        "id": [
+            "ownerText",
+            "runs",
+            0,
+            "navigationEndpoint",
+            "browseEndpoint",
+            "browseId",
+        ],
+        "thumbnails": [
+            "channelThumbnailSupportedRenderers",
+            "channelThumbnailWithLinkRenderer",
+            "thumbnail",
+            "thumbnails",
+        ],
+    },
+    "accessibility": {
+        "title": ["title", "accessibility", "accessibilityData", "label"],
+        "duration": ["lengthText", "accessibility", "accessibilityData", "label"],
+    },
+}
+
+_channelSpec = {
+    "id": ["channelId"],
+    "title": ["title", "simpleText"],
+    "thumbnails": ["thumbnail", "thumbnails"],
+    "videoCount": ["videoCountText", "runs", 0, "text"],
+    "descriptionSnippet": ["descriptionSnippet", "runs"],
+    "subscribers": ["subscriberCountText", "simpleText"],
+}
+
+_playlistSpec = {
+    "id": ["playlistId"],
+    "title": ["title", "simpleText"],
+    "videoCount": ["videoCount"],
+    "channel": {
+        "name": ["shortBylineText", "runs", 0, "text"],
+        "id": [
+            "shortBylineText",
+            "runs",
+            0,
+            "navigationEndpoint",
+            "browseEndpoint",
+            "browseId",
+        ],
+    },
+    "thumbnails": [
+        "thumbnailRenderer",
+        "playlistVideoThumbnailRenderer",
+        "thumbnail",
+        "thumbnails",
+    ],
+}
+
+_lockupPlaylistSpec = {
+    "id": ["contentId"],
+    "title": ["metadata", "lockupMetadataViewModel", "title", "content"],
+    "thumbnails": [
+        "contentImage",
+        "collectionThumbnailViewModel",
+        "primaryThumbnail",
+        "thumbnailViewModel",
+        "image",
+        "sources",
+    ],
+    "videoCount": [
+        "contentImage",
+        "collectionThumbnailViewModel",
+        "primaryThumbnail",
+        "thumbnailViewModel",
+        "overlays",
+        0,
+        "thumbnailOverlayBadgeViewModel",
+        "thumbnailBadges",
+        0,
+        "thumbnailBadgeViewModel",
+        "text",
+    ],
+    "channel": {
+        "name": [
+            "metadata",
+            "lockupMetadataViewModel",
+            "metadata",
+            "contentMetadataViewModel",
+            "metadataRows",
+            0,
+            "metadataParts",
+            0,
+            "text",
+            "content",
+        ],
+        "id": [
+            "metadata",
+            "lockupMetadataViewModel",
+            "metadata",
+            "contentMetadataViewModel",
+            "metadataRows",
+            0,
+            "metadataParts",
+            0,
+            "text",
+            "commandRuns",
+            0,
+            "onTap",
+            "innertubeCommand",
+            "browseEndpoint",
+            "browseId",
+        ],
+    },
+}
+
+componentSpecs = {
+    "video": _videoSpec,
+    "channel": _channelSpec,
+    "playlist": _playlistSpec,
+    "lockupPlaylist": _lockupPlaylistSpec,
+}
+
+_extractors: Dict[Tuple[str, Optional[Tuple[str, ...]]], Callable[[dict], dict]] = {}
+
+
+def getExtractor(kind: str, fields: Optional[Tuple[str, ...]] = None) -> Callable[[dict], dict]:
+    """Returns the compiled extractor for a component kind, narrowed to ``fields`` when given."""
+    key = (kind, fields)
+    extractor = _extractors.get(key)
+    if extractor is None:
+        spec = componentSpecs[kind]
+        if fields is not None:
+            spec = projectSpec(spec, ("id",) + fields)
+        extractor = _extractors[key] = compileComponent(spec)
+    return extractor
+
 
 class ComponentHandler:
+    fields: Optional[Tuple[str, ...]] = None
+
+    def _wants(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+    def _linkChannel(self, component: dict) -> None:
+        channel = component.get("channel")
+        if channel and channel.get("id"):
+            channel["link"] = "https://www.youtube.com/channel/" + channel["id"]
+
     def _getVideoComponent(self, element: dict, shelfTitle: str = None) -> dict:
-        video = element[videoElementKey]
         component = {
             "type": "video",
-            "id": self._getValue(video, ["videoId"]),
-            "title": self._getValue(video, ["title", "runs", 0, "text"]),
-            "publishedTime": self._getValue(video, ["publishedTimeText", "simpleText"]),
-            "duration": self._getValue(video, ["lengthText", "simpleText"]),
-            "viewCount": {
-                "text": self._getValue(video, ["viewCountText", "simpleText"]),
-                "short": self._getValue(video, ["shortViewCountText", "simpleText"]),
-            },
-            "thumbnails": self._getValue(video, ["thumbnail", "thumbnails"]),
-            "richThumbnail": self._getValue(
-                video,
-                [
-                    "richThumbnail",
-                    "movingThumbnailRenderer",
-                    "movingThumbnailDetails",
-                    "thumbnails",
-                    0,
-                ],
-            ),
-            "descriptionSnippet": self._getValue(
-                video, ["detailedMetadataSnippets", 0, "snippetText", "runs"]
-            ),
-            "channel": {
-                "name": self._getValue(video, ["ownerText", "runs", 0, "text"]),
-                "id": self._getValue(
-                    video,
-                    [
-                        "ownerText",
-                        "runs",
-                        0,
-                        "navigationEndpoint",
-                        "browseEndpoint",
-                        "browseId",
-                    ],
-                ),
-                "thumbnails": self._getValue(
-                    video,
-                    [
-                        "channelThumbnailSupportedRenderers",
-                        "channelThumbnailWithLinkRenderer",
-                        "thumbnail",
-                        "thumbnails",
-                    ],
-                ),
-            },
-            "accessibility": {
-                "title": self._getValue(
-                    video, ["title", "accessibility", "accessibilityData", "label"]
-                ),
-                "duration": self._getValue(
-                    video, ["lengthText", "accessibility", "accessibilityData", "label"]
-                ),
-            },
+            **getExtractor("video", self.fields)(element[videoElementKey]),
         }
-        component["link"] = "https://www.youtube.com/watch?v=" + component["id"]
-        if component["channel"]["id"]:
-            component["channel"]["link"] = (
-                "https://www.youtube.com/channel/" + component["channel"]["id"]
-            )
-        component["shelfTitle"] = shelfTitle
+        if self._wants("link"):
+            component["link"] = "https://www.youtube.com/watch?v=" + component["id"]
+        self._linkChannel(component)
+        if self._wants("shelfTitle"):
+            component["shelfTitle"] = shelfTitle
         return component
 
     def _getChannelComponent(self, element: dict) -> dict:
-        channel = element[channelElementKey]
         component = {
             "type": "channel",
-            "id": self._getValue(channel, ["channelId"]),
-            "title": self._getValue(channel, ["title", "simpleText"]),
-            "thumbnails": self._getValue(channel, ["thumbnail", "thumbnails"]),
-            "videoCount": self._getValue(
-                channel, ["videoCountText", "runs", 0, "text"]
-            ),
-            "descriptionSnippet": self._getValue(
-                channel, ["descriptionSnippet", "runs"]
-            ),
-            "subscribers": self._getValue(
-                channel, ["subscriberCountText", "simpleText"]
-            ),
+            **getExtractor("channel", self.fields)(element[channelElementKey]),
         }
-        component["link"] = "https://www.youtube.com/channel/" + component["id"]
+        if self._wants("link"):
+            component["link"] = "https://www.youtube.com/channel/" + component["id"]
         return component
 
     def _getPlaylistComponent(self, element: dict) -> dict:
         if playlistElementKey in element:
-            playlist = element[playlistElementKey]
             component = {
                 "type": "playlist",
-                "id": self._getValue(playlist, ["playlistId"]),
-                "title": self._getValue(playlist, ["title", "simpleText"]),
-                "videoCount": self._getValue(playlist, ["videoCount"]),
-                "channel": {
-                    "name": self._getValue(
-                        playlist, ["shortBylineText", "runs", 0, "text"]
-                    ),
-                    "id": self._getValue(
-                        playlist,
-                        [
-                            "shortBylineText",
-                            "runs",
-                            0,
-                            "navigationEndpoint",
-                            "browseEndpoint",
-                            "browseId",
-                        ],
-                    ),
-                },
-                "thumbnails": self._getValue(
-                    playlist,
-                    [
-                        "thumbnailRenderer",
-                        "playlistVideoThumbnailRenderer",
-                        "thumbnail",
-                        "thumbnails",
-                    ],
-                ),
+                **getExtractor("playlist", self.fields)(element[playlistElementKey]),
             }
         elif "lockupViewModel" in element:
-            lockup = element["lockupViewModel"]
             component = {
                 "type": "playlist",
-                "id": self._getValue(lockup, ["contentId"]),
-                "title": self._getValue(
-                    lockup,
-                    ["metadata", "lockupMetadataViewModel", "title", "content"],
-                ),
-                "thumbnails": self._getValue(
-                    lockup,
-                    [
-                        "contentImage",
-                        "collectionThumbnailViewModel",
-                        "primaryThumbnail",
-                        "thumbnailViewModel",
-                        "image",
-                        "sources",
-                    ],
-                ),
-                "videoCount": self._getValue(
-                    lockup,
-                    [
-                        "contentImage",
-                        "collectionThumbnailViewModel",
-                        "primaryThumbnail",
-                        "thumbnailViewModel",
-                        "overlays",
-                        0,
-                        "thumbnailOverlayBadgeViewModel",
-                        "thumbnailBadges",
-                        0,
-                        "thumbnailBadgeViewModel",
-                        "text",
-                    ],
-                ),
-                "channel": {
-                    "name": self._getValue(
-                        lockup,
-                        [
-                            "metadata",
-                            "lockupMetadataViewModel",
-                            "metadata",
-                            "contentMetadataViewModel",
-                            "metadataRows",
-                            0,
-                            "metadataParts",
-                            0,
-                            "text",
-                            "content",
-                        ],
-                    ),
-                    "id": self._getValue(
-                        lockup,
-                        [
-                            "metadata",
-                            "lockupMetadataViewModel",
-                            "metadata",
-                            "contentMetadataViewModel",
-                            "metadataRows",
-                            0,
-                            "metadataParts",
-                            0,
-                            "text",
-                            "commandRuns",
-                            0,
-                            "onTap",
-                            "innertubeCommand",
-                            "browseEndpoint",
-                            "browseId",
-                        ],
-                    ),
-                },
+                **getExtractor("lockupPlaylist", self.fields)(element["lockupViewModel"]),
             }
         else:
             raise ValueError(
@@ -210,11 +210,9 @@ class ComponentHandler:
                 f"element keys: {list(element.keys())}"
             )
 
-        component["link"] = "https://www.youtube.com/playlist?list=" + component["id"]
-        if component["channel"]["id"]:
-            component["channel"]["link"] = (
-                "https://www.youtube.com/channel/" + component["channel"]["id"]
-            )
+        if self._wants("link"):
+            component["link"] = "https://www.youtube.com/playlist?list=" + component["id"]
+        self._linkChannel(component)
         return component
 
     def _getVideoFromChannelSearch(self, elements: list) -> list:
@@ -406,18 +404,4 @@ class ComponentHandler:
         }
 
     def _getValue(self, source: dict, path: List[str]) -> Union[str, int, dict, None]:
-        value = source
-        for key in path:
-            if type(key) is str:
-                if key in value.keys():
-                    value = value[key]
-                else:
-                    value = None
-                    break
-            elif type(key) is int:
-                if len(value) != 0:
-                    value = value[key]
-                else:
-                    value = None
-                    break
-        return value
+        return getValue(source, path)
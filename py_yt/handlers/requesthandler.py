@@ -1,13 +1,6 @@
 from __future__ import annotations
-import copy
-import json
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
 from py_yt.core.constants import (
-    requestPayload,
-    searchKey,
-    userAgent,
     contentPath,
     itemSectionKey,
     continuationItemKey,
@@ -15,52 +8,18 @@ from py_yt.core.constants import (
     fallbackContentPath,
     continuationContentPath,
 )
+from py_yt.core.decoder import loads
 from py_yt.handlers.componenthandler import ComponentHandler
 
 
 class RequestHandler(ComponentHandler):
-    def _makeRequest(self) -> None:
-        requestBody = copy.deepcopy(requestPayload)
-        requestBody["query"] = self.query
-        requestBody["client"] = {
-            "hl": self.language,
-            "gl": self.region,
-        }
-        if self.searchPreferences:
-            requestBody["params"] = self.searchPreferences
-        if self.continuationKey:
-            requestBody["continuation"] = self.continuationKey
-        requestBodyBytes = json.dumps(requestBody).encode("utf_8")
-        request = Request(
-            "https://www.youtube.com/youtubei/v1/search"
-            + "?"
-            + urlencode(
-                {
-                    "key": searchKey,
-                }
-            ),
-            data=requestBodyBytes,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Content-Length": len(requestBodyBytes),
-                "User-Agent": userAgent,
-            },
-        )
-        try:
-            self.response = (
-                urlopen(request, timeout=self.timeout).read().decode("utf_8")
-            )
-        except:
-            raise Exception("ERROR: Could not make request.")
-
     def _parseSource(self) -> None:
         try:
+            source = loads(self.response)
             if not self.continuationKey:
-                responseContent = self._getValue(json.loads(self.response), contentPath)
+                responseContent = self._getValue(source, contentPath)
             else:
-                responseContent = self._getValue(
-                    json.loads(self.response), continuationContentPath
-                )
+                responseContent = self._getValue(source, continuationContentPath)
             if responseContent:
                 for element in responseContent:
                     if itemSectionKey in element.keys():
@@ -72,9 +31,7 @@ class RequestHandler(ComponentHandler):
                             element, continuationKeyPath
                         )
             else:
-                self.responseSource = self._getValue(
-                    json.loads(self.response), fallbackContentPath
-                )
+                self.responseSource = self._getValue(source, fallbackContentPath)
                 if self.responseSource:
                     self.continuationKey = self._getValue(
                         self.responseSource[-1], continuationKeyPath
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from py_yt.core.channelsearch import ChannelSearchCore
 from py_yt.core.constants import VideoSortOrder, SearchMode
@@ -14,6 +14,8 @@ class Search(SearchCore):
         limit (int, optional): Sets limit to the number of results. Defaults to 20.
         language (str, optional): Sets the result language. Defaults to 'en'.
         region (str, optional): Sets the result region. Defaults to 'US'.
+        fields (Iterable[str], optional): Only extracts these result fields, e.g. ('id', 'title', 'channel.name'). Defaults to all fields.
+        as_model (bool, optional): Returns slotted result objects instead of dicts. Defaults to False.
 
     Examples:
         Calling `result` method gives the search result.
@@ -83,6 +85,8 @@ class Search(SearchCore):
         with_live: bool = True,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         self.searchMode = (True, True, True)
         super().__init__(
@@ -95,6 +99,8 @@ class Search(SearchCore):
             with_live=with_live,
             max_retries=max_retries,
             proxy=proxy,
+            fields=fields,
+            as_model=as_model,
         )  # type: ignore
 
     async def next(self) -> Dict[str, Any]:
@@ -109,6 +115,8 @@ class VideosSearch(SearchCore):
         limit (int, optional): Sets limit to the number of results. Defaults to 20.
         language (str, optional): Sets the result language. Defaults to 'en'.
         region (str, optional): Sets the result region. Defaults to 'US'.
+        fields (Iterable[str], optional): Only extracts these result fields, e.g. ('id', 'title', 'channel.name'). Defaults to all fields.
+        as_model (bool, optional): Returns slotted result objects instead of dicts. Defaults to False.
 
     Examples:
         Calling `result` method gives the search result.
@@ -178,6 +186,8 @@ class VideosSearch(SearchCore):
         with_live: bool = True,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         self.searchMode = (True, False, False)
         super().__init__(
@@ -190,6 +200,8 @@ class VideosSearch(SearchCore):
             with_live=with_live,
             max_retries=max_retries,
             proxy=proxy,
+            fields=fields,
+            as_model=as_model,
         )
 
     async def next(self) -> Dict[str, Any]:
@@ -204,6 +216,8 @@ class ChannelsSearch(SearchCore):
         limit (int, optional): Sets limit to the number of results. Defaults to 20.
         language (str, optional): Sets the result language. Defaults to 'en'.
         region (str, optional): Sets the result region. Defaults to 'US'.
+        fields (Iterable[str], optional): Only extracts these result fields, e.g. ('id', 'title', 'channel.name'). Defaults to all fields.
+        as_model (bool, optional): Returns slotted result objects instead of dicts. Defaults to False.
 
     Examples:
         Calling `result` method gives the search result.
@@ -247,6 +261,8 @@ class ChannelsSearch(SearchCore):
         timeout: Optional[int] = None,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         self.searchMode = (False, True, False)
         super().__init__(
@@ -258,6 +274,8 @@ class ChannelsSearch(SearchCore):
             timeout,
             max_retries=max_retries,
             proxy=proxy,
+            fields=fields,
+            as_model=as_model,
         )  # type: ignore
 
     async def next(self) -> Dict[str, Any]:
@@ -272,6 +290,8 @@ class PlaylistsSearch(SearchCore):
         limit (int, optional): Sets limit to the number of results. Defaults to 20.
         language (str, optional): Sets the result language. Defaults to 'en'.
         region (str, optional): Sets the result region. Defaults to 'US'.
+        fields (Iterable[str], optional): Only extracts these result fields, e.g. ('id', 'title', 'channel.name'). Defaults to all fields.
+        as_model (bool, optional): Returns slotted result objects instead of dicts. Defaults to False.
 
     Examples:
         Calling `result` method gives the search result.
@@ -328,6 +348,8 @@ class PlaylistsSearch(SearchCore):
         timeout: Optional[int] = None,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         self.searchMode = (False, False, True)
         super().__init__(
@@ -339,6 +361,8 @@ class PlaylistsSearch(SearchCore):
             timeout,
             max_retries=max_retries,
             proxy=proxy,
+            fields=fields,
+            as_model=as_model,
         )  # type: ignore
 
     async def next(self) -> Dict[str, Any]:
@@ -364,6 +388,8 @@ class CustomSearch(SearchCore):
         limit (int, optional): Sets limit to the number of results. Defaults to 20.
         language (str, optional): Sets the result language. Defaults to 'en'.
         region (str, optional): Sets the result region. Defaults to 'US'.
+        fields (Iterable[str], optional): Only extracts these result fields, e.g. ('id', 'title', 'channel.name'). Defaults to all fields.
+        as_model (bool, optional): Returns slotted result objects instead of dicts. Defaults to False.
 
     Examples:
         Calling `result` method gives the search result.
@@ -434,6 +460,8 @@ class CustomSearch(SearchCore):
         with_live: bool = True,
         max_retries: int = 0,
         proxy: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        as_model: bool = False,
     ):
         self.searchMode = (True, True, True)
         super().__init__(
@@ -446,6 +474,8 @@ class CustomSearch(SearchCore):
             with_live=with_live,
             max_retries=max_retries,
             proxy=proxy,
+            fields=fields,
+            as_model=as_model,
         )
 
     async def next(self) -> Dict[str, Any]: